@@ -1,11 +1,62 @@
 """Main script for the communication."""
 from argparse import ArgumentParser
+from contextlib import nullcontext
 
 from communication import config
 from communication.argumentation.argument_model import ArgumentModel
+from communication.argumentation.concession import CONCESSION_STRATEGIES
+from communication.argumentation.run_config import RunConfig
+from communication.argumentation.social_choice import SocialChoiceBaselines
+from communication.argumentation.tournament_metrics import TournamentMetrics
+from communication.commands.bundle_negociation import (
+    negociate_bundles,
+    print_bundle_negociations,
+)
+from communication.commands.checkpoint import open_checkpoint
+from communication.commands.concession_benchmark import (
+    benchmark_concession_strategies,
+    print_concession_benchmark,
+)
+from communication.commands.distributed_pairs import (
+    TournamentCoordinator,
+    parse_address,
+    run_worker,
+)
+from communication.commands.memory_benchmark import run_memory_gate
+from communication.commands.metrics_server import MetricsReporter
 from communication.commands.pairs_visualizer import visualize_pairs_negociations
+from communication.commands.parameter_sweep import (
+    build_grid,
+    parse_grid,
+    print_parameter_sweep,
+    run_parameter_sweep,
+)
+from communication.commands.results_store import ResultsStore
+from communication.commands.sampled_tournament import (
+    print_estimated_scores,
+    run_sampled_tournament,
+)
+from communication.commands.social_choice_report import (
+    build_baselines_report,
+    print_baselines_report,
+)
+from communication.commands.stress_harness import OBJECTIVES, run_stress_harness
 from communication.preferences.criterion_name import CriterionName
 
+# Items, criteria and preferences folder of each argumentation mode
+MODES = {
+    "presidential": (
+        config.PRESIDENTIAL_ITEMS,
+        CriterionName.list_presidential(),
+        config.PRESIDENTIAL_PREFERENCES_FOLDER,
+    ),
+    "cars": (
+        config.CAR_ITEMS,
+        CriterionName.list_cars(),
+        config.CARS_PREFERENCES_FOLDER,
+    ),
+}
+
 if __name__ == "__main__":
     print("Testing two agents communication")
 
@@ -14,6 +65,7 @@ if __name__ == "__main__":
         "--mode",
         type=str,
         default="presidential",
+        choices=list(MODES),
         help="Argumentation mode (presidential or cars)",
     )
     argparser.add_argument(
@@ -22,25 +74,373 @@ if __name__ == "__main__":
         default=3,
         help="Number of agents in the argumentation",
     )
+    argparser.add_argument(
+        "--concession",
+        type=str,
+        default=config.CONCESSION_STRATEGY,
+        choices=list(CONCESSION_STRATEGIES),
+        help="Concession strategy used by the agents",
+    )
+    argparser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed of the random generators of the negociations",
+    )
+    argparser.add_argument(
+        "--settle_debates",
+        action="store_true",
+        help="Stop arguing about the arguments whose status is already settled",
+    )
+    argparser.add_argument(
+        "--results",
+        type=str,
+        default=None,
+        help="Path of a SQLite database where the results are streamed",
+    )
+    argparser.add_argument(
+        "--predict_agreements",
+        action="store_true",
+        help="Resolve the pairs agreeing on the first proposal without simulation",
+    )
+    argparser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Run the negociations of all the pairs concurrently in one model",
+    )
+    argparser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Run the negociations with the batch engine (NumPy arrays)",
+    )
+    argparser.add_argument(
+        "--num_workers",
+        type=int,
+        default=1,
+        help="Number of processes running the negociations",
+    )
+    argparser.add_argument(
+        "--results_plot",
+        type=str,
+        default="graph",
+        choices=["graph", "matrix", "none"],
+        help="Plot of the results: winning graph, outcome matrix (large populations) "
+        "or none",
+    )
+    argparser.add_argument(
+        "--plots_folder",
+        type=str,
+        default=None,
+        help="Folder where the plots are saved instead of being shown",
+    )
+    argparser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=None,
+        help="Path of a file where the progress of the tournament is saved",
+    )
+    argparser.add_argument(
+        "--checkpoint_every",
+        type=int,
+        default=1000,
+        help="Number of negociated pairs between two checkpoints",
+    )
+    argparser.add_argument(
+        "--resume",
+        type=str,
+        default=None,
+        help="Path of the checkpoint of a tournament to resume, skipping its finished pairs",
+    )
+    argparser.add_argument(
+        "--coordinator",
+        type=str,
+        default=None,
+        help="host:port where workers are waited for to run the negociations",
+    )
+    argparser.add_argument(
+        "--worker",
+        type=str,
+        default=None,
+        help="host:port of a coordinator whose negociations are run",
+    )
+    argparser.add_argument(
+        "--tournament",
+        type=str,
+        default="exhaustive",
+        choices=["exhaustive", "random", "swiss", "stratified", "matchmaking"],
+        help="Pairs negociated: all of them, or sampled to estimate the scores",
+    )
+    argparser.add_argument(
+        "--num_pairs",
+        type=int,
+        default=100,
+        help="Number of sampled pairs of the random and stratified tournaments",
+    )
+    argparser.add_argument(
+        "--num_rounds",
+        type=int,
+        default=5,
+        help="Number of rounds of the swiss tournament",
+    )
+    argparser.add_argument(
+        "--num_partners",
+        type=int,
+        default=3,
+        help="Number of most similar agents met by each agent in the matchmaking "
+        "tournament",
+    )
+    argparser.add_argument(
+        "--benchmark_concessions",
+        action="store_true",
+        help="Report the rounds to agreement of each concession strategy",
+    )
+    argparser.add_argument(
+        "--baselines",
+        type=str,
+        default=None,
+        choices=["compare", "only"],
+        help="Compare the results with the items chosen by social choice rules, "
+        "or only compute these items without running the negociations",
+    )
+    argparser.add_argument(
+        "--metrics_port",
+        type=int,
+        default=None,
+        help="Port of localhost where the metrics of the negociations are served",
+    )
+    argparser.add_argument(
+        "--metrics_file",
+        type=str,
+        default=None,
+        help="Path of a JSON file where the metrics of the negociations are written",
+    )
+    argparser.add_argument(
+        "--sweep",
+        type=str,
+        nargs="+",
+        default=None,
+        help="Report the rounds to agreement of each combination of parameter "
+        "values, e.g. initial_percentage=10,20 increase_percentage=10,20",
+    )
+    argparser.add_argument(
+        "--stress",
+        type=str,
+        default=None,
+        help="Folder where the pairs of preferences with the longest negociations "
+        "found are saved as regression fixtures",
+    )
+    argparser.add_argument(
+        "--stress_check",
+        action="store_true",
+        help="Run again the fixtures of the stress folder and report the regressions",
+    )
+    argparser.add_argument(
+        "--stress_max_wall_time",
+        type=float,
+        default=None,
+        help="Wall time in milliseconds above which a checked stress case is slow",
+    )
+    argparser.add_argument(
+        "--stress_objective",
+        type=str,
+        default="steps",
+        choices=OBJECTIVES,
+        help="Length of the negociations maximized by the stress cases",
+    )
+    argparser.add_argument(
+        "--stress_iterations",
+        type=int,
+        default=100,
+        help="Number of hill-climbing iterations of the search of each stress case",
+    )
+    argparser.add_argument(
+        "--bundle_size",
+        type=int,
+        default=None,
+        help="Number of items of the bundles negociated between all the pairs "
+        "instead of single items",
+    )
+    argparser.add_argument(
+        "--benchmark_memory",
+        action="store_true",
+        help="Measure the memory used by random populations and compare it with "
+        "the baseline",
+    )
+    argparser.add_argument(
+        "--memory_populations",
+        type=int,
+        nargs="+",
+        default=[10, 40],
+        help="Numbers of agents of the populations of the memory benchmark",
+    )
+    argparser.add_argument(
+        "--memory_catalogs",
+        type=int,
+        nargs="+",
+        default=[6, 24],
+        help="Numbers of items of the populations of the memory benchmark",
+    )
+    argparser.add_argument(
+        "--memory_baseline",
+        type=str,
+        default=config.MEMORY_BASELINE,
+        help="JSON file of the retained bytes per agent of the memory benchmark",
+    )
+    argparser.add_argument(
+        "--update_memory_baseline",
+        action="store_true",
+        help="Replace the baseline of the memory benchmark by its measures",
+    )
 
     NUM_AGENTS = argparser.parse_args().num_agents
 
-    if argparser.parse_args().mode == "presidential":
+    ITEMS, CRITERIA, PREFERENCES_FOLDER = MODES[argparser.parse_args().mode]
+    RUN_CONFIG = RunConfig(
+        argparser.parse_args().concession,
+        seed=argparser.parse_args().seed,
+        settle_debates=argparser.parse_args().settle_debates,
+    )
+    METRICS = (
+        TournamentMetrics()
+        if argparser.parse_args().metrics_port is not None
+        or argparser.parse_args().metrics_file is not None
+        else None
+    )
+    METRICS_REPORTER = MetricsReporter(
+        METRICS,
+        argparser.parse_args().metrics_port,
+        argparser.parse_args().metrics_file,
+    ).start()
+    argument_model = ArgumentModel(
+        2,
+        items=ITEMS,
+        criteria=CRITERIA,
+        preferences_folder=PREFERENCES_FOLDER,
+        run_config=RUN_CONFIG,
+        metrics=METRICS,
+    )
 
-        argument_model = ArgumentModel(
-            2,
-            items=config.PRESIDENTIAL_ITEMS,
-            criteria=CriterionName.list_presidential(),
-            preferences_folder=config.PRESIDENTIAL_PREFERENCES_FOLDER,
+    # Configuration of the tournament, shared by its checkpoint and its workers
+    TOURNAMENT_CONFIG = {
+        "mode": argparser.parse_args().mode,
+        "num_agents": NUM_AGENTS,
+        "concession": argparser.parse_args().concession,
+        "seed": argparser.parse_args().seed,
+        "settle_debates": argparser.parse_args().settle_debates,
+        "predict_agreements": argparser.parse_args().predict_agreements,
+    }
+    CHECKPOINT_PATH = argparser.parse_args().resume or argparser.parse_args().checkpoint
+    CHECKPOINT = (
+        open_checkpoint(
+            CHECKPOINT_PATH,
+            TOURNAMENT_CONFIG,
+            argparser.parse_args().checkpoint_every,
+            resume=argparser.parse_args().resume is not None,
         )
+        if CHECKPOINT_PATH is not None
+        else None
+    )
 
-    elif argparser.parse_args().mode == "cars":
-
-        argument_model = ArgumentModel(
-            2,
-            items=config.CAR_ITEMS,
-            criteria=CriterionName.list_cars(),
-            preferences_folder=config.CARS_PREFERENCES_FOLDER,
+    COORDINATOR = (
+        TournamentCoordinator(
+            parse_address(argparser.parse_args().coordinator),
+            TOURNAMENT_CONFIG,
+            metrics=METRICS,
         )
+        if argparser.parse_args().coordinator is not None
+        else None
+    )
 
-    visualize_pairs_negociations(argument_model, NUM_AGENTS)
+    if argparser.parse_args().worker is not None:
+        NUM_PAIRS = run_worker(
+            argument_model,
+            parse_address(argparser.parse_args().worker),
+            TOURNAMENT_CONFIG,
+        )
+        print(f"{NUM_PAIRS} pairs negociated")
+    elif argparser.parse_args().sweep is not None:
+        print_parameter_sweep(
+            run_parameter_sweep(
+                argument_model,
+                NUM_AGENTS,
+                build_grid(RUN_CONFIG, parse_grid(argparser.parse_args().sweep)),
+                argparser.parse_args().num_workers,
+            )
+        )
+    elif argparser.parse_args().stress is not None:
+        run_stress_harness(
+            argument_model,
+            argparser.parse_args().stress,
+            argparser.parse_args().stress_check,
+            argparser.parse_args().stress_objective,
+            argparser.parse_args().stress_iterations,
+            argparser.parse_args().num_workers,
+            (
+                argparser.parse_args().stress_max_wall_time / 1000
+                if argparser.parse_args().stress_max_wall_time is not None
+                else None
+            ),
+        )
+    elif argparser.parse_args().bundle_size is not None:
+        print_bundle_negociations(
+            negociate_bundles(
+                argument_model, NUM_AGENTS, argparser.parse_args().bundle_size
+            )
+        )
+    elif argparser.parse_args().baselines == "only":
+        print_baselines_report(
+            build_baselines_report(
+                SocialChoiceBaselines.from_model(
+                    argument_model, list(range(1, NUM_AGENTS + 1))
+                )
+            )
+        )
+    elif argparser.parse_args().benchmark_memory:
+        run_memory_gate(
+            argument_model,
+            argparser.parse_args().memory_populations,
+            argparser.parse_args().memory_catalogs,
+            argparser.parse_args().memory_baseline,
+            argparser.parse_args().update_memory_baseline,
+        )
+    elif argparser.parse_args().benchmark_concessions:
+        print_concession_benchmark(
+            benchmark_concession_strategies(argument_model, NUM_AGENTS)
+        )
+    elif argparser.parse_args().tournament != "exhaustive":
+        with (
+            ResultsStore(argparser.parse_args().results)
+            if argparser.parse_args().results is not None
+            else nullcontext()
+        ) as results_store:
+            ESTIMATES = run_sampled_tournament(
+                argument_model,
+                argparser.parse_args().tournament,
+                NUM_AGENTS,
+                argparser.parse_args().num_pairs,
+                argparser.parse_args().num_rounds,
+                results_store,
+                argparser.parse_args().num_partners,
+            )
+        print_estimated_scores(ESTIMATES)
+    else:
+        with (COORDINATOR if COORDINATOR is not None else nullcontext()), (
+            ResultsStore(argparser.parse_args().results)
+            if argparser.parse_args().results is not None
+            else nullcontext()
+        ) as results_store:
+            visualize_pairs_negociations(
+                argument_model,
+                NUM_AGENTS,
+                results_store,
+                argparser.parse_args().predict_agreements,
+                argparser.parse_args().concurrent,
+                argparser.parse_args().batch,
+                argparser.parse_args().num_workers,
+                argparser.parse_args().results_plot,
+                argparser.parse_args().plots_folder,
+                CHECKPOINT,
+                COORDINATOR,
+                argparser.parse_args().baselines == "compare",
+            )
+    METRICS_REPORTER.close()
@@ -0,0 +1,54 @@
+"""Agent summary"""
+from typing import Dict, List
+
+from communication.argumentation.argument_agent import ArgumentAgent
+from communication.preferences.item import Item
+from communication.preferences.preferences import Preferences
+
+
+class AgentSummary:
+    """AgentSummary class.
+    This class implements a compact record of an agent of a tournament, which
+    is kept once the agent itself is released.
+
+    attr:
+        unique_id: the id of the agent
+        name: the name of the agent
+        items: the names of the items, by order of preference
+        scores: the score of each item (by name) for the agent
+    """
+
+    __slots__ = ["unique_id", "name", "items", "scores"]
+
+    def __init__(
+        self, unique_id: int, name: str, items: List[str], scores: Dict[str, float]
+    ):
+        """Creates a new agent summary."""
+        self.unique_id = unique_id
+        self.name = name
+        self.items = items
+        self.scores = scores
+
+    @classmethod
+    def from_agent(cls, agent: ArgumentAgent) -> "AgentSummary":
+        """Summarizes an agent."""
+        return cls(
+            agent.unique_id,
+            agent.name,
+            [item.name for item in agent.items],
+            {item.name: item.get_score(agent.preferences) for item in agent.items},
+        )
+
+    @classmethod
+    def from_preferences(
+        cls, unique_id: int, name: str, items: List[Item], preferences: Preferences
+    ) -> "AgentSummary":
+        """Summarizes an agent which was not created from its preferences."""
+        scores = {item.name: item.get_score(preferences) for item in items}
+        return cls(
+            unique_id,
+            name,
+            # Same order as ArgumentAgent.items
+            sorted(scores, key=lambda name: scores[name], reverse=True),  # type: ignore
+            scores,
+        )
@@ -0,0 +1,140 @@
+"""Agreement predictor"""
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from communication.argumentation.argument_agent import list_supporting_premises
+from communication.argumentation.argument_model import ArgumentModel
+from communication.preferences.item import Item
+from communication.preferences.preferences import Preferences
+
+# Messages of a trivial negociation: PROPOSE, ACCEPT, COMMIT, COMMIT
+TRIVIAL_NUM_MESSAGES = 4
+
+
+def build_score_matrix(
+    preferences_list: List[Preferences], items: List[Item]
+) -> np.ndarray:
+    """Compute the scores (see Item.get_score) of the items for a population
+    :return: an agents x items matrix"""
+    num_criteria = max(
+        (
+            len(preferences.get_criterion_name_list())
+            for preferences in preferences_list
+        ),
+        default=0,
+    )
+    # values[agent, item, rank]: value of the item on the rank-th criterion of the agent
+    values = np.zeros((len(preferences_list), len(items), num_criteria))
+    for agent_index, preferences in enumerate(preferences_list):
+        for rank, criterion in enumerate(preferences.get_criterion_name_list()):
+            for item_index, item in enumerate(items):
+                values[agent_index, item_index, rank] = preferences.get_value(
+                    item, criterion
+                ).value
+    weights = 100 / 2 ** np.arange(num_criteria)
+    return np.asarray(np.einsum("aic,c->ai", values, weights))
+
+
+def get_top_items(scores: np.ndarray, percentage: int) -> np.ndarray:
+    """Compute the items among the top percentage of each agent (see
+    Preferences.is_item_among_top_percent), ties being broken by item order
+    :return: an agents x items boolean matrix"""
+    num_items = scores.shape[1]
+    num_top = max(1, int(num_items * percentage / 100))
+    ranks = np.empty_like(scores, dtype=int)
+    order = np.argsort(-scores, axis=1, kind="stable")
+    np.put_along_axis(
+        ranks, order, np.broadcast_to(np.arange(num_items), scores.shape), axis=1
+    )
+    return ranks < num_top
+
+
+class AgreementPredictor:
+    """AgreementPredictor class.
+    This class predicts the outcome of the negociations which end at the first
+    proposal: the agent with the smallest id proposes its favourite item and
+    the other agent accepts it if the item is among its top percentage.
+    These pairs can be resolved without simulating the negociation.
+
+    attr:
+        agent_ids: the ids of the agents, sorted
+        items: the items of the negociation
+        scores: the agents x items score matrix
+        favourite_items: the index of the favourite item of each agent
+        top_items: the agents x items matrix of the items among the top percentage
+    """
+
+    def __init__(
+        self,
+        agent_ids: List[int],
+        preferences_list: List[Preferences],
+        items: List[Item],
+        percentage: int,
+    ):
+        """Creates a new predictor from the preferences of the agents."""
+        order = np.argsort(agent_ids, kind="stable")
+        self.agent_ids = [agent_ids[index] for index in order]
+        self.__preferences = [preferences_list[index] for index in order]
+        self.__indexes = {agent_id: i for i, agent_id in enumerate(self.agent_ids)}
+        self.items = items
+        self.scores = build_score_matrix(self.__preferences, items)
+        self.favourite_items = np.argmax(self.scores, axis=1)
+        self.top_items = get_top_items(self.scores, percentage)
+
+    @classmethod
+    def from_model(
+        cls, argument_model: ArgumentModel, agent_ids: List[int]
+    ) -> "AgreementPredictor":
+        """Creates a predictor for some agents of a model."""
+        return cls(
+            agent_ids,
+            [argument_model.load_agent_preferences(agent_id) for agent_id in agent_ids],
+            argument_model.items,
+            argument_model.concession_strategy.initial_percentage,
+        )
+
+    def top_sets_intersect(self) -> np.ndarray:
+        """Returns whether the top items of each pair of agents intersect.
+        This is necessary but not sufficient for the negociation to be trivial."""
+        top_items = self.top_items.astype(np.int32)
+        return np.asarray(top_items @ top_items.T > 0)
+
+    def predict_all_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Predict the trivial negociations of all the pairs at once
+        :return: an agents x agents boolean matrix of the trivial pairs and an
+        agents x agents matrix of the index of their chosen item (-1 otherwise)"""
+        # accepted[i, j]: agent j accepts the favourite item of agent i
+        accepted = self.top_items[:, self.favourite_items].T
+        proposer_first = np.triu(np.ones(accepted.shape, dtype=bool), k=1)
+        resolved = np.where(proposer_first, accepted, accepted.T)
+        np.fill_diagonal(resolved, False)
+        chosen = np.where(
+            proposer_first,
+            self.favourite_items[:, np.newaxis],
+            self.favourite_items[np.newaxis, :],
+        )
+        return resolved, np.where(resolved, chosen, -1)
+
+    def predict(self, agent_1: int, agent_2: int) -> Optional[Dict[str, Any]]:
+        """Predict the result of the negociation between two agents
+        :return: the result of the negociation, None if it is not trivial"""
+        proposer, responder = min(agent_1, agent_2), max(agent_1, agent_2)
+        proposer_index = self.__indexes[proposer]
+        favourite_item = self.favourite_items[proposer_index]
+        if not self.top_items[self.__indexes[responder], favourite_item]:
+            return None
+
+        chosen_item = self.items[favourite_item]
+        return {
+            "winning_agent": proposer,
+            "losing_agent": responder,
+            "chosen_item": chosen_item,
+            "arguments": list_supporting_premises(
+                self.__preferences[proposer_index], chosen_item
+            ),
+            "steps": None,
+            "messages": TRIVIAL_NUM_MESSAGES,
+            "concessions": 0,
+            "seed": None,
+        }
@@ -1,10 +1,16 @@
 """Argument agent"""
 # pylint: disable=W0631,W0612,R0902, E0401
 from functools import reduce
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 
-from communication import config
 from communication.agent.communicating_agent import CommunicatingAgent
+from communication.argumentation.argumentation_framework import Label
+from communication.argumentation.bundle_space import BundleSpace
+from communication.argumentation.concession import (
+    ConcessionStrategy,
+    LinearConcession,
+)
+from communication.argumentation.conversation import Conversation
 from communication.argumentation.states import NegotationState
 from communication.arguments.argument import Argument
 from communication.arguments.comparison import Comparison
@@ -14,12 +20,44 @@ from communication.message.message_performative import MessagePerformative
 from communication.preferences import CriterionName, Item, Preferences, Value
 
 
+def list_supporting_premises(preferences: Preferences, item: Item) -> List[CoupleValue]:
+    """Generate the list of premisses which can be used to support an item
+    according to some preferences (sorted by order of importance)"""
+    return sorted(
+        [
+            CoupleValue(criterion, preferences.get_value(item, criterion))
+            for criterion in preferences.get_criterion_name_list()
+            if preferences.get_value(item, criterion).value >= Value.GOOD.value
+        ],
+        key=lambda cv: cv.value.value,  # type: ignore
+        reverse=True,
+    )
+
+
 class ArgumentAgent(CommunicatingAgent):
-    """ArgumentAgent which inherit from CommunicatingAgent ."""
+    """ArgumentAgent which inherit from CommunicatingAgent .
+
+    The negotiation state of the agent is kept per conversation, the default
+    conversation (id None) being held with all the other agents of the model.
+    With settle_debates, the agent does not argue against an argument it
+    already failed to defeat (settled IN in the framework of the conversation),
+    e.g. when an item is proposed again after a concession.
+    Given some bundles, the agent proposes and accepts bundles of items instead
+    of single items, the bundles being ranked by the BundleSpace.
+    """
 
     def __init__(
-        self, unique_id, model, name: str, items: List[Item], preferences: Preferences
-    ):
+        self,
+        unique_id,
+        model,
+        name: str,
+        items: List[Item],
+        preferences: Preferences,
+        concession_strategy: Optional[ConcessionStrategy] = None,
+        default_conversation: bool = True,
+        settle_debates: bool = False,
+        bundles: Optional[BundleSpace] = None,
+    ):  # pylint: disable=too-many-arguments
         super().__init__(unique_id, model, name)
         self.__preferences = preferences
         self.items = sorted(
@@ -27,13 +65,16 @@ class ArgumentAgent(CommunicatingAgent):
             key=lambda item: item.get_score(self.__preferences),  # type: ignore
             reverse=True,
         )
-        self.proposed_items: List[Item] = []
-        self.negotation_state = NegotationState.REST
-        self.current_item: Optional[Item] = None
-        self.convinced_agents: Dict[str, bool] = {}
-        self.arguments_used: List[Argument] = []
-        self.is_leading: bool = False
-        self.percentage = config.INITIAL_PERCENTAGE
+        self.concession_strategy = (
+            concession_strategy
+            if concession_strategy is not None
+            else LinearConcession()
+        )
+        self.settle_debates = settle_debates
+        self.bundles = bundles
+        self.conversations: Dict[Optional[int], Conversation] = {}
+        if default_conversation:
+            self.open_conversation(None)
 
     def __str__(self) -> str:
         return f"""
@@ -49,43 +90,88 @@ class ArgumentAgent(CommunicatingAgent):
         """Get preferences"""
         return self.__preferences
 
+    def proposals(self) -> Sequence[Item]:
+        """Get the items (or the bundles) the agent can propose, by order of
+        preference"""
+        if self.bundles is not None:
+            return self.bundles
+        return self.items
+
+    def __is_among_top_percent(self, item: Item, percentage: int) -> bool:
+        """Check if an item (or a bundle) is among the top percentage of the
+        proposals of the agent"""
+        if self.bundles is not None:
+            return self.bundles.is_among_top_percent(item, percentage)
+        return self.preferences.is_item_among_top_percent(item, self.items, percentage)
+
+    def open_conversation(
+        self,
+        conversation_id: Optional[int],
+        peers: Optional[List[str]] = None,
+        initiator: Optional[str] = None,
+    ) -> Conversation:
+        """Open a new conversation with some peers
+        :param peers: the names of the other agents, None for all the agents of the model
+        :param initiator: the name of the agent starting the conversation, None for
+        the agent with the smallest id of the model"""
+        conversation = Conversation(
+            conversation_id,
+            self.concession_strategy.initial_percentage,
+            peers,
+            initiator,
+        )
+        self.conversations[conversation_id] = conversation
+        return conversation
+
+    def close_conversation(self, conversation_id: Optional[int]) -> None:
+        """Forget the state of a conversation"""
+        del self.conversations[conversation_id]
+
+    def conversation(self, conversation_id: Optional[int] = None) -> Conversation:
+        """Get the state of a conversation (the default one if no id is given)"""
+        return self.conversations[conversation_id]
+
     def step(self) -> None:
         """Step function"""
 
-        # First step: we must begin the conversation
-        if self.negotation_state == NegotationState.REST:
-            self.__start_conversation()
+        # First step: we must begin the conversations
+        self.__start_conversations()
 
         for new_message in self.get_new_messages():
+            conversation = self.conversations[new_message.conversation_id]
+            conversation.num_messages += 1
 
             if new_message.performative == MessagePerformative.PROPOSE:
-                self.__propose_performative_callback(new_message)
+                self.__propose_performative_callback(conversation, new_message)
 
             # Second case: the other agent sends an accept message
             elif new_message.performative == MessagePerformative.ACCEPT:
-                self.__accept_performative_callback(new_message)
+                self.__accept_performative_callback(conversation, new_message)
 
             # Third case: the other agent sends an ask why message
             elif new_message.performative == MessagePerformative.ASK_WHY:
-                self.__ask_why_performative_callback(new_message)
+                self.__ask_why_performative_callback(conversation, new_message)
 
             # Fourth case: the other agent sends an argue why message
             elif new_message.performative == MessagePerformative.ARGUE:
-                self.__argue_performative_callback(new_message)
+                self.__argue_performative_callback(conversation, new_message)
 
             # Fifth case: the other agent sends a commit message
             elif new_message.performative == MessagePerformative.COMMIT:
-                self.__commit_performative_callback(new_message)
+                self.__commit_performative_callback(conversation, new_message)
 
             elif new_message.performative == MessagePerformative.NOT_AGREE:
-                self.__loose_constraints()
-                if self.current_item is None:
-                    self.current_item = self.__get_best_item_to_propose()
+                self.__loose_constraints(conversation)
+                if conversation.current_item is None:
+                    conversation.current_item = self.__get_best_item_to_propose(
+                        conversation
+                    )
 
-                self.__propose_new_item()
+                self.__propose_new_item(conversation)
 
     def __get_attack_argument(
         self,
+        conversation: Conversation,
         premises_couple_value: List[CoupleValue],
         item: Item,
         is_chosen: bool,
@@ -105,7 +191,7 @@ class ArgumentAgent(CommunicatingAgent):
                 )
             )
 
-            if not self.__argument_was_used(arg):
+            if not self.__argument_was_used(conversation, arg):
                 return arg
             return None
 
@@ -126,7 +212,7 @@ class ArgumentAgent(CommunicatingAgent):
                 Comparison(criterion_name, premise.criterion_name)
             )
 
-            if not self.__argument_was_used(arg):
+            if not self.__argument_was_used(conversation, arg):
                 return arg
             return None
 
@@ -145,7 +231,7 @@ class ArgumentAgent(CommunicatingAgent):
                 )
             )
 
-            if not self.__argument_was_used(arg):
+            if not self.__argument_was_used(conversation, arg):
                 return arg
             return None
 
@@ -156,7 +242,7 @@ class ArgumentAgent(CommunicatingAgent):
             if is_chosen:
                 # Another more important criterion is bad
                 counter_argument = self.other_more_important_criterion_is_bad(
-                    premise, item, is_chosen
+                    premise, item, is_chosen, conversation
                 )
                 # if bad_criterion is not None:
                 #     counter_argument = add_couple_value_to_arg(
@@ -193,120 +279,153 @@ class ArgumentAgent(CommunicatingAgent):
 
         return None
 
-    def __get_best_item_to_propose(self) -> Optional[Item]:
+    def __get_best_item_to_propose(self, conversation: Conversation) -> Optional[Item]:
         """Get best item to propose that wasn't already proposed"""
-        for item in self.items:
-            if (
-                item.name not in self.proposed_items
-                and self.preferences.is_item_among_top_percent(
-                    item, self.items, self.percentage
-                )
-            ):
-                self.proposed_items.append(item.name)
+        for item in self.proposals():
+            # The proposals being sorted, the next ones are not in the top either
+            if not self.__is_among_top_percent(item, conversation.percentage):
+                return None
+            if item not in conversation.proposed_items:
+                conversation.proposed_items.append(item)
                 return item
         return None
 
-    def __loose_constraints(self) -> None:
+    def __loose_constraints(self, conversation: Conversation) -> None:
         """Loose teh constraints"""
-        self.proposed_items = []
-
-        self.negotation_state = NegotationState.ARGUING
-        self.percentage += config.INCREASE_PERCENTAGE
-        self.current_item = None
-        self.convinced_agents = {}
-        self.arguments_used = []
+        conversation.proposed_items = []
+
+        conversation.negotation_state = NegotationState.ARGUING
+        conversation.percentage = self.concession_strategy.next_percentage(
+            conversation.percentage,
+            conversation.num_concessions,
+            conversation.opponent_proposals,
+            self.proposals(),
+        )
+        conversation.num_concessions += 1
+        conversation.current_item = None
+        conversation.convinced_agents = {}
+        conversation.arguments_used = []
         # percentage of items that are ok is increased
 
-    def __propose_new_item(self) -> None:
+    def __get_peers(self, conversation: Conversation) -> List[str]:
+        """Get the names of the other agents of a conversation"""
+        if conversation.peers is not None:
+            return conversation.peers
+        return [
+            agent.name
+            for agent in self.model.schedule.agents
+            if agent.name != self.name
+        ]
+
+    def __propose_new_item(self, conversation: Conversation) -> None:
         """Propose new item"""
-        self.is_leading = True
-        self.convinced_agents = {}
-        for agent in self.model.schedule.agents:
-            if agent.name != self.name:
-                self.__send_propose_message(agent.name)
-        self.negotation_state = NegotationState.ARGUING
-
-    def __start_conversation(self) -> None:
+        conversation.is_leading = True
+        conversation.convinced_agents = {}
+        conversation.last_argument = None
+        for peer in self.__get_peers(conversation):
+            self.__send_propose_message(conversation, peer)
+        conversation.negotation_state = NegotationState.ARGUING
+
+    def __start_conversations(self) -> None:
+        """Start the conversations which are not started yet"""
+        for conversation in list(self.conversations.values()):
+            if conversation.negotation_state == NegotationState.REST:
+                self.__start_conversation(conversation)
+
+    def __start_conversation(self, conversation: Conversation) -> None:
         """Start conversation"""
-        min_id = self.unique_id
-        for agent in self.model.schedule.agents:
-            min_id = min(min_id, agent.unique_id)
+        if conversation.initiator is not None:
+            is_initiator = conversation.initiator == self.name
+        else:
+            min_id = self.unique_id
+            for agent in self.model.schedule.agents:
+                min_id = min(min_id, agent.unique_id)
+            is_initiator = min_id == self.unique_id
 
         # Agent with min id starts the conversation
-        if min_id == self.unique_id:
-            self.current_item = self.__get_best_item_to_propose()
-            self.__propose_new_item()
+        if is_initiator:
+            conversation.current_item = self.__get_best_item_to_propose(conversation)
+            self.__propose_new_item(conversation)
 
-    def __commit_performative_callback(self, message: Message) -> None:
+    def __commit_performative_callback(
+        self, conversation: Conversation, message: Message
+    ) -> None:
         """Commit performative callback: the other agent commits an item."""
-        if self.current_item is None:
+        if conversation.current_item is None:
             raise ValueError("Current item is None")
 
         if (
             isinstance(message.content, Item)
-            and self.current_item.name == message.content.name
-            and self.current_item.name in [item.name for item in self.items]
+            and conversation.current_item is message.content
+            and conversation.current_item in self.proposals()
         ):
-            if self.negotation_state == NegotationState.WAITING_ANSWER_ACCEPT:
+            if conversation.negotation_state == NegotationState.WAITING_ANSWER_ACCEPT:
                 self.send_message(
                     Message(
                         self.name,
                         message.sender,
                         MessagePerformative.COMMIT,
-                        self.current_item,
+                        conversation.current_item,
+                        conversation.conversation_id,
                     )
                 )
-                self.negotation_state = NegotationState.FINISHED
-            elif self.negotation_state == NegotationState.WAITING_FOR_COMMIT:
-                self.convinced_agents[message.sender] = True
+                conversation.negotation_state = NegotationState.FINISHED
+            elif conversation.negotation_state == NegotationState.WAITING_FOR_COMMIT:
+                conversation.convinced_agents[message.sender] = True
 
-                if reduce(lambda x, y: x and y, self.convinced_agents.values()):
-                    self.negotation_state = NegotationState.FINISHED
+                if reduce(lambda x, y: x and y, conversation.convinced_agents.values()):
+                    conversation.negotation_state = NegotationState.FINISHED
         else:
             raise ValueError("Commit message is not valid")
 
-    def __accept_performative_callback(self, message: Message) -> None:
+    def __accept_performative_callback(
+        self, conversation: Conversation, message: Message
+    ) -> None:
         """Accept performative callback: the other agent accepts an item."""
-        if self.current_item is None:
+        if conversation.current_item is None:
             raise ValueError("Current item is None")
 
         if (
             isinstance(message.content, Item)
-            and self.negotation_state == NegotationState.ARGUING
-            and self.current_item.name == message.content.name
+            and conversation.negotation_state == NegotationState.ARGUING
+            and conversation.current_item is message.content
         ):
-            self.convinced_agents[message.sender] = True
-            if reduce(lambda x, y: x and y, self.convinced_agents.values()):
-                for agent in self.convinced_agents.keys():
+            conversation.convinced_agents[message.sender] = True
+            if reduce(lambda x, y: x and y, conversation.convinced_agents.values()):
+                for agent in conversation.convinced_agents.keys():
                     self.send_message(
                         Message(
                             self.name,
                             agent,
                             MessagePerformative.COMMIT,
                             message.content,
+                            conversation.conversation_id,
                         )
                     )
-                self.negotation_state = NegotationState.WAITING_FOR_COMMIT
-                self.convinced_agents = {
-                    agent: False for agent in self.convinced_agents.keys()
+                conversation.negotation_state = NegotationState.WAITING_FOR_COMMIT
+                conversation.convinced_agents = {
+                    agent: False for agent in conversation.convinced_agents.keys()
                 }
         else:
             raise ValueError("Accept message is not valid")
 
-    def __propose_performative_callback(self, message: Message) -> None:
+    def __propose_performative_callback(
+        self, conversation: Conversation, message: Message
+    ) -> None:
         """Propose performative callback: the other agent proposes an item."""
-        self.is_leading = False
-        self.convinced_agents = {}
+        conversation.is_leading = False
+        conversation.convinced_agents = {}
+        conversation.last_argument = None
+        if isinstance(message.content, Item):
+            conversation.opponent_proposals.append(message.content)
 
-        if self.negotation_state != NegotationState.FINISHED:
+        if conversation.negotation_state != NegotationState.FINISHED:
 
-            if isinstance(
-                message.content, Item
-            ) and self.preferences.is_item_among_top_percent(
-                message.content, self.items, self.percentage
+            if isinstance(message.content, Item) and self.__is_among_top_percent(
+                message.content, conversation.percentage
             ):
-                self.current_item = message.content
-                self.__send_accept_message(message.sender)
+                conversation.current_item = message.content
+                self.__send_accept_message(conversation, message.sender)
 
             elif isinstance(message.content, Item):
                 self.send_message(
@@ -315,61 +434,74 @@ class ArgumentAgent(CommunicatingAgent):
                         message.sender,
                         MessagePerformative.ASK_WHY,
                         message.content,
+                        conversation.conversation_id,
                     )
                 )
-                self.current_item = message.content
-                self.negotation_state = NegotationState.ARGUING
+                conversation.current_item = message.content
+                conversation.negotation_state = NegotationState.ARGUING
         else:
             raise ValueError("Propose message is not valid")
 
-    def __ask_why_performative_callback(self, message: Message) -> None:
+    def __ask_why_performative_callback(
+        self, conversation: Conversation, message: Message
+    ) -> None:
         """Ask why performative callback: The agent other agent sent an ask why message"""
-        # assert self.negotation_state is not None
+        # assert conversation.negotation_state is not None
 
-        if self.current_item is None:
+        if conversation.current_item is None:
             raise ValueError("Current item is None")
 
         if (
             isinstance(message.content, Item)
-            and self.negotation_state == NegotationState.ARGUING
-            and self.current_item.name == message.content.name
+            and conversation.negotation_state == NegotationState.ARGUING
+            and conversation.current_item is message.content
         ):
-            argument = self.support_proposal(self.current_item)
+            argument = self.support_proposal(conversation.current_item, conversation)
 
             if argument is not None:
 
-                self.arguments_used.append(argument)
+                conversation.arguments_used.append(argument)
+                conversation.last_argument = conversation.framework.add_argument(
+                    argument
+                )
                 self.send_message(
                     Message(
                         self.name,
                         message.sender,
                         MessagePerformative.ARGUE,
                         argument,
+                        conversation.conversation_id,
                     )
                 )
                 return
         raise ValueError("Ask why message is not valid")
 
-    def __argue_performative_callback(self, message: Message) -> None:
+    def __argue_performative_callback(
+        self, conversation: Conversation, message: Message
+    ) -> None:
         """Argue performative callback: The agent other agent sent an argue message"""
         assert isinstance(
             message.content, Argument
         ), "Message content should be an Argument"
 
-        if self.current_item is None:
+        if conversation.current_item is None:
             raise ValueError("Current item is None")
 
         if (
-            self.negotation_state == NegotationState.ARGUING
-            and self.current_item.name == message.content.item.name
+            conversation.negotation_state == NegotationState.ARGUING
+            and conversation.current_item is message.content.item
         ):
-            self.__send_attack_message(message)
+            # The argument received attacks the last one sent
+            received = conversation.framework.add_argument(message.content)
+            if conversation.last_argument is not None:
+                conversation.framework.add_attack(received, conversation.last_argument)
+            self.__send_attack_message(conversation, message, received)
 
-    def __send_propose_message(self, dest: str) -> None:
+    def __send_propose_message(self, conversation: Conversation, dest: str) -> None:
         """Sends a propose message"""
 
-        if self.current_item is None:
-            self.__send_not_agree(dest)
+        if conversation.current_item is None:
+            self.__send_not_agree(conversation, dest)
             return
 
         self.send_message(
@@ -377,14 +509,15 @@ class ArgumentAgent(CommunicatingAgent):
                 self.name,
                 dest,
                 MessagePerformative.PROPOSE,
-                self.current_item,
+                conversation.current_item,
+                conversation.conversation_id,
             )
         )
-        self.convinced_agents[dest] = False
+        conversation.convinced_agents[dest] = False
 
-    def __send_accept_message(self, dest: str) -> None:
+    def __send_accept_message(self, conversation: Conversation, dest: str) -> None:
         """Sends an accept messsage"""
-        if self.current_item is None:
+        if conversation.current_item is None:
             raise ValueError("Current item is None")
 
         self.send_message(
@@ -392,78 +525,105 @@ class ArgumentAgent(CommunicatingAgent):
                 self.name,
                 dest,
                 MessagePerformative.ACCEPT,
-                self.current_item,
+                conversation.current_item,
+                conversation.conversation_id,
             )
         )
-        self.negotation_state = NegotationState.WAITING_ANSWER_ACCEPT
+        conversation.negotation_state = NegotationState.WAITING_ANSWER_ACCEPT
 
-    def __send_not_agree(self, dest: str) -> None:
+    def __send_not_agree(self, conversation: Conversation, dest: str) -> None:
         """Sends an not agree message"""
-        self.__loose_constraints()
+        self.__loose_constraints(conversation)
         self.send_message(
             Message(
                 self.name,
                 dest,
                 MessagePerformative.NOT_AGREE,
                 "We have to loose our constraints",
+                conversation.conversation_id,
             )
         )
 
-    def __send_attack_message(self, message: Message) -> None:
-        """Send attack message"""
+    def __send_attack_message(
+        self, conversation: Conversation, message: Message, received: int
+    ) -> None:
+        """Send attack message
+        :param received: the index of the argument of the message in the
+        framework of the conversation"""
         assert isinstance(
             message.content, Argument
         ), "Message content should be an Argument"
 
-        argument = self.__get_attack_argument(
-            message.content.premises_couple_values,
-            message.content.item,
-            message.content.decision,
-        )
+        if (
+            self.settle_debates
+            and conversation.framework.settled_label(received) == Label.IN
+        ):
+            # The agent already failed to defeat this argument
+            argument = None
+        else:
+            argument = self.__get_attack_argument(
+                conversation,
+                message.content.premises_couple_values,
+                message.content.item,
+                message.content.decision,
+            )
+        # The argument received gets no other answer
+        conversation.framework.close(received)
 
         if argument is None:
             if (
-                self.current_item is not None
-                and not self.is_leading
-                and self.preferences.is_item_among_top_percent(
-                    self.current_item, self.items, int(self.percentage * 1.2)
+                conversation.current_item is not None
+                and not conversation.is_leading
+                and self.__is_among_top_percent(
+                    conversation.current_item,
+                    self.concession_strategy.acceptance_percentage(
+                        conversation.percentage
+                    ),
                 )
             ):
-                self.__send_accept_message(message.sender)
+                self.__send_accept_message(conversation, message.sender)
             else:
                 # no attack message was found, propose another item
-                self.current_item = self.__get_best_item_to_propose()
+                conversation.current_item = self.__get_best_item_to_propose(
+                    conversation
+                )
 
-                if self.current_item is not None:
-                    self.__propose_new_item()
+                if conversation.current_item is not None:
+                    self.__propose_new_item(conversation)
                 else:
-                    self.__send_not_agree(message.sender)
+                    self.__send_not_agree(conversation, message.sender)
 
         else:
-            if self.current_item is None:
+            if conversation.current_item is None:
                 raise ValueError("Current item is None")
 
-            if argument.item.name == self.current_item.name:
-                self.arguments_used.append(argument)
+            # Arguing for another item also attacks the argument received
+            attack = conversation.framework.add_argument(argument)
+            conversation.framework.add_attack(attack, received)
+            if argument.item is conversation.current_item:
+                conversation.arguments_used.append(argument)
+                conversation.last_argument = attack
                 self.send_message(
                     Message(
                         self.name,
                         message.sender,
                         MessagePerformative.ARGUE,
                         argument,
+                        conversation.conversation_id,
                     )
                 )
             else:
-                self.current_item = argument.item
-                self.__propose_new_item()
+                conversation.current_item = argument.item
+                self.__propose_new_item(conversation)
 
-    def __argument_was_used(self, argument: Argument) -> bool:
+    @staticmethod
+    def __argument_was_used(conversation: Conversation, argument: Argument) -> bool:
         """Check if the argument was used in the negotiation"""
-        if len(self.arguments_used) == 0:
+        if len(conversation.arguments_used) == 0:
             return False
-        for argument_used in self.arguments_used:
+        for argument_used in conversation.arguments_used:
             if (
-                argument_used.item.name == argument.item.name
+                argument_used.item is argument.item
                 and argument_used.premises_couple_values
                 == argument.premises_couple_values
                 and argument_used.premises_comparison == argument.premises_comparison
@@ -476,16 +636,7 @@ class ArgumentAgent(CommunicatingAgent):
         :param item: Item - name of the item
         :return: list of all premisses PRO an item (sorted by order of importance
         based on agent’s preferences)"""
-        return sorted(
-            [
-                CoupleValue(criterion, self.__preferences.get_value(item, criterion))
-                for criterion in self.__preferences.get_criterion_name_list()
-                if self.__preferences.get_value(item, criterion).value
-                >= Value.GOOD.value
-            ],
-            key=lambda cv: cv.value.value,  # type: ignore
-            reverse=True,
-        )
+        return list_supporting_premises(self.__preferences, item)
 
     def list_attacking_proposal(self, item: Item) -> List[CoupleValue]:
         """List attacking proposal"""
@@ -500,18 +651,23 @@ class ArgumentAgent(CommunicatingAgent):
             reverse=True,
         )
 
-    def support_proposal(self, item: Item) -> Optional[Argument]:
+    def support_proposal(
+        self, item: Item, conversation: Optional[Conversation] = None
+    ) -> Optional[Argument]:
         """
         Used when the agent receives "ASK_WHY" after having proposed an item
         :param item: str
          - name of the item which was proposed
+        :param conversation: the conversation (the default one if None)
         :return: string - the strongest supportive argument
         """
+        if conversation is None:
+            conversation = self.conversation()
         for couple_value in self.list_supporting_proposal(item):
             arg = Argument(True, item)
             arg.add_premiss_couple_values(couple_value)
-            if not self.__argument_was_used(arg):
-                self.arguments_used.append(arg)
+            if not self.__argument_was_used(conversation, arg):
+                conversation.arguments_used.append(arg)
                 return arg
         return None
 
@@ -529,7 +685,13 @@ class ArgumentAgent(CommunicatingAgent):
         self, premise: CoupleValue, item: Item
     ) -> Optional[Item]:
         """Found better item for a premise"""
-        for item_ in self.items:
+        if (
+            self.bundles is not None
+            and self.bundles.max_value(premise.criterion_name).value
+            <= premise.value.value
+        ):
+            return None
+        for item_ in self.proposals():
             if item_ != item:
                 if (
                     self.__preferences.get_value(item_, premise.criterion_name).value
@@ -539,9 +701,15 @@ class ArgumentAgent(CommunicatingAgent):
         return None
 
     def other_more_important_criterion_is_bad(
-        self, premise: CoupleValue, item: Item, is_chosen: bool
+        self,
+        premise: CoupleValue,
+        item: Item,
+        is_chosen: bool,
+        conversation: Optional[Conversation] = None,
     ) -> Optional[Argument]:
         """Check if there is another more important criterion"""
+        if conversation is None:
+            conversation = self.conversation()
         for criterion in self.__preferences.get_criterion_name_list():
             if (
                 criterion != premise.criterion_name
@@ -560,7 +728,7 @@ class ArgumentAgent(CommunicatingAgent):
                     Comparison(criterion, premise.criterion_name)
                 )
 
-                if not self.__argument_was_used(arg):
+                if not self.__argument_was_used(conversation, arg):
                     return arg
 
         return None
@@ -574,18 +742,24 @@ class ArgumentAgent(CommunicatingAgent):
 
             if self.__preferences.get_value(item, criterion).value > min(
                 Value.AVERAGE.value,
-                min(
-                    [
-                        self.__preferences.get_value(item_, criterion).value
-                        for item_ in self.items
-                        if self.__preferences.get_value(item_, criterion) is not None
-                    ]
-                ),
+                self.__worst_value(criterion),
             ):
                 return criterion
 
         return None
 
+    def __worst_value(self, criterion: CriterionName) -> int:
+        """Get the worst value of the proposals on a criterion"""
+        if self.bundles is not None:
+            return self.bundles.min_value(criterion).value
+        return min(
+            [
+                self.__preferences.get_value(item_, criterion).value
+                for item_ in self.items
+                if self.__preferences.get_value(item_, criterion) is not None
+            ]
+        )
+
     def get_best_criterion(self, item: Item):
         """Get the best criterion for an item"""
         return max(
@@ -1,21 +1,53 @@
 """Argument model"""
 # pylint: disable=E0401
 import os
-from typing import Dict, List, Optional, Tuple
+import random
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
 
 from mesa import Model
 from mesa.time import RandomActivation
 
+from communication import config
+from communication.argumentation.agent_summary import AgentSummary
 from communication.argumentation.argument_agent import ArgumentAgent
-from communication.argumentation.preferences_generator import load_preferences
+from communication.argumentation.bundle_space import BundleSpace
+from communication.argumentation.concession import (
+    ConcessionStrategy,
+    LinearConcession,
+)
+from communication.argumentation.preferences_generator import (
+    load_shared_preferences,
+)
+from communication.argumentation.run_config import RunConfig
 from communication.argumentation.states import NegotationState
+from communication.argumentation.tournament_metrics import TournamentMetrics
 from communication.message.message_service import MessageService
 from communication.preferences.criterion_name import CriterionName
 from communication.preferences.item import Item
+from communication.preferences.preferences import Preferences
+from communication.preferences.shared_preferences import SharedPopulation
+
+
+def get_pair_seed(seed: Optional[int], agent_1: int, agent_2: int) -> Optional[int]:
+    """Derive the seed of the discussion between two agents from a model seed,
+    independently of the order in which the pairs are run"""
+    if seed is None:
+        return None
+    return random.Random(
+        f"{seed}:{min(agent_1, agent_2)}:{max(agent_1, agent_2)}"
+    ).getrandbits(32)
 
 
 class ArgumentModel(Model):  # pylint: disable=too-many-instance-attributes
-    """ArgumentModel which inherit from Model ."""
+    """ArgumentModel which inherit from Model .
+    Its negociations are run with the concession strategy, the seed, the
+    maximum number of steps and the settlement of the debates of a RunConfig
+    if one is given (see configure),
+    and counted by TournamentMetrics if some are given.
+    Its agents negociate bundles of bundle_size items if it is set.
+    """
 
     def __init__(
         self,
@@ -23,37 +55,112 @@ class ArgumentModel(Model):  # pylint: disable=too-many-instance-attributes
         items: List[Item],
         criteria: List[CriterionName],
         preferences_folder: str,
-    ):
+        concession_strategy: Optional[ConcessionStrategy] = None,
+        seed: Optional[int] = None,
+        population: Optional[SharedPopulation] = None,
+        run_config: Optional[RunConfig] = None,
+        metrics: Optional[TournamentMetrics] = None,
+    ):  # pylint: disable=too-many-arguments
         super().__init__()
         self.schedule = RandomActivation(self)
-        MessageService(self.schedule)
+        MessageService(self.schedule).set_metrics(metrics)
+        self.metrics = metrics
         self.items = items
         self.criteria = criteria
         self.preferences_folder = preferences_folder
         self.num_agents = number_agents
+        self.seed = seed
+        self.population = population
         self.all_agents: List[ArgumentAgent] = []
         self.commiting = False
-        self.agents_history: Dict[int, ArgumentAgent] = {}
+        self.agents_history: Dict[int, AgentSummary] = {}
+        self.__discussions: Dict[int, Tuple[ArgumentAgent, ArgumentAgent]] = {}
+        # Profiles of the loaded preferences, kept while an agent uses them
+        self.__profiles: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self.concession_strategy = (
+            concession_strategy
+            if concession_strategy is not None
+            else LinearConcession()
+        )
+        self.max_num_steps = config.MAX_NUM_STEPS
+        self.settle_debates = config.SETTLE_DEBATES
+        # Number of items of the bundles negociated, None for single items
+        self.bundle_size: Optional[int] = None
+        self.run_config = run_config
+        if run_config is not None:
+            self.configure(run_config)
 
-    def setup_discussion_between(self, agent_1: int, agent_2: int) -> None:
-        """Setup discussion between two agents"""
-        self.commiting = False
+    def configure(self, run_config: RunConfig) -> None:
+        """Use the parameters of a run configuration for the next negociations,
+        the agents being created with its concession strategy"""
+        self.run_config = run_config
+        self.concession_strategy = run_config.concession_strategy()
+        self.seed = run_config.seed
+        self.max_num_steps = run_config.max_num_steps
+        self.settle_debates = run_config.settle_debates
+
+    def load_agent_preferences(self, agent_id: int) -> Preferences:
+        """Load the preferences of an agent (from the shared population if
+        it holds them), agents with identical preferences files sharing
+        the same profile"""
+        if self.population is not None and agent_id in self.population:
+            return self.population.preferences(agent_id)
+        return load_shared_preferences(
+            os.path.join(self.preferences_folder, f"p{agent_id}.csv"), self.__profiles
+        )
+
+    def build_bundles(self, preferences: Preferences) -> Optional[BundleSpace]:
+        """Build the bundles an agent can propose, None if the agents negociate
+        single items"""
+        if self.bundle_size is None:
+            return None
+        return BundleSpace(self.items, preferences, self.bundle_size)
+
+    def release_agents(self) -> None:
+        """Remove the agents of the last discussions from the model, only their
+        summary being kept in agents_history"""
         for agent in self.all_agents:
             self.schedule.remove(agent)
         self.all_agents = []
 
+    def add_agent(self, agent: ArgumentAgent) -> None:
+        """Add an agent to the model and summarize it"""
+        self.schedule.add(agent)
+        self.all_agents.append(agent)
+        if agent.unique_id not in self.agents_history:
+            self.agents_history[agent.unique_id] = AgentSummary.from_agent(agent)
+
+    def summarize_agents(self, agent_ids: List[int]) -> None:
+        """Add the summary of the agents which were never created (e.g. whose
+        negociations were not run by the model) to agents_history"""
+        for agent_id in agent_ids:
+            if agent_id not in self.agents_history:
+                self.agents_history[agent_id] = AgentSummary.from_preferences(
+                    agent_id,
+                    f"Agent{agent_id}",
+                    self.items,
+                    self.load_agent_preferences(agent_id),
+                )
+
+    def setup_discussion_between(self, agent_1: int, agent_2: int) -> None:
+        """Setup discussion between two agents"""
+        self.commiting = False
+        self.release_agents()
+
         for agent_id in [agent_1, agent_2]:
-            preferences = load_preferences(
-                os.path.join(self.preferences_folder, f"p{agent_id}.csv")
-            )
+            preferences = self.load_agent_preferences(agent_id)
             agent = ArgumentAgent(
-                agent_id, self, f"Agent{agent_id}", self.items, preferences
+                agent_id,
+                self,
+                f"Agent{agent_id}",
+                self.items,
+                preferences,
+                self.concession_strategy,
+                settle_debates=self.settle_debates,
+                bundles=self.build_bundles(preferences),
             )
 
-            self.schedule.add(agent)
-
-            self.all_agents.append(agent)
-            self.agents_history[agent_id] = agent
+            self.add_agent(agent)
 
     def step(self) -> Tuple[Optional[Item], Optional[ArgumentAgent]]:
         """Step"""
@@ -61,11 +168,173 @@ class ArgumentModel(Model):  # pylint: disable=too-many-instance-attributes
         self.schedule.step()
         leading_agent = None
         for agent in self.schedule.agents:
-            if agent.is_leading:
+            if agent.conversation().is_leading:
                 leading_agent = agent
         if all(
-            agent.negotation_state == NegotationState.FINISHED
+            agent.conversation().negotation_state == NegotationState.FINISHED
             for agent in self.schedule.agents
         ):
-            return (self.schedule.agents[0].current_item, leading_agent)
+            return (self.schedule.agents[0].conversation().current_item, leading_agent)
         return None, None
+
+    @staticmethod
+    def __get_result(
+        leading_agent: ArgumentAgent,
+        other_agent: ArgumentAgent,
+        chosen_item: Item,
+        conversation_id: Optional[int],
+        steps: int,
+        seed: Optional[int],
+    ) -> Dict[str, Any]:  # pylint: disable=too-many-arguments
+        """Build the result of a negociation won by the leading agent"""
+        conversations = [
+            leading_agent.conversation(conversation_id),
+            other_agent.conversation(conversation_id),
+        ]
+        return {
+            "winning_agent": leading_agent.unique_id,
+            "losing_agent": other_agent.unique_id,
+            "chosen_item": chosen_item,
+            "arguments": leading_agent.list_supporting_proposal(chosen_item),
+            "steps": steps,
+            "messages": sum(
+                conversation.num_messages for conversation in conversations
+            ),
+            "concessions": sum(
+                conversation.num_concessions for conversation in conversations
+            ),
+            "seed": seed,
+        }
+
+    def run_discussion_between(
+        self,
+        agent_1: int,
+        agent_2: int,
+        max_num_steps: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Run a whole discussion between two agents.
+        :param max_num_steps: by default, the one of the model
+        :param seed: seed of the random generator for this discussion
+        :return: the result of the negociation, None if no agreement was found
+        within max_num_steps steps"""
+        if max_num_steps is None:
+            max_num_steps = self.max_num_steps
+        start = time.perf_counter()
+        if seed is not None:
+            self.reset_randomizer(seed)
+        self.setup_discussion_between(agent_1, agent_2)
+
+        result = None
+        for step in range(1, max_num_steps + 1):
+            chosen_item, leading_agent = self.step()
+            if chosen_item is not None and leading_agent is not None:
+                other_agent = next(
+                    agent for agent in self.all_agents if agent is not leading_agent
+                )
+                result = self.__get_result(
+                    leading_agent, other_agent, chosen_item, None, step, seed
+                )
+                break
+        self.release_agents()
+        if self.metrics is not None:
+            self.metrics.record_negociation(result, time.perf_counter() - start)
+        return result
+
+    def setup_discussions(self, pairs: List[Tuple[int, int]]) -> None:
+        """Setup the discussions of several pairs of agents at once: each agent
+        is created once and holds one conversation per pair it belongs to, the
+        id of a conversation being the index of its pair"""
+        self.commiting = False
+        self.release_agents()
+        self.__discussions = {}
+
+        agents: Dict[int, ArgumentAgent] = {}
+        for agent_id in sorted({agent_id for pair in pairs for agent_id in pair}):
+            preferences = self.load_agent_preferences(agent_id)
+            agent = ArgumentAgent(
+                agent_id,
+                self,
+                f"Agent{agent_id}",
+                self.items,
+                preferences,
+                self.concession_strategy,
+                default_conversation=False,
+                settle_debates=self.settle_debates,
+                bundles=self.build_bundles(preferences),
+            )
+            self.add_agent(agent)
+            agents[agent_id] = agent
+
+        for conversation_id, (agent_1, agent_2) in enumerate(pairs):
+            initiator = agents[min(agent_1, agent_2)].name
+            agents[agent_1].open_conversation(
+                conversation_id, [agents[agent_2].name], initiator
+            )
+            agents[agent_2].open_conversation(
+                conversation_id, [agents[agent_1].name], initiator
+            )
+            self.__discussions[conversation_id] = (agents[agent_1], agents[agent_2])
+
+    def step_discussions(self, step: int = 0) -> List[Tuple[int, Dict[str, Any]]]:
+        """Step all the discussions and close the finished ones
+        :return: the id and the result of each finished discussion"""
+        self.schedule.step()
+        finished = []
+        for conversation_id, (agent_1, agent_2) in list(self.__discussions.items()):
+            conversation_1 = agent_1.conversation(conversation_id)
+            conversation_2 = agent_2.conversation(conversation_id)
+            if (
+                conversation_1.negotation_state == NegotationState.FINISHED
+                and conversation_2.negotation_state == NegotationState.FINISHED
+                and conversation_1.current_item is not None
+                and (conversation_1.is_leading or conversation_2.is_leading)
+            ):
+                leading_agent, other_agent = (
+                    (agent_2, agent_1)
+                    if conversation_2.is_leading
+                    else (agent_1, agent_2)
+                )
+                finished.append(
+                    (
+                        conversation_id,
+                        self.__get_result(
+                            leading_agent,
+                            other_agent,
+                            conversation_1.current_item,
+                            conversation_id,
+                            step,
+                            None,
+                        ),
+                    )
+                )
+                agent_1.close_conversation(conversation_id)
+                agent_2.close_conversation(conversation_id)
+                del self.__discussions[conversation_id]
+        return finished
+
+    def run_discussions(
+        self,
+        pairs: List[Tuple[int, int]],
+        max_num_steps: Optional[int] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Run the discussions of several pairs of agents concurrently, each
+        agent taking part in all the discussions of its pairs at each step
+        :param max_num_steps: by default, the one of the model
+        :return: the result of each pair, None if no agreement was found
+        within max_num_steps steps"""
+        if max_num_steps is None:
+            max_num_steps = self.max_num_steps
+        start = time.perf_counter()
+        self.setup_discussions(pairs)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(pairs)
+        for step in range(1, max_num_steps + 1):
+            for conversation_id, result in self.step_discussions(step):
+                results[conversation_id] = result
+            if len(self.__discussions) == 0:
+                break
+        self.__discussions = {}
+        self.release_agents()
+        if self.metrics is not None:
+            self.metrics.record_negociations(results, time.perf_counter() - start)
+        return results
@@ -0,0 +1,297 @@
+"""Abstract argumentation framework"""
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from communication.arguments.argument import Argument
+
+
+class Label(Enum):
+    """Label enum class.
+    Enumeration containing the possible labels of an argument in an extension.
+    """
+
+    IN = 0
+    OUT = 1
+    UNDEC = 2
+
+
+def argument_key(argument: Argument) -> Tuple:
+    """Returns a key identifying the content of an argument: its decision, its
+    item and its premises"""
+    return (
+        argument.decision,
+        argument.item.name,
+        tuple(
+            (couple_value.criterion_id, couple_value.value.value)
+            for couple_value in argument.premises_couple_values
+        ),
+        tuple(
+            (comparison.best_criterion_id, comparison.worst_criterion_id)
+            for comparison in argument.premises_comparison
+        ),
+    )
+
+
+class ArgumentationFramework:  # pylint: disable=too-many-instance-attributes
+    """ArgumentationFramework class.
+    This class implements a Dung argumentation framework built incrementally
+    from the arguments of a debate, each argument being a node (identified by
+    its index) and each attack an edge. The grounded labelling is updated as
+    the attacks arrive, only the arguments reachable from the attacked one
+    being labelled again.
+
+    The preferred extensions are the grounded extension completed by the
+    maximal admissible sets of the undecided arguments. The undecided
+    arguments are only attacked by OUT or undecided ones, so these sets are
+    searched separately in each connected component of the undecided
+    arguments, and only the components changed by an attack are searched
+    again. The search of a component is exhaustive, exponential in its size
+    (deciding whether an argument is in a preferred extension is NP-hard),
+    which is only tractable for the small cycles of a debate.
+
+    An argument is closed once all its attackers are known (e.g. the agent
+    answering it already replied). The settled labelling is the grounded
+    labelling in which the open arguments have an unknown attacker: an
+    argument settled IN or OUT keeps its label whatever the arguments still
+    to come, so that the debate about it is over.
+
+    attr:
+        arguments: the arguments of the framework, by index
+    """
+
+    def __init__(self):
+        """Creates a new empty framework."""
+        self.arguments: List[Argument] = []
+        self.__indexes: Dict[Tuple, int] = {}
+        self.__attackers: List[Set[int]] = []
+        self.__targets: List[Set[int]] = []
+        self.__closed: List[bool] = []
+        self.__grounded: List[Label] = []
+        self.__settled: List[Label] = []
+        self.__preferred: Optional[List[FrozenSet[int]]] = None
+        # Maximal admissible sets of each connected component of undecided arguments
+        self.__component_extensions: Dict[FrozenSet[int], List[FrozenSet[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.arguments)
+
+    def index(self, argument: Argument) -> Optional[int]:
+        """Returns the index of an argument, None if it is not in the framework."""
+        return self.__indexes.get(argument_key(argument))
+
+    def add_argument(self, argument: Argument) -> int:
+        """Adds an argument, unless an argument with the same content was
+        already added, and returns its index."""
+        key = argument_key(argument)
+        index = self.__indexes.get(key)
+        if index is not None:
+            return index
+        index = len(self.arguments)
+        self.arguments.append(argument)
+        self.__indexes[key] = index
+        self.__attackers.append(set())
+        self.__targets.append(set())
+        self.__closed.append(False)
+        # Without attackers, the argument is in the grounded extension and
+        # undecided until it is closed
+        self.__grounded.append(Label.IN)
+        self.__settled.append(Label.UNDEC)
+        self.__preferred = None
+        return index
+
+    def add_attack(self, attacker: int, target: int) -> None:
+        """Adds an attack between two arguments of the framework."""
+        if attacker in self.__attackers[target]:
+            return
+        self.__attackers[target].add(attacker)
+        self.__targets[attacker].add(target)
+        self.__preferred = None
+        region = self.__relabel(self.__grounded, target, lambda index: False)
+        self.__forget_components({attacker, *region})
+        self.__relabel(self.__settled, target, lambda index: not self.__closed[index])
+
+    def close(self, index: int) -> None:
+        """Marks that all the attackers of an argument are known."""
+        if self.__closed[index]:
+            return
+        self.__closed[index] = True
+        self.__relabel(self.__settled, index, lambda index: not self.__closed[index])
+
+    def attackers(self, index: int) -> Set[int]:
+        """Returns the indexes of the arguments attacking an argument."""
+        return set(self.__attackers[index])
+
+    def grounded_label(self, index: int) -> Label:
+        """Returns the label of an argument in the grounded labelling."""
+        return self.__grounded[index]
+
+    def settled_label(self, index: int) -> Label:
+        """Returns the label of an argument whatever the arguments still to
+        come, UNDEC if it is not settled yet."""
+        return self.__settled[index]
+
+    def is_settled(self, index: int) -> bool:
+        """Returns whether the label of an argument can no longer change."""
+        return self.__settled[index] != Label.UNDEC
+
+    def grounded_extension(self) -> Set[int]:
+        """Returns the indexes of the arguments of the grounded extension."""
+        return {
+            index for index, label in enumerate(self.__grounded) if label == Label.IN
+        }
+
+    def __reachable(self, start: int) -> List[int]:
+        """Returns the arguments reachable from an argument by attacks."""
+        region = [start]
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            for target in self.__targets[queue.popleft()]:
+                if target not in seen:
+                    seen.add(target)
+                    region.append(target)
+                    queue.append(target)
+        return region
+
+    def __relabel(
+        self, labels: List[Label], start: int, is_open: Callable[[int], bool]
+    ) -> List[int]:
+        """Computes again the labels of the arguments reachable from an argument,
+        the labels of the other arguments being unchanged (they do not depend
+        on them): an argument is IN if all its attackers are OUT, OUT if one
+        of them is IN, the open arguments having an unknown attacker.
+        :return: the arguments labelled again
+        """
+        region = self.__reachable(start)
+        in_region = set(region)
+        for index in region:
+            labels[index] = Label.UNDEC
+        # Number of attackers of each argument which are not OUT (yet)
+        pending = {
+            index: sum(
+                labels[attacker] != Label.OUT for attacker in self.__attackers[index]
+            )
+            + int(is_open(index))
+            for index in region
+        }
+        changed = self.__label_from_outside(labels, region, pending)
+        while changed:
+            index = changed.popleft()
+            for target in self.__targets[index]:
+                if target not in in_region or labels[target] != Label.UNDEC:
+                    continue
+                if labels[index] == Label.IN:
+                    labels[target] = Label.OUT
+                    changed.append(target)
+                else:
+                    pending[target] -= 1
+                    if pending[target] == 0:
+                        labels[target] = Label.IN
+                        changed.append(target)
+        return region
+
+    def __label_from_outside(
+        self, labels: List[Label], region: List[int], pending: Dict[int, int]
+    ) -> Deque[int]:
+        """Labels the arguments of a region attacked by an IN argument outside
+        of it OUT, then the arguments without pending attackers IN
+        :return: the arguments labelled"""
+        changed: Deque[int] = deque()
+        for index in region:
+            if any(
+                labels[attacker] == Label.IN for attacker in self.__attackers[index]
+            ):
+                labels[index] = Label.OUT
+                changed.append(index)
+        for index in region:
+            if labels[index] == Label.UNDEC and pending[index] == 0:
+                labels[index] = Label.IN
+                changed.append(index)
+        return changed
+
+    def preferred_extensions(self) -> List[FrozenSet[int]]:
+        """Returns the preferred extensions (the maximal admissible sets of
+        arguments): the grounded extension completed by a maximal admissible
+        set of each component of undecided arguments."""
+        if self.__preferred is not None:
+            return self.__preferred
+        extensions = [frozenset(self.grounded_extension())]
+        for component in self.__undecided_components():
+            component_extensions = self.__component_extensions.get(component)
+            if component_extensions is None:
+                component_extensions = self.__search_preferred(sorted(component))
+                self.__component_extensions[component] = component_extensions
+            extensions = [
+                extension | component_extension
+                for extension in extensions
+                for component_extension in component_extensions
+            ]
+        self.__preferred = sorted(extensions, key=sorted)
+        return self.__preferred
+
+    def __undecided_components(self) -> List[FrozenSet[int]]:
+        """Returns the connected components of the undecided arguments, linked
+        by their attacks in both directions."""
+        components = []
+        seen: Set[int] = set()
+        for start, label in enumerate(self.__grounded):
+            if label != Label.UNDEC or start in seen:
+                continue
+            seen.add(start)
+            component = [start]
+            queue = deque([start])
+            while queue:
+                index = queue.popleft()
+                for other in self.__attackers[index] | self.__targets[index]:
+                    if other not in seen and self.__grounded[other] == Label.UNDEC:
+                        seen.add(other)
+                        component.append(other)
+                        queue.append(other)
+            components.append(frozenset(component))
+        return components
+
+    def __forget_components(self, changed: Set[int]) -> None:
+        """Forgets the extensions of the components containing arguments whose
+        label or attacks changed."""
+        self.__component_extensions = {
+            component: extensions
+            for component, extensions in self.__component_extensions.items()
+            if not component & changed
+        }
+
+    def __search_preferred(self, component: List[int]) -> List[FrozenSet[int]]:
+        """Returns the maximal admissible sets of a component of undecided
+        arguments."""
+        candidates: List[FrozenSet[int]] = []
+        self.__search_admissible(component, 0, set(), candidates)
+        return [
+            candidate
+            for candidate in candidates
+            if not any(candidate < other for other in candidates)
+        ]
+
+    def __search_admissible(
+        self,
+        undecided: List[int],
+        position: int,
+        chosen: Set[int],
+        admissible: List[FrozenSet[int]],
+    ) -> None:
+        """Enumerates the conflict-free sets of undecided arguments by
+        backtracking, keeping those defending all their arguments."""
+        if position == len(undecided):
+            if all(
+                self.__attackers[attacker] & chosen
+                for index in chosen
+                for attacker in self.__attackers[index]
+                if self.__grounded[attacker] == Label.UNDEC
+            ):
+                admissible.append(frozenset(chosen))
+            return
+        index = undecided[position]
+        if not (self.__attackers[index] | self.__targets[index]) & (chosen | {index}):
+            chosen.add(index)
+            self.__search_admissible(undecided, position + 1, chosen, admissible)
+            chosen.remove(index)
+        self.__search_admissible(undecided, position + 1, chosen, admissible)
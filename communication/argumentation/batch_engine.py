@@ -0,0 +1,807 @@
+"""Batch negociation engine"""
+import time
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from communication import config
+from communication.argumentation.argument_agent import list_supporting_premises
+from communication.argumentation.argument_model import ArgumentModel, get_pair_seed
+from communication.argumentation.concession import ConcessionStrategy
+from communication.argumentation.states import NegotationState
+from communication.message.message_performative import MessagePerformative
+from communication.preferences.criterion_name import CriterionName
+from communication.preferences.item import Item
+from communication.preferences.preferences import Preferences
+from communication.preferences.value import Value
+
+NO_MESSAGE = 0
+PROPOSE = MessagePerformative.PROPOSE.value
+ACCEPT = MessagePerformative.ACCEPT.value
+COMMIT = MessagePerformative.COMMIT.value
+ASK_WHY = MessagePerformative.ASK_WHY.value
+ARGUE = MessagePerformative.ARGUE.value
+NOT_AGREE = MessagePerformative.NOT_AGREE.value
+
+ARGUING = NegotationState.ARGUING.value
+WAITING_ANSWER_ACCEPT = NegotationState.WAITING_ANSWER_ACCEPT.value
+WAITING_FOR_COMMIT = NegotationState.WAITING_FOR_COMMIT.value
+FINISHED = NegotationState.FINISHED.value
+
+Pair = Tuple[int, int]
+
+
+class BatchOutcome(Enum):
+    """BatchOutcome enum class.
+    Enumeration containing the possible outcomes of a negociation of the batch.
+    """
+
+    RUNNING = 0
+    # An agreement was reached within the maximum number of steps
+    AGREED = 1
+    # The negociation stalled or cannot end within the maximum number of steps
+    NO_AGREEMENT = 2
+    # An agreement was reached but the number of steps it takes depends on
+    # the activation order of the agents
+    UNDETERMINED = 3
+    # ArgumentAgent raises an error in this negociation, unless the maximum
+    # number of steps is reached before
+    UNSUPPORTED = 4
+
+
+def first_true(mask: np.ndarray) -> np.ndarray:
+    """Returns the index of the first True of each row, -1 if there is none"""
+    if mask.shape[1] == 0:
+        return np.full(mask.shape[0], -1)
+    return np.where(mask.any(axis=1), mask.argmax(axis=1), -1)
+
+
+class BatchNegociationEngine:  # pylint: disable=too-many-instance-attributes
+    """BatchNegociationEngine class.
+    This class simulates many two-agent negociations in lockstep: the state of
+    every negociation is kept in arrays and, at each iteration, the message in
+    flight of every negociation is processed with the rules of ArgumentAgent
+    applied as masks over the batch.
+
+    Only one message is in flight in a two-agent negociation, so its messages
+    do not depend on the activation order of the agents, only its number of
+    steps does: it is not computed, the steps of the results being None (as
+    for the pairs resolved by AgreementPredictor), and the negociations whose
+    agreement may come after the maximum number of steps are UNDETERMINED.
+
+    attr:
+        agent_ids: the ids of the agents of the population
+        items: the items of the negociation
+        criteria: the criteria of the negociation
+        concession_strategy: the concession strategy of the agents
+        values: the agents x items x criteria matrix of the values
+        criteria_order: the criteria of each agent, by order of importance
+        items_order: the items of each agent, by order of preference
+        items_rank: the rank of each item in the preferences of each agent
+    """
+
+    def __init__(
+        self,
+        agent_ids: List[int],
+        preferences_list: List[Preferences],
+        items: List[Item],
+        criteria: List[CriterionName],
+        concession_strategy: ConcessionStrategy,
+    ):  # pylint: disable=too-many-arguments,too-many-locals
+        """Creates a new engine from the preferences of the agents."""
+        self.agent_ids = list(agent_ids)
+        self.items = items
+        self.criteria = criteria
+        self.concession_strategy = concession_strategy
+        self.__preferences = preferences_list
+        self.__indexes = {agent_id: i for i, agent_id in enumerate(self.agent_ids)}
+
+        num_agents, num_items, num_criteria = (
+            len(preferences_list),
+            len(items),
+            len(criteria),
+        )
+        criterion_ids = {criterion: i for i, criterion in enumerate(criteria)}
+        self.values = np.zeros((num_agents, num_items, num_criteria), dtype=np.int64)
+        self.criteria_order = np.zeros((num_agents, num_criteria), dtype=np.int64)
+        for agent, preferences in enumerate(preferences_list):
+            if sorted(preferences.get_criterion_name_list(), key=str) != sorted(
+                criteria, key=str
+            ):
+                raise ValueError(
+                    f"The preferences of agent {self.agent_ids[agent]} must rank "
+                    "all the criteria of the negociation"
+                )
+            for rank, criterion in enumerate(preferences.get_criterion_name_list()):
+                self.criteria_order[agent, rank] = criterion_ids[criterion]
+                for item_index, item in enumerate(items):
+                    self.values[
+                        agent, item_index, criterion_ids[criterion]
+                    ] = preferences.get_value(item, criterion).value
+
+        # Same ranking as ArgumentAgent.items (stable sort on the scores)
+        ordered_values = np.take_along_axis(
+            self.values, self.criteria_order[:, np.newaxis, :], axis=2
+        )
+        scores = ordered_values @ (100 / 2 ** np.arange(num_criteria))
+        self.items_order = np.argsort(-scores, axis=1, kind="stable")
+        self.items_rank = np.argsort(self.items_order, axis=1)
+
+        # Premises supporting each item (see list_supporting_premises)
+        support_values = np.where(
+            ordered_values >= Value.GOOD.value, ordered_values, -1
+        )
+        support_ranks = np.argsort(-support_values, axis=2, kind="stable")
+        self.__support = np.where(
+            np.take_along_axis(support_values, support_ranks, axis=2) >= 0,
+            np.take_along_axis(
+                np.broadcast_to(
+                    self.criteria_order[:, np.newaxis, :], support_ranks.shape
+                ),
+                support_ranks,
+                axis=2,
+            ),
+            -1,
+        )
+        # Threshold of other_criterion_is_better
+        self.__better_threshold = np.minimum(
+            Value.AVERAGE.value, self.values.min(axis=1)
+        )
+        self.__sorted_items = [
+            [items[index] for index in order] for order in self.items_order
+        ]
+
+    @classmethod
+    def from_model(
+        cls, argument_model: ArgumentModel, agent_ids: List[int]
+    ) -> "BatchNegociationEngine":
+        """Creates an engine for some agents of a model."""
+        return cls(
+            agent_ids,
+            [argument_model.load_agent_preferences(agent_id) for agent_id in agent_ids],
+            argument_model.items,
+            argument_model.criteria,
+            argument_model.concession_strategy,
+        )
+
+    def run(
+        self, pairs: List[Pair], max_num_steps: int = config.MAX_NUM_STEPS
+    ) -> Tuple[List[Optional[Dict[str, Any]]], List[BatchOutcome]]:
+        """Run the negociations of a list of pairs in lockstep
+        :return: the result of each pair (None if no agreement was found), whose
+        steps are None, and its outcome"""
+        batch = _Batch(self, pairs)
+        batch.start()
+        while batch.step(max_num_steps):
+            pass
+
+        results: List[Optional[Dict[str, Any]]] = []
+        for index, pair in enumerate(pairs):
+            outcome = BatchOutcome(batch.outcomes[index])
+            if outcome not in [BatchOutcome.AGREED, BatchOutcome.UNDETERMINED]:
+                results.append(None)
+                continue
+            # The last agent with is_leading wins, see ArgumentModel.step
+            winner = 1 if batch.is_leading[index, 1] else 0
+            chosen_item = self.items[batch.current_items[index, 0]]
+            results.append(
+                {
+                    "winning_agent": pair[winner],
+                    "losing_agent": pair[1 - winner],
+                    "chosen_item": chosen_item,
+                    "arguments": list_supporting_premises(
+                        self.__preferences[self.__indexes[pair[winner]]],
+                        chosen_item,
+                    ),
+                    "steps": None,
+                    "messages": int(batch.num_messages[index]),
+                    "concessions": int(batch.num_concessions[index].sum()),
+                    "seed": None,
+                }
+            )
+        return results, [BatchOutcome(outcome) for outcome in batch.outcomes]
+
+    def index(self, agent_id: int) -> int:
+        """Returns the index of an agent in the population"""
+        return self.__indexes[agent_id]
+
+    @property
+    def support(self) -> np.ndarray:
+        """The criteria supporting each item for each agent, by order of
+        strength (-1 when there is no more)"""
+        return np.asarray(self.__support)
+
+    @property
+    def better_threshold(self) -> np.ndarray:
+        """The value above which a criterion is better for each agent"""
+        return np.asarray(self.__better_threshold)
+
+    def sorted_items(self, agent: int) -> List[Item]:
+        """Returns the items of an agent by order of preference"""
+        return self.__sorted_items[agent]
+
+
+class _Batch:  # pylint: disable=too-many-instance-attributes
+    """State of a batch of negociations, the second axis of the per agent
+    arrays being the position of the agent in its pair."""
+
+    def __init__(self, engine: BatchNegociationEngine, pairs: List[Pair]):
+        self.engine = engine
+        num_pairs, num_items = len(pairs), len(engine.items)
+        num_criteria = len(engine.criteria)
+        self.agents = np.array(
+            [
+                [engine.index(agent_1), engine.index(agent_2)]
+                for agent_1, agent_2 in pairs
+            ],
+            dtype=np.int64,
+        ).reshape(num_pairs, 2)
+        self.initiators = np.array(
+            [0 if agent_1 < agent_2 else 1 for agent_1, agent_2 in pairs],
+            dtype=np.int64,
+        )
+        self.outcomes = np.full(num_pairs, BatchOutcome.RUNNING.value)
+        self.num_messages = np.zeros(num_pairs, dtype=np.int64)
+
+        # Negociation state of each agent
+        self.states = np.full((num_pairs, 2), NegotationState.REST.value)
+        self.current_items = np.full((num_pairs, 2), -1)
+        self.percentages = np.full(
+            (num_pairs, 2), float(engine.concession_strategy.initial_percentage)
+        )
+        self.proposed_items = np.zeros((num_pairs, 2, num_items), dtype=bool)
+        self.opponent_proposals = np.zeros((num_pairs, 2, num_items), dtype=bool)
+        self.is_leading = np.zeros((num_pairs, 2), dtype=bool)
+        self.num_concessions = np.zeros((num_pairs, 2), dtype=np.int64)
+        # arguments_used[pair, agent, item, criterion, compared criterion]: an
+        # argument was used, the last index of the compared criterion meaning
+        # no comparison (the value of the premise is the one of the agent)
+        self.arguments_used = np.zeros(
+            (num_pairs, 2, num_items, num_criteria, num_criteria + 1), dtype=bool
+        )
+
+        # Message in flight of each negociation
+        self.performatives = np.full(num_pairs, NO_MESSAGE)
+        self.recipients = np.zeros(num_pairs, dtype=np.int64)
+        self.message_items = np.full(num_pairs, -1)
+        self.message_criteria = np.full(num_pairs, -1)
+        self.message_values = np.full(num_pairs, -1)
+        self.message_decisions = np.zeros(num_pairs, dtype=bool)
+
+    def start(self) -> None:
+        """The agent with the smallest id proposes its best item"""
+        rows = np.arange(len(self.outcomes))
+        self.current_items[rows, self.initiators] = self.best_item_to_propose(
+            rows, self.initiators
+        )
+        self.propose_new_item(rows, self.initiators)
+
+    def step(self, max_num_steps: int) -> bool:
+        """Deliver the message in flight of every running negociation
+        :return: whether some negociations are still running"""
+        running = self.outcomes == BatchOutcome.RUNNING.value
+        # At most two messages are processed at each step of the model
+        too_long = running & (self.num_messages >= 2 * max_num_steps)
+        self.outcomes[too_long] = BatchOutcome.NO_AGREEMENT.value
+        running &= ~too_long
+
+        incoming = (
+            self.performatives.copy(),
+            self.recipients.copy(),
+            self.message_items.copy(),
+            self.message_criteria.copy(),
+            self.message_values.copy(),
+            self.message_decisions.copy(),
+        )
+        self.performatives[running] = NO_MESSAGE
+        self.num_messages[running] += 1
+        performatives, recipients, items, criteria, values, decisions = incoming
+        for performative, callback in [
+            (PROPOSE, self.propose_callback),
+            (ACCEPT, self.accept_callback),
+            (COMMIT, self.commit_callback),
+            (ASK_WHY, self.ask_why_callback),
+            (NOT_AGREE, self.not_agree_callback),
+        ]:
+            rows = np.flatnonzero(running & (performatives == performative))
+            callback(rows, recipients[rows], items[rows])
+        rows = np.flatnonzero(running & (performatives == ARGUE))
+        self.argue_callback(
+            rows,
+            recipients[rows],
+            items[rows],
+            criteria[rows],
+            values[rows],
+            decisions[rows],
+        )
+
+        running &= self.outcomes == BatchOutcome.RUNNING.value
+        finished = running & (self.states == FINISHED).all(axis=1)
+        # The model only returns a result when an agent is leading
+        agreed = finished & self.is_leading.any(axis=1)
+        # The last message is processed at the latest at step num_messages + 1
+        self.outcomes[agreed] = np.where(
+            self.num_messages[agreed] + 1 <= max_num_steps,
+            BatchOutcome.AGREED.value,
+            BatchOutcome.UNDETERMINED.value,
+        )
+        stalled = running & ~agreed & (self.performatives == NO_MESSAGE)
+        self.outcomes[stalled] = BatchOutcome.NO_AGREEMENT.value
+        return bool((self.outcomes == BatchOutcome.RUNNING.value).any())
+
+    def unsupported(self, rows: np.ndarray) -> None:
+        """ArgumentAgent raises an error in these negociations"""
+        self.outcomes[rows] = BatchOutcome.UNSUPPORTED.value
+        self.performatives[rows] = NO_MESSAGE
+
+    def send(  # pylint: disable=too-many-arguments
+        self,
+        rows: np.ndarray,
+        senders: np.ndarray,
+        performative: int,
+        items: Optional[np.ndarray] = None,
+        criteria: Optional[np.ndarray] = None,
+        values: Optional[np.ndarray] = None,
+        decisions: Optional[np.ndarray] = None,
+    ) -> None:
+        """Send a message to the other agent of each negociation"""
+        self.performatives[rows] = performative
+        self.recipients[rows] = 1 - senders
+        self.message_items[rows] = -1 if items is None else items
+        self.message_criteria[rows] = -1 if criteria is None else criteria
+        self.message_values[rows] = -1 if values is None else values
+        self.message_decisions[rows] = False if decisions is None else decisions
+
+    def is_among_top_percent(
+        self, rows: np.ndarray, sides: np.ndarray, items: np.ndarray, percentages
+    ) -> np.ndarray:
+        """See Preferences.is_item_among_top_percent"""
+        num_items = len(self.engine.items)
+        num_top = np.maximum(1, (num_items * (percentages / 100)).astype(np.int64))
+        return np.asarray(
+            self.engine.items_rank[self.agents[rows, sides], items] < num_top
+        )
+
+    def best_item_to_propose(self, rows: np.ndarray, sides: np.ndarray) -> np.ndarray:
+        """See ArgumentAgent.__get_best_item_to_propose"""
+        num_items = len(self.engine.items)
+        num_top = np.maximum(
+            1, (num_items * (self.percentages[rows, sides] / 100)).astype(np.int64)
+        )
+        order = self.engine.items_order[self.agents[rows, sides]]
+        available = ~np.take_along_axis(
+            self.proposed_items[rows, sides], order, axis=1
+        ) & (np.arange(num_items) < num_top[:, np.newaxis])
+        ranks = first_true(available)
+        items = np.where(
+            ranks >= 0, order[np.arange(len(rows)), np.maximum(ranks, 0)], -1
+        )
+        found = items >= 0
+        self.proposed_items[rows[found], sides[found], items[found]] = True
+        return items
+
+    def loose_constraints(self, rows: np.ndarray, sides: np.ndarray) -> None:
+        """See ArgumentAgent.__loose_constraints, the concession strategy being
+        called for each conceding agent"""
+        strategy = self.engine.concession_strategy
+        for row, side in zip(rows.tolist(), sides.tolist()):
+            self.percentages[row, side] = strategy.next_percentage(
+                self.percentages[row, side].item(),
+                int(self.num_concessions[row, side]),
+                [
+                    self.engine.items[item]
+                    for item in np.flatnonzero(self.opponent_proposals[row, side])
+                ],
+                self.engine.sorted_items(self.agents[row, side]),
+            )
+        self.proposed_items[rows, sides] = False
+        self.states[rows, sides] = ARGUING
+        self.num_concessions[rows, sides] += 1
+        self.current_items[rows, sides] = -1
+        self.arguments_used[rows, sides] = False
+
+    def send_not_agree(self, rows: np.ndarray, sides: np.ndarray) -> None:
+        """See ArgumentAgent.__send_not_agree"""
+        self.loose_constraints(rows, sides)
+        self.send(rows, sides, NOT_AGREE)
+
+    def propose_new_item(self, rows: np.ndarray, sides: np.ndarray) -> None:
+        """See ArgumentAgent.__propose_new_item"""
+        self.is_leading[rows, sides] = True
+        no_item = self.current_items[rows, sides] < 0
+        self.send_not_agree(rows[no_item], sides[no_item])
+        self.send(
+            rows[~no_item],
+            sides[~no_item],
+            PROPOSE,
+            self.current_items[rows[~no_item], sides[~no_item]],
+        )
+        self.states[rows, sides] = ARGUING
+
+    def accept(self, rows: np.ndarray, sides: np.ndarray) -> None:
+        """See ArgumentAgent.__send_accept_message"""
+        self.send(rows, sides, ACCEPT, self.current_items[rows, sides])
+        self.states[rows, sides] = WAITING_ANSWER_ACCEPT
+
+    def propose_callback(
+        self, rows: np.ndarray, sides: np.ndarray, items: np.ndarray
+    ) -> None:
+        """The other agent proposes an item"""
+        self.is_leading[rows, sides] = False
+        self.opponent_proposals[rows, sides, items] = True
+        finished = self.states[rows, sides] == FINISHED
+        self.unsupported(rows[finished])
+        rows, sides, items = rows[~finished], sides[~finished], items[~finished]
+
+        self.current_items[rows, sides] = items
+        top = self.is_among_top_percent(
+            rows, sides, items, self.percentages[rows, sides]
+        )
+        self.accept(rows[top], sides[top])
+        self.send(rows[~top], sides[~top], ASK_WHY, items[~top])
+        self.states[rows[~top], sides[~top]] = ARGUING
+
+    def accept_callback(
+        self, rows: np.ndarray, sides: np.ndarray, items: np.ndarray
+    ) -> None:
+        """The other agent accepts an item"""
+        valid = (self.states[rows, sides] == ARGUING) & (
+            self.current_items[rows, sides] == items
+        )
+        self.unsupported(rows[~valid])
+        self.send(rows[valid], sides[valid], COMMIT, items[valid])
+        self.states[rows[valid], sides[valid]] = WAITING_FOR_COMMIT
+
+    def commit_callback(
+        self, rows: np.ndarray, sides: np.ndarray, items: np.ndarray
+    ) -> None:
+        """The other agent commits an item"""
+        valid = self.current_items[rows, sides] == items
+        self.unsupported(rows[~valid])
+        states = self.states[rows, sides]
+        answer = valid & (states == WAITING_ANSWER_ACCEPT)
+        self.send(rows[answer], sides[answer], COMMIT, items[answer])
+        finished = answer | (valid & (states == WAITING_FOR_COMMIT))
+        self.states[rows[finished], sides[finished]] = FINISHED
+
+    def ask_why_callback(
+        self, rows: np.ndarray, sides: np.ndarray, items: np.ndarray
+    ) -> None:
+        """The other agent asks why an item was proposed"""
+        valid = (self.states[rows, sides] == ARGUING) & (
+            self.current_items[rows, sides] == items
+        )
+        agents = self.agents[rows, sides]
+        candidates = self.engine.support[agents, items]
+        no_comparison = len(self.engine.criteria)
+        used = self.arguments_used[
+            rows[:, np.newaxis],
+            sides[:, np.newaxis],
+            items[:, np.newaxis],
+            np.maximum(candidates, 0),
+            no_comparison,
+        ]
+        ranks = first_true((candidates >= 0) & ~used)
+        valid &= ranks >= 0
+        self.unsupported(rows[~valid])
+
+        rows, sides, items = rows[valid], sides[valid], items[valid]
+        criteria = candidates[valid, ranks[valid]]
+        self.arguments_used[rows, sides, items, criteria, no_comparison] = True
+        self.send(
+            rows,
+            sides,
+            ARGUE,
+            items,
+            criteria,
+            self.engine.values[agents[valid], items, criteria],
+            np.ones(len(rows), dtype=bool),
+        )
+
+    def argue_callback(  # pylint: disable=too-many-arguments
+        self,
+        rows: np.ndarray,
+        sides: np.ndarray,
+        items: np.ndarray,
+        criteria: np.ndarray,
+        values: np.ndarray,
+        decisions: np.ndarray,
+    ) -> None:
+        """The other agent argues about an item (an argument about another item
+        than the current one is ignored)"""
+        no_item = self.current_items[rows, sides] < 0
+        self.unsupported(rows[no_item])
+        valid = (
+            ~no_item
+            & (self.states[rows, sides] == ARGUING)
+            & (self.current_items[rows, sides] == items)
+        )
+        self.send_attack(
+            rows[valid],
+            sides[valid],
+            items[valid],
+            criteria[valid],
+            values[valid],
+            decisions[valid],
+        )
+
+    def not_agree_callback(
+        self, rows: np.ndarray, sides: np.ndarray, _items: np.ndarray
+    ) -> None:
+        """The other agent looses its constraints"""
+        self.loose_constraints(rows, sides)
+        self.current_items[rows, sides] = self.best_item_to_propose(rows, sides)
+        self.propose_new_item(rows, sides)
+
+    def get_attack_argument(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        rows: np.ndarray,
+        sides: np.ndarray,
+        items: np.ndarray,
+        criteria: np.ndarray,
+        values: np.ndarray,
+        decisions: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """See ArgumentAgent.__get_attack_argument
+        :return: the item, criterion, compared criterion and decision of the
+        counter argument of each negociation (item -1 if there is none)"""
+        engine = self.engine
+        no_comparison = len(engine.criteria)
+        agents = self.agents[rows, sides]
+        order = engine.criteria_order[agents]
+        positions = np.arange(len(rows))
+        agent_values = engine.values[agents]
+        item_values = agent_values[positions, items]
+        row_index, side_index = rows[:, np.newaxis], sides[:, np.newaxis]
+
+        out_items = np.full(len(rows), -1)
+        out_criteria = np.full(len(rows), -1)
+        out_comparisons = np.full(len(rows), no_comparison)
+        out_decisions = ~decisions
+
+        # Another criterion is bad (other_more_important_criterion_is_bad)
+        candidates = (
+            decisions[:, np.newaxis]
+            & (order != criteria[:, np.newaxis])
+            & (np.take_along_axis(item_values, order, axis=1) < Value.AVERAGE.value)
+            & ~self.arguments_used[
+                row_index,
+                side_index,
+                items[:, np.newaxis],
+                order,
+                criteria[:, np.newaxis],
+            ]
+        )
+        ranks = first_true(candidates)
+        found = ranks >= 0
+        out_items[found] = items[found]
+        out_criteria[found] = order[found, ranks[found]]
+        out_comparisons[found] = criteria[found]
+
+        # For me, the evaluated criterion is bad (criterion_is_bad)
+        premise_values = item_values[positions, criteria]
+        bad = (
+            decisions
+            & ~found
+            & (values < np.minimum(premise_values, Value.AVERAGE.value))
+            & ~self.arguments_used[rows, sides, items, criteria, no_comparison]
+        )
+        out_items[bad] = items[bad]
+        out_criteria[bad] = criteria[bad]
+        found |= bad
+
+        # I prefer another item which is better for this criterion
+        items_order = engine.items_order[agents]
+        better = first_true(
+            (items_order != items[:, np.newaxis])
+            & (
+                np.take_along_axis(
+                    agent_values[positions, :, criteria], items_order, axis=1
+                )
+                > values[:, np.newaxis]
+            )
+        )
+        better_items = np.where(
+            better >= 0, items_order[positions, np.maximum(better, 0)], -1
+        )
+        other_item = (
+            decisions
+            & ~found
+            & (better_items >= 0)
+            & ~self.arguments_used[
+                rows, sides, np.maximum(better_items, 0), criteria, no_comparison
+            ]
+        )
+        out_items[other_item] = better_items[other_item]
+        out_criteria[other_item] = criteria[other_item]
+
+        # Another criterion is better (other_criterion_is_better)
+        better = first_true(
+            np.take_along_axis(item_values, order, axis=1)
+            > np.take_along_axis(engine.better_threshold[agents], order, axis=1)
+        )
+        better_criteria = order[positions, np.maximum(better, 0)]
+        better_criterion = (
+            ~decisions
+            & (better >= 0)
+            & ~self.arguments_used[rows, sides, items, better_criteria, criteria]
+        )
+        out_items[better_criterion] = items[better_criterion]
+        out_criteria[better_criterion] = better_criteria[better_criterion]
+        out_comparisons[better_criterion] = criteria[better_criterion]
+        return out_items, out_criteria, out_comparisons, out_decisions
+
+    def send_attack(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        rows: np.ndarray,
+        sides: np.ndarray,
+        items: np.ndarray,
+        criteria: np.ndarray,
+        values: np.ndarray,
+        decisions: np.ndarray,
+    ) -> None:
+        """See ArgumentAgent.__send_attack_message"""
+        (
+            attack_items,
+            attack_criteria,
+            attack_comparisons,
+            attack_decisions,
+        ) = self.get_attack_argument(rows, sides, items, criteria, values, decisions)
+        current_items = self.current_items[rows, sides]
+        found = attack_items >= 0
+
+        # No counter argument: accept the item or propose another one
+        acceptance_percentages = np.array(
+            [
+                self.engine.concession_strategy.acceptance_percentage(percentage)
+                for percentage in self.percentages[rows, sides].tolist()
+            ],
+            dtype=float,
+        )
+        accepted = (
+            ~found
+            & ~self.is_leading[rows, sides]
+            & self.is_among_top_percent(
+                rows, sides, current_items, acceptance_percentages
+            )
+        )
+        self.accept(rows[accepted], sides[accepted])
+        others = ~found & ~accepted
+        other_rows, other_sides = rows[others], sides[others]
+        new_items = self.best_item_to_propose(other_rows, other_sides)
+        self.current_items[other_rows, other_sides] = new_items
+        self.propose_new_item(other_rows[new_items >= 0], other_sides[new_items >= 0])
+        self.send_not_agree(other_rows[new_items < 0], other_sides[new_items < 0])
+
+        # Counter argument on the current item: argue, otherwise propose its item
+        argued = found & (attack_items == current_items)
+        rows_, sides_ = rows[argued], sides[argued]
+        self.arguments_used[
+            rows_,
+            sides_,
+            attack_items[argued],
+            attack_criteria[argued],
+            attack_comparisons[argued],
+        ] = True
+        self.send(
+            rows_,
+            sides_,
+            ARGUE,
+            attack_items[argued],
+            attack_criteria[argued],
+            self.engine.values[
+                self.agents[rows_, sides_],
+                attack_items[argued],
+                attack_criteria[argued],
+            ],
+            attack_decisions[argued],
+        )
+        proposed = found & ~argued
+        self.current_items[rows[proposed], sides[proposed]] = attack_items[proposed]
+        self.propose_new_item(rows[proposed], sides[proposed])
+
+
+def run_pairs_batched(
+    argument_model: ArgumentModel,
+    pairs: List[Pair],
+    max_num_steps: Optional[int] = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """Run the negociations of a list of pairs with the batch engine, the
+    negociations it cannot decide being run by the model (all of them if the
+    debates are settled early, which the engine does not implement)
+    :param max_num_steps: by default, the one of the model
+    :return: the result of each pair, None if no agreement was found, the
+    steps of the results of the engine being None"""
+    if max_num_steps is None:
+        max_num_steps = argument_model.max_num_steps
+    if argument_model.settle_debates:
+        return [
+            argument_model.run_discussion_between(
+                agent_1,
+                agent_2,
+                max_num_steps,
+                get_pair_seed(argument_model.seed, agent_1, agent_2),
+            )
+            for agent_1, agent_2 in pairs
+        ]
+    start = time.perf_counter()
+    engine = BatchNegociationEngine.from_model(
+        argument_model, sorted({agent_id for pair in pairs for agent_id in pair})
+    )
+    results, outcomes = engine.run(pairs, max_num_steps)
+    undecided = [BatchOutcome.UNDETERMINED, BatchOutcome.UNSUPPORTED]
+    if argument_model.metrics is not None:
+        argument_model.metrics.record_negociations(
+            [
+                result
+                for result, outcome in zip(results, outcomes)
+                if outcome not in undecided
+            ],
+            time.perf_counter() - start,
+        )
+    for index, outcome in enumerate(outcomes):
+        if outcome in undecided:
+            agent_1, agent_2 = pairs[index]
+            results[index] = argument_model.run_discussion_between(
+                agent_1,
+                agent_2,
+                max_num_steps,
+                get_pair_seed(argument_model.seed, agent_1, agent_2),
+            )
+    return results
+
+
+def compare_with_model(
+    argument_model: ArgumentModel,
+    pairs: List[Pair],
+    max_num_steps: Optional[int] = None,
+) -> List[Pair]:
+    """Run the negociations of a list of pairs with the batch engine and the model
+    to check that the engine reproduces the decisions of ArgumentAgent
+    :return: the pairs whose results differ"""
+    if max_num_steps is None:
+        max_num_steps = argument_model.max_num_steps
+    engine = BatchNegociationEngine.from_model(
+        argument_model, sorted({agent_id for pair in pairs for agent_id in pair})
+    )
+    results, outcomes = engine.run(pairs, max_num_steps)
+
+    def summary(result: Optional[Dict[str, Any]]) -> Optional[Tuple[Any, ...]]:
+        if result is None:
+            return None
+        return (
+            result["winning_agent"],
+            result["losing_agent"],
+            result["chosen_item"].name,
+            result["messages"],
+            result["concessions"],
+            [str(premise) for premise in result["arguments"]],
+        )
+
+    mismatches = []
+    for (agent_1, agent_2), result, outcome in zip(pairs, results, outcomes):
+        try:
+            expected = summary(
+                argument_model.run_discussion_between(
+                    agent_1,
+                    agent_2,
+                    max_num_steps,
+                    get_pair_seed(argument_model.seed, agent_1, agent_2),
+                )
+            )
+        except ValueError:
+            expected = (BatchOutcome.UNSUPPORTED,)
+        if expected is None and outcome in [
+            BatchOutcome.UNDETERMINED,
+            BatchOutcome.UNSUPPORTED,
+        ]:
+            # The step limit was reached with the activation order of the model
+            continue
+        if outcome == BatchOutcome.UNSUPPORTED:
+            actual: Optional[Tuple[Any, ...]] = (BatchOutcome.UNSUPPORTED,)
+        else:
+            actual = summary(result)
+        if actual != expected:
+            mismatches.append((agent_1, agent_2))
+    return mismatches
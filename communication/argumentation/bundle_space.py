@@ -0,0 +1,227 @@
+"""Bundle space"""
+import heapq
+import itertools
+from math import comb
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, overload
+
+from communication.preferences.bundle import Bundle
+from communication.preferences.criterion_name import CriterionName
+from communication.preferences.item import Item
+from communication.preferences.preferences import Preferences
+from communication.preferences.value import Value
+
+# A partial bundle of the search: the position of the next item to choose or
+# skip, the positions of the items chosen and their score
+Node = Tuple[int, Tuple[int, ...], float]
+
+
+class BundleSpace(Sequence[Item]):  # pylint: disable=too-many-instance-attributes
+    """BundleSpace class.
+    This class implements the bundles of a given number of items an agent can
+    propose, ranked by decreasing score without being materialized: they are
+    enumerated best-first by a branch-and-bound search over the items, each
+    partial bundle being bounded by the best items which can complete it, and
+    the rank of a bundle is counted from the same bounds, the partial bundles
+    whose completions are all better (or all worse) being counted at once.
+
+    The score of a bundle is the sum of the scores of its items
+    (Item.get_score) and of the interactions of its pairs of items, positive
+    for complementary items and negative for substitutes (additive without
+    interactions). Bundles of equal scores share the rank of the first of them.
+
+    attr:
+        items: the items of the bundles, by decreasing best possible contribution
+        preferences: the preferences scoring the items
+        size: the number of items of each bundle
+    """
+
+    def __init__(
+        self,
+        items: List[Item],
+        preferences: Preferences,
+        size: int,
+        interactions: Optional[Dict[Tuple[Item, Item], float]] = None,
+    ):
+        """Creates the bundles of size items
+        :param interactions: the interaction of some pairs of items, added to
+        the score of the bundles containing both of them"""
+        if not 2 <= size <= len(items):
+            raise ValueError(
+                "The size of the bundles must be between 2 and the number of items"
+            )
+        self.preferences = preferences
+        self.size = size
+        pairs: Dict[Item, Dict[Item, float]] = {item: {} for item in items}
+        for (item_1, item_2), interaction in (interactions or {}).items():
+            if item_1 not in pairs or item_2 not in pairs or item_1 is item_2:
+                raise ValueError(f"Invalid interaction between {item_1} and {item_2}")
+            pairs[item_1][item_2] = interaction
+            pairs[item_2][item_1] = interaction
+        scores: Dict[Item, float] = {
+            item: item.get_score(preferences) for item in items
+        }
+        # Best and worst contributions of an item to the score of a bundle
+        gains = {
+            item: scores[item] + sum(max(0, value) for value in pairs[item].values())
+            for item in items
+        }
+        losses = {
+            item: scores[item] + sum(min(0, value) for value in pairs[item].values())
+            for item in items
+        }
+        self.items = sorted(items, key=lambda item: gains[item], reverse=True)
+        self.__positions = {item: position for position, item in enumerate(self.items)}
+        self.__scores = [scores[item] for item in self.items]
+        self.__gains = [gains[item] for item in self.items]
+        self.__interactions = [
+            {self.__positions[other]: value for other, value in pairs[item].items()}
+            for item in self.items
+        ]
+        # Worst contribution of the items from each position
+        self.__min_losses = [float("inf")] * (len(self.items) + 1)
+        for position in range(len(self.items) - 1, -1, -1):
+            self.__min_losses[position] = min(
+                self.__min_losses[position + 1], losses[self.items[position]]
+            )
+        self.__num_better: Dict[Tuple[float, int], int] = {}
+
+    def __len__(self) -> int:
+        return comb(len(self.items), self.size)
+
+    def __contains__(self, item: object) -> bool:
+        return (
+            isinstance(item, Bundle)
+            and len(item.items) == self.size
+            and all(item_ in self.__positions for item_ in item.items)
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> Item:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Item]:
+        ...
+
+    def __getitem__(self, index):
+        """Returns the bundle of a given rank (enumerating the bundles before
+        it, all of them for a slice)."""
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Bundle index out of range")
+        return next(itertools.islice(iter(self), index, None))
+
+    def __iter__(self) -> Iterator[Item]:
+        """Enumerates the bundles by decreasing score: a partial bundle is only
+        extended once no complete bundle found can be better than its bound."""
+        counter = itertools.count()
+        root: Node = (0, (), 0.0)
+        heap: List[Tuple[float, int, Node]] = [
+            (-self.__upper_bound(root), next(counter), root)
+        ]
+        while heap:
+            node = heapq.heappop(heap)[2]
+            if len(node[1]) == self.size:
+                yield Bundle(self.items[index] for index in node[1])
+                continue
+            for child in self.__children(node):
+                bound = (
+                    child[2]
+                    if len(child[1]) == self.size
+                    else self.__upper_bound(child)
+                )
+                heapq.heappush(heap, (-bound, next(counter), child))
+
+    def index(self, value: Any, start: int = 0, stop: Optional[int] = None) -> int:
+        """Returns the rank of a bundle: the number of better bundles."""
+        if value not in self:
+            raise ValueError(f"{value} is not a bundle of the space")
+        rank = self.__count_better(self.score(value), len(self))
+        if rank < start or (stop is not None and rank >= stop):
+            raise ValueError(f"{value} is not ranked between {start} and {stop}")
+        return rank
+
+    def score(self, bundle: Bundle) -> float:
+        """Returns the score of a bundle of the space."""
+        chosen: Tuple[int, ...] = ()
+        score = 0.0
+        for position in sorted(self.__positions[item] for item in bundle.items):
+            score = self.__add(chosen, score, position)
+            chosen += (position,)
+        return score
+
+    def is_among_top_percent(self, item: Item, percentage: int) -> bool:
+        """Returns whether a bundle is among the top percentage of the bundles
+        (see Preferences.is_item_among_top_percent), without ranking them all:
+        only its better bundles are counted, up to the size of the top."""
+        if not isinstance(item, Bundle) or item not in self:
+            return False
+        num_top = max(1, int(len(self) * (percentage / 100)))
+        return self.__count_better(self.score(item), num_top) < num_top
+
+    def min_value(self, criterion_name: CriterionName) -> Value:
+        """Returns the worst value of a bundle on a criterion (the one of
+        the bundle of the worst items)."""
+        values = sorted(
+            self.preferences.get_value(item, criterion_name).value
+            for item in self.items
+        )
+        return Value(values[self.size - 1])
+
+    def max_value(self, criterion_name: CriterionName) -> Value:
+        """Returns the best value of a bundle on a criterion."""
+        return max(
+            (self.preferences.get_value(item, criterion_name) for item in self.items),
+            key=lambda value: value.value,
+        )
+
+    def __add(self, chosen: Tuple[int, ...], score: float, position: int) -> float:
+        """Returns the score of a partial bundle with one more item."""
+        interactions = self.__interactions[position]
+        score += self.__scores[position]
+        for index in chosen:
+            score += interactions.get(index, 0)
+        return score
+
+    def __children(self, node: Node) -> List[Node]:
+        """Returns the partial bundles choosing and skipping the next item,
+        those which cannot be completed left aside."""
+        position, chosen, score = node
+        children = [
+            (position + 1, chosen + (position,), self.__add(chosen, score, position))
+        ]
+        if len(self.items) - position - 1 >= self.size - len(chosen):
+            children.append((position + 1, chosen, score))
+        return children
+
+    def __upper_bound(self, node: Node) -> float:
+        """Returns a score above those of the bundles completing a partial one,
+        the items being sorted by decreasing best contribution."""
+        position, chosen, score = node
+        return score + sum(self.__gains[position : position + self.size - len(chosen)])
+
+    def __lower_bound(self, node: Node) -> float:
+        """Returns a score below those of the bundles completing a partial one."""
+        position, chosen, score = node
+        return score + (self.size - len(chosen)) * self.__min_losses[position]
+
+    def __count_better(self, score: float, limit: int) -> int:
+        """Counts the bundles with a higher score than a given one, up to a limit."""
+        key = (score, limit)
+        if key not in self.__num_better:
+            count = 0
+            nodes: List[Node] = [(0, (), 0.0)]
+            while nodes and count < limit:
+                node = nodes.pop()
+                needed = self.size - len(node[1])
+                if needed == 0:
+                    count += node[2] > score
+                elif self.__lower_bound(node) > score:
+                    count += comb(len(self.items) - node[0], needed)
+                elif self.__upper_bound(node) > score:
+                    nodes.extend(self.__children(node))
+            self.__num_better[key] = min(count, limit)
+        return self.__num_better[key]
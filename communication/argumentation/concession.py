@@ -0,0 +1,231 @@
+"""Concession strategies"""
+import math
+from abc import ABC, abstractmethod
+from typing import Dict, List, Sequence, Type
+
+from communication import config
+from communication.preferences.item import Item
+
+
+class ConcessionStrategy(ABC):
+    """ConcessionStrategy class.
+    Base class of the schedules used by an agent to loose its constraints,
+    i.e. to increase the percentage of its preferred items it is ready to accept.
+
+    attr:
+        name: the name of the strategy
+        initial_percentage: the percentage used before any concession
+        acceptance_margin: the margin applied to the percentage when accepting
+    """
+
+    name = "base"
+
+    def __init__(
+        self,
+        initial_percentage: int = config.INITIAL_PERCENTAGE,
+        acceptance_margin: float = config.ACCEPTANCE_MARGIN,
+    ):
+        """Creates a new concession strategy."""
+        self.initial_percentage = initial_percentage
+        self.acceptance_margin = acceptance_margin
+
+    def __str__(self) -> str:
+        return self.name
+
+    @abstractmethod
+    def next_percentage(
+        self,
+        percentage: int,
+        num_concessions: int,
+        opponent_proposals: List[Item],
+        items: Sequence[Item],
+    ) -> int:
+        """Returns the percentage to use after a new concession.
+        :param percentage: the current percentage
+        :param num_concessions: the number of concessions already made
+        :param opponent_proposals: the items proposed by the opponent so far
+        :param items: the items (or the bundles) of the agent, sorted by preference
+        """
+
+    def acceptance_percentage(self, percentage: int) -> int:
+        """Returns the percentage under which an argued item is accepted."""
+        return int(percentage * self.acceptance_margin)
+
+
+class LinearConcession(ConcessionStrategy):
+    """LinearConcession class.
+    The percentage grows by a fixed increase at each concession.
+    """
+
+    name = "linear"
+
+    def __init__(
+        self,
+        initial_percentage: int = config.INITIAL_PERCENTAGE,
+        acceptance_margin: float = config.ACCEPTANCE_MARGIN,
+        increase_percentage: int = config.INCREASE_PERCENTAGE,
+    ):
+        super().__init__(initial_percentage, acceptance_margin)
+        self.increase_percentage = increase_percentage
+
+    def next_percentage(
+        self,
+        percentage: int,
+        num_concessions: int,
+        opponent_proposals: List[Item],
+        items: Sequence[Item],
+    ) -> int:
+        return percentage + self.increase_percentage
+
+
+class GeometricConcession(ConcessionStrategy):
+    """GeometricConcession class.
+    The percentage is multiplied by a fixed ratio at each concession.
+    """
+
+    name = "geometric"
+
+    def __init__(
+        self,
+        initial_percentage: int = config.INITIAL_PERCENTAGE,
+        acceptance_margin: float = config.ACCEPTANCE_MARGIN,
+        ratio: float = 2.0,
+    ):
+        super().__init__(initial_percentage, acceptance_margin)
+        if ratio <= 1:
+            raise ValueError("The ratio of a geometric concession must be above 1")
+        self.ratio = ratio
+
+    def next_percentage(
+        self,
+        percentage: int,
+        num_concessions: int,
+        opponent_proposals: List[Item],
+        items: Sequence[Item],
+    ) -> int:
+        return max(percentage + 1, math.ceil(percentage * self.ratio))
+
+
+class TimeDependentConcession(ConcessionStrategy):
+    """TimeDependentConcession class.
+    The percentage follows p(t) = p0 + (100 - p0) * (t / deadline) ^ (1 / e)
+    where t is the number of concessions made. An exponent e < 1 gives a
+    Boulware agent (concedes late), e > 1 a Conceder agent (concedes early).
+    """
+
+    name = "time_dependent"
+
+    def __init__(
+        self,
+        initial_percentage: int = config.INITIAL_PERCENTAGE,
+        acceptance_margin: float = config.ACCEPTANCE_MARGIN,
+        exponent: float = 1.0,
+        deadline: int = 5,
+    ):
+        super().__init__(initial_percentage, acceptance_margin)
+        if exponent <= 0 or deadline <= 0:
+            raise ValueError("The exponent and the deadline must be positive")
+        self.exponent = exponent
+        self.deadline = deadline
+
+    def next_percentage(
+        self,
+        percentage: int,
+        num_concessions: int,
+        opponent_proposals: List[Item],
+        items: Sequence[Item],
+    ) -> int:
+        time = min(1.0, (num_concessions + 1) / self.deadline)
+        target = self.initial_percentage + (100 - self.initial_percentage) * time ** (
+            1 / self.exponent
+        )
+        return int(max(percentage + 1, math.ceil(target)))
+
+
+class BoulwareConcession(TimeDependentConcession):
+    """BoulwareConcession class.
+    Time dependent concession which keeps its demands high until the deadline.
+    """
+
+    name = "boulware"
+
+    def __init__(
+        self,
+        initial_percentage: int = config.INITIAL_PERCENTAGE,
+        acceptance_margin: float = config.ACCEPTANCE_MARGIN,
+        exponent: float = 0.2,
+        deadline: int = 5,
+    ):
+        super().__init__(initial_percentage, acceptance_margin, exponent, deadline)
+
+
+class ConcederConcession(TimeDependentConcession):
+    """ConcederConcession class.
+    Time dependent concession which quickly lowers its demands.
+    """
+
+    name = "conceder"
+
+    def __init__(
+        self,
+        initial_percentage: int = config.INITIAL_PERCENTAGE,
+        acceptance_margin: float = config.ACCEPTANCE_MARGIN,
+        exponent: float = 5.0,
+        deadline: int = 5,
+    ):
+        super().__init__(initial_percentage, acceptance_margin, exponent, deadline)
+
+
+class AdaptiveConcession(ConcessionStrategy):
+    """AdaptiveConcession class.
+    The agent concedes just enough to reach the best item (for itself) among
+    the items proposed by the opponent, within a minimum and a maximum step.
+    """
+
+    name = "adaptive"
+
+    def __init__(
+        self,
+        initial_percentage: int = config.INITIAL_PERCENTAGE,
+        acceptance_margin: float = config.ACCEPTANCE_MARGIN,
+        min_step: int = 10,
+        max_step: int = 40,
+    ):
+        super().__init__(initial_percentage, acceptance_margin)
+        if not 0 < min_step <= max_step:
+            raise ValueError("The steps must verify 0 < min_step <= max_step")
+        self.min_step = min_step
+        self.max_step = max_step
+
+    def next_percentage(
+        self,
+        percentage: int,
+        num_concessions: int,
+        opponent_proposals: List[Item],
+        items: Sequence[Item],
+    ) -> int:
+        ranks = [items.index(item) for item in opponent_proposals if item in items]
+        if len(ranks) == 0:
+            return percentage + self.min_step
+        # Smallest percentage such that the opponent's best proposal is in the top
+        target = math.ceil((min(ranks) + 1) * 100 / len(items))
+        return max(percentage + self.min_step, min(target, percentage + self.max_step))
+
+
+CONCESSION_STRATEGIES: Dict[str, Type[ConcessionStrategy]] = {
+    LinearConcession.name: LinearConcession,
+    GeometricConcession.name: GeometricConcession,
+    BoulwareConcession.name: BoulwareConcession,
+    ConcederConcession.name: ConcederConcession,
+    AdaptiveConcession.name: AdaptiveConcession,
+}
+
+
+def get_concession_strategy(name: str) -> ConcessionStrategy:
+    """Returns a concession strategy with its default parameters from its name"""
+    if name not in CONCESSION_STRATEGIES:
+        raise ValueError(
+            f"Unknown concession strategy {name}, "
+            f"expected one of {', '.join(CONCESSION_STRATEGIES)}"
+        )
+    return CONCESSION_STRATEGIES[name]()
@@ -0,0 +1,61 @@
+"""Conversation"""
+from typing import Dict, List, Optional
+
+from communication.argumentation.argumentation_framework import (
+    ArgumentationFramework,
+)
+from communication.argumentation.states import NegotationState
+from communication.arguments.argument import Argument
+from communication.preferences.item import Item
+
+
+class Conversation:  # pylint: disable=too-many-instance-attributes
+    """Conversation class.
+    This class implements the negotiation state of an agent in one of its
+    conversations, so that an agent can take part in several dialogues at once.
+
+    attr:
+        conversation_id: the id of the conversation (None for the default one)
+        peers: the names of the other agents of the conversation (None for all
+        the other agents of the model)
+        initiator: the name of the agent starting the conversation (None for the
+        agent with the smallest id of the model)
+        negotation_state: the negotiation state of the agent
+        current_item: the item currently discussed
+        proposed_items: the items already proposed by the agent
+        convinced_agents: whether each peer was convinced by the agent
+        arguments_used: the arguments already used by the agent
+        is_leading: whether the agent made the current proposal
+        percentage: the percentage of its preferred items the agent accepts
+        num_concessions: the number of concessions made by the agent
+        opponent_proposals: the items proposed by the peers
+        num_messages: the number of messages received by the agent
+        framework: the arguments exchanged in the conversation and their
+        attacks, kept across the concessions
+        last_argument: the index in the framework of the last argument sent by
+        the agent about the current item, None if it did not argue yet
+    """
+
+    def __init__(
+        self,
+        conversation_id: Optional[int],
+        percentage: int,
+        peers: Optional[List[str]] = None,
+        initiator: Optional[str] = None,
+    ):
+        """Creates a new conversation."""
+        self.conversation_id = conversation_id
+        self.peers = peers
+        self.initiator = initiator
+        self.negotation_state = NegotationState.REST
+        self.current_item: Optional[Item] = None
+        self.proposed_items: List[Item] = []
+        self.convinced_agents: Dict[str, bool] = {}
+        self.arguments_used: List[Argument] = []
+        self.is_leading: bool = False
+        self.percentage = percentage
+        self.num_concessions = 0
+        self.opponent_proposals: List[Item] = []
+        self.num_messages = 0
+        self.framework = ArgumentationFramework()
+        self.last_argument: Optional[int] = None
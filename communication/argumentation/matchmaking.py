@@ -0,0 +1,192 @@
+"""Matchmaking"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from communication.argumentation.agreement_predictor import build_score_matrix
+from communication.argumentation.argument_model import ArgumentModel
+from communication.preferences.criterion_name import CriterionName
+from communication.preferences.preferences import Preferences
+
+# Below this number of agents, the index is searched exhaustively
+EXACT_SEARCH_MAX_AGENTS = 2048
+
+
+def build_criterion_order_matrix(
+    preferences_list: List[Preferences], criteria: List[CriterionName]
+) -> np.ndarray:
+    """Compute the weight of each criterion for a population, the weights of
+    the criteria being those of Item.get_score (halved at each rank)
+    :return: an agents x criteria matrix"""
+    weights = np.zeros((len(preferences_list), len(criteria)))
+    indexes = {criterion.id: i for i, criterion in enumerate(criteria)}
+    for agent_index, preferences in enumerate(preferences_list):
+        for rank, criterion in enumerate(preferences.get_criterion_name_list()):
+            weights[agent_index, indexes[criterion.id]] = 100 / 2**rank
+    return weights
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Center and normalize vectors, so that the dot product of two vectors
+    is the correlation of their coordinates (the agents preferring the same
+    items have similar vectors whatever the scale of their scores)"""
+    centered = vectors - vectors.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(centered, axis=1, keepdims=True)
+    return np.asarray(centered / np.where(norms > 0, norms, 1))
+
+
+class MatchmakingIndex:  # pylint: disable=too-many-instance-attributes
+    """MatchmakingIndex class.
+    Nearest-neighbour index over the embeddings of the agents (their item score
+    vectors or their criterion order vectors, see from_model), which returns
+    the agents most similar to a profile: those most likely to agree quickly
+    with it. Agents can be inserted one at a time.
+    Small populations are searched exhaustively. Larger ones are searched
+    with random-projection LSH: each table hashes a vector to the signs of its
+    projections on random hyperplanes, and the candidates of a query are the
+    agents of its buckets (and of the buckets one bit away if there are too
+    few of them), ranked by their exact similarity.
+
+    attr:
+        dimension: the dimension of the embeddings
+        agent_ids: the ids of the indexed agents, in insertion order
+        vectors: the normalized embeddings of the indexed agents
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        num_tables: int = 8,
+        num_bits: int = 10,
+        seed: Optional[int] = None,
+    ):
+        """Creates a new empty index.
+        :param num_tables: the number of hash tables
+        :param num_bits: the number of hyperplanes of each table"""
+        self.dimension = dimension
+        self.agent_ids: List[int] = []
+        self.__vectors = np.zeros((16, dimension))
+        self.__rows: Dict[int, int] = {}
+        self.__hyperplanes = np.random.default_rng(seed).standard_normal(
+            (num_tables, num_bits, dimension)
+        )
+        self.__bit_weights = 1 << np.arange(num_bits)
+        self.__tables: List[Dict[int, List[int]]] = [{} for _ in range(num_tables)]
+
+    @classmethod
+    def from_model(
+        cls,
+        argument_model: ArgumentModel,
+        agent_ids: List[int],
+        embedding: str = "scores",
+        seed: Optional[int] = None,
+    ) -> "MatchmakingIndex":
+        """Creates an index of some agents of a model
+        :param embedding: "scores" (score of each item) or "criteria" (weight
+        of each criterion)"""
+        preferences_list = [
+            argument_model.load_agent_preferences(agent_id) for agent_id in agent_ids
+        ]
+        if embedding == "scores":
+            vectors = build_score_matrix(preferences_list, argument_model.items)
+        elif embedding == "criteria":
+            vectors = build_criterion_order_matrix(
+                preferences_list, argument_model.criteria
+            )
+        else:
+            raise ValueError(f"Unknown embedding {embedding}")
+        index = cls(vectors.shape[1], seed=seed)
+        index.add_all(agent_ids, vectors)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.agent_ids)
+
+    def __contains__(self, agent_id: int) -> bool:
+        return agent_id in self.__rows
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Returns the normalized embeddings of the indexed agents."""
+        return self.__vectors[: len(self.agent_ids)]
+
+    def __hash(self, vectors: np.ndarray) -> np.ndarray:
+        """Hashes normalized vectors in each table
+        :return: a tables x vectors matrix of bucket keys"""
+        signs = np.einsum("tbd,vd->tvb", self.__hyperplanes, vectors) > 0
+        return np.asarray(signs @ self.__bit_weights)
+
+    def add_all(self, agent_ids: List[int], vectors: np.ndarray) -> None:
+        """Inserts agents, whose embeddings are the rows of a matrix."""
+        if any(agent_id in self.__rows for agent_id in agent_ids):
+            raise ValueError("An agent is already in the index")
+        vectors = normalize_rows(
+            np.asarray(vectors, dtype=float).reshape(-1, self.dimension)
+        )
+        first_row = len(self.agent_ids)
+        if first_row + len(agent_ids) > len(self.__vectors):
+            capacity = max(2 * len(self.__vectors), first_row + len(agent_ids))
+            self.__vectors = np.resize(self.__vectors, (capacity, self.dimension))
+        self.__vectors[first_row : first_row + len(agent_ids)] = vectors
+        for row, agent_id in enumerate(agent_ids, first_row):
+            self.__rows[agent_id] = row
+        self.agent_ids.extend(agent_ids)
+        for table, keys in zip(self.__tables, self.__hash(vectors)):
+            for row, key in enumerate(keys.tolist(), first_row):
+                table.setdefault(key, []).append(row)
+
+    def add(self, agent_id: int, vector: np.ndarray) -> None:
+        """Inserts an agent."""
+        self.add_all([agent_id], np.asarray(vector)[np.newaxis, :])
+
+    def __candidates(self, vector: np.ndarray, num_partners: int) -> np.ndarray:
+        """Returns the rows of the agents in the buckets of a normalized vector."""
+        keys = self.__hash(vector[np.newaxis, :])[:, 0].tolist()
+        candidates = {
+            row for table, key in zip(self.__tables, keys) for row in table.get(key, [])
+        }
+        if len(candidates) <= num_partners:
+            # Multi-probe: the buckets one hyperplane away
+            for table, key in zip(self.__tables, keys):
+                for bit in self.__bit_weights.tolist():
+                    candidates.update(table.get(key ^ bit, []))
+        return np.sort(np.fromiter(candidates, dtype=np.int64, count=len(candidates)))
+
+    def query(
+        self,
+        vector: np.ndarray,
+        num_partners: int = 10,
+        exclude: Optional[int] = None,
+        exact: Optional[bool] = None,
+    ) -> List[Tuple[int, float]]:
+        """Returns the agents most similar to a profile
+        :param vector: the embedding of the profile, which may not be indexed
+        :param exclude: an agent which is not returned (the profile's agent)
+        :param exact: if True, the index is searched exhaustively; by default,
+        only for small populations
+        :return: the ids of the agents and their similarity (from -1 to 1),
+        most similar first"""
+        vector = normalize_rows(np.asarray(vector, dtype=float)[np.newaxis, :])[0]
+        if exact is None:
+            exact = len(self) <= EXACT_SEARCH_MAX_AGENTS
+        rows = (
+            np.arange(len(self))
+            if exact
+            else self.__candidates(vector, num_partners + 1)
+        )
+        if exclude is not None and exclude in self.__rows:
+            rows = rows[rows != self.__rows[exclude]]
+        similarities = self.__vectors[rows] @ vector
+        best = np.argsort(-similarities, kind="stable")[:num_partners]
+        return [
+            (self.agent_ids[row], float(similarity))
+            for row, similarity in zip(rows[best].tolist(), similarities[best].tolist())
+        ]
+
+    def top_partners(
+        self, agent_id: int, num_partners: int = 10, exact: Optional[bool] = None
+    ) -> List[Tuple[int, float]]:
+        """Returns the agents most similar to an indexed agent (see query)."""
+        return self.query(
+            self.__vectors[self.__rows[agent_id]], num_partners, agent_id, exact
+        )
@@ -1,33 +1,61 @@
 """Generator of preferences"""
-from typing import List
 import csv
 import random
+from typing import Iterable, List, MutableMapping
 
-from communication.preferences.preferences import Preferences
-from communication.preferences.criterion_name import CriterionName
+from communication.preferences.copy_on_write_preferences import CopyOnWritePreferences
+from communication.preferences.criterion_name import CRITERION_REGISTRY, CriterionName
 from communication.preferences.criterion_value import CriterionValue
-from communication.preferences.item import Item
+from communication.preferences.item import ITEM_CATALOG, Item
+from communication.preferences.preferences import Preferences
 from communication.preferences.value import Value
 
 
+def read_preferences(lines: Iterable[str]) -> Preferences:
+    """Read preferences from the lines of a csv"""
+    preferences = Preferences()
+    reader = csv.reader(lines)
+    categories = next(reader)
+    criteria = CRITERION_REGISTRY.register_all(categories[1:])
+    preferences.set_criterion_name_list(list(criteria))
+    # print("criterion name list ", preferences.criterion_name_list)
+    items = []
+    for row in reader:
+        new_item = ITEM_CATALOG.register(row[0])
+        items.append(new_item)
+        for i, criterion_name in enumerate(criteria):
+            criterion_value = CriterionValue(
+                new_item, criterion_name, Value(int(row[i + 1]))
+            )
+            preferences.add_criterion_value(criterion_value)
+    return preferences
+
+
 def load_preferences(path: str) -> Preferences:
     """Load preferences from csv"""
-    preferences = Preferences()
     with open(path, "r", encoding="utf-8") as file:
-        reader = csv.reader(file)
-        categories = next(reader)
-        preferences.set_criterion_name_list([CriterionName(x) for x in categories[1:]])
-        # print("criterion name list ", preferences.criterion_name_list)
-        items = []
-        for row in reader:
-            new_item = Item(row[0], f"This is a {row[0]}")
-            items.append(new_item)
-            for i, criterion_name in enumerate(categories[1:]):
-                criterion_value = CriterionValue(
-                    new_item, CriterionName(criterion_name), Value(int(row[i + 1]))
-                )
-                preferences.add_criterion_value(criterion_value)
-    return preferences
+        return read_preferences(file)
+
+
+def load_shared_preferences(
+    path: str, profiles: MutableMapping[str, Preferences]
+) -> Preferences:
+    """Load preferences from csv, sharing their profile with the preferences
+    loaded from identical files
+    :param profiles: the profiles already loaded, by content of their file"""
+    with open(path, "r", encoding="utf-8") as file:
+        content = file.read()
+    profile = profiles.get(content)
+    if profile is None:
+        profile = read_preferences(content.splitlines())
+        profiles[content] = profile
+    return CopyOnWritePreferences(profile)
+
+
+def load_criteria(path: str) -> List[CriterionName]:
+    """Load the criteria of the header of a preferences csv, registering them"""
+    with open(path, "r", encoding="utf-8") as file:
+        return CRITERION_REGISTRY.register_all(next(csv.reader(file))[1:])
 
 
 def generate_random_preferences(items: List[Item], criteria: List[CriterionName]):
@@ -41,3 +69,19 @@ def generate_random_preferences(items: List[Item], criteria: List[CriterionName]
                 CriterionValue(item, criterion, random.choice(list(Value)))
             )
     return preferences
+
+
+def save_preferences(preferences: Preferences, items: List[Item], path: str) -> None:
+    """Save preferences to csv, the criteria in their order of importance"""
+    criteria = preferences.get_criterion_name_list()
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file, lineterminator="\n")
+        writer.writerow(["item_name"] + [criterion.value for criterion in criteria])
+        for item in items:
+            writer.writerow(
+                [item.name]
+                + [
+                    preferences.get_value(item, criterion).value
+                    for criterion in criteria
+                ]
+            )
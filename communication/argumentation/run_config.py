@@ -0,0 +1,88 @@
+"""Run configuration"""
+from typing import Any, Dict, Optional
+
+from communication import config
+from communication.argumentation.concession import (
+    CONCESSION_STRATEGIES,
+    ConcessionStrategy,
+    LinearConcession,
+)
+
+
+class RunConfig:  # pylint: disable=too-few-public-methods
+    """RunConfig class.
+    This class implements the parameters of the negociations of a model, which
+    default to those of communication.config, so that several configurations
+    can be run in the same process (see ArgumentModel.configure).
+
+    attr:
+        concession: the name of the concession strategy of the agents
+        initial_percentage: the percentage used before any concession
+        acceptance_margin: the margin applied to the percentage when accepting
+        increase_percentage: the increase of the linear concession strategy
+        max_num_steps: the number of steps after which a negociation fails
+        seed: the seed of the random generators of the negociations
+        settle_debates: whether the agents stop arguing about the arguments
+        whose status is settled (see ArgumentAgent)
+    """
+
+    def __init__(
+        self,
+        concession: str = config.CONCESSION_STRATEGY,
+        initial_percentage: int = config.INITIAL_PERCENTAGE,
+        acceptance_margin: float = config.ACCEPTANCE_MARGIN,
+        increase_percentage: int = config.INCREASE_PERCENTAGE,
+        max_num_steps: int = config.MAX_NUM_STEPS,
+        seed: Optional[int] = None,
+        settle_debates: bool = config.SETTLE_DEBATES,
+    ):  # pylint: disable=too-many-arguments
+        """Creates a new run configuration."""
+        if concession not in CONCESSION_STRATEGIES:
+            raise ValueError(
+                f"Unknown concession strategy {concession}, "
+                f"expected one of {', '.join(CONCESSION_STRATEGIES)}"
+            )
+        if max_num_steps < 1:
+            raise ValueError("The maximum number of steps must be positive")
+        self.concession = concession
+        self.initial_percentage = initial_percentage
+        self.acceptance_margin = acceptance_margin
+        self.increase_percentage = increase_percentage
+        self.max_num_steps = max_num_steps
+        self.seed = seed
+        self.settle_debates = settle_debates
+
+    def __repr__(self) -> str:
+        parameters = ", ".join(
+            f"{key}={value!r}" for key, value in self.to_dict().items()
+        )
+        return f"RunConfig({parameters})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the parameters of the configuration."""
+        return {
+            "concession": self.concession,
+            "initial_percentage": self.initial_percentage,
+            "acceptance_margin": self.acceptance_margin,
+            "increase_percentage": self.increase_percentage,
+            "max_num_steps": self.max_num_steps,
+            "seed": self.seed,
+            "settle_debates": self.settle_debates,
+        }
+
+    def replace(self, **changes: Any) -> "RunConfig":
+        """Returns a copy of the configuration with some parameters changed."""
+        return RunConfig(**{**self.to_dict(), **changes})
+
+    def concession_strategy(self) -> ConcessionStrategy:
+        """Returns the concession strategy of the agents (the increase
+        percentage only applies to the linear strategy)."""
+        if self.concession == LinearConcession.name:
+            return LinearConcession(
+                self.initial_percentage,
+                self.acceptance_margin,
+                self.increase_percentage,
+            )
+        return CONCESSION_STRATEGIES[self.concession](
+            self.initial_percentage, self.acceptance_margin
+        )
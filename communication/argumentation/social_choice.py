@@ -0,0 +1,153 @@
+"""Social choice baselines"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from communication.argumentation.agreement_predictor import build_score_matrix
+from communication.argumentation.argument_model import ArgumentModel
+from communication.preferences.item import Item
+
+# Rules choosing an item for each pair of agents
+PAIR_RULES = ["utilitarian", "egalitarian", "nash"]
+
+# Number of pairs whose items are chosen at once (bounds the memory used)
+PAIRS_CHUNK_SIZE = 1 << 18
+
+
+def argmax_with_ties(criterion: np.ndarray, tie_breaker: np.ndarray) -> np.ndarray:
+    """Returns the index of the maximum of each row of a criterion, the ties
+    being broken by the maximum of a tie breaker, then by index"""
+    best = criterion == criterion.max(axis=1, keepdims=True)
+    return np.asarray(np.argmax(np.where(best, tie_breaker, -np.inf), axis=1))
+
+
+def choose_pair_items(
+    scores: np.ndarray, first: np.ndarray, second: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Choose an item for each pair of agents according to each rule:
+    - utilitarian: the item maximizing the sum of the scores of the agents
+    - egalitarian: the item maximizing the score of the least satisfied agent
+    - nash: the item maximizing the product of the gains of the agents over
+    their least preferred item (Nash bargaining solution)
+    the ties being broken by the sum of the scores, then by item order
+    :param first: the index of the first agent of each pair
+    :param second: the index of the second agent of each pair
+    :return: the index of the chosen item of each pair, by rule"""
+    scores_1, scores_2 = scores[first], scores[second]
+    sums = scores_1 + scores_2
+    gains = scores - scores.min(axis=1, keepdims=True)
+    return {
+        "utilitarian": np.asarray(np.argmax(sums, axis=1)),
+        "egalitarian": argmax_with_ties(np.minimum(scores_1, scores_2), sums),
+        "nash": argmax_with_ties(gains[first] * gains[second], sums),
+    }
+
+
+def borda_scores(scores: np.ndarray) -> np.ndarray:
+    """Compute the Borda count of each item: an agent gives n - 1 points to its
+    favourite item, n - 2 to the next one... (ties broken by item order)"""
+    num_items = scores.shape[1]
+    order = np.argsort(-scores, axis=1, kind="stable")
+    points = np.zeros(num_items, dtype=np.int64)
+    np.add.at(
+        points,
+        order,
+        np.broadcast_to(np.arange(num_items - 1, -1, -1), scores.shape),
+    )
+    return points
+
+
+def condorcet_winner(scores: np.ndarray) -> Optional[int]:
+    """Returns the index of the item preferred to each other item by a strict
+    majority of the agents, None if there is no such item"""
+    # wins[i, j]: number of agents preferring the item i to the item j
+    wins = (scores[:, :, np.newaxis] > scores[:, np.newaxis, :]).sum(axis=0)
+    beats = wins > wins.T
+    np.fill_diagonal(beats, True)
+    winners = np.flatnonzero(beats.all(axis=1))
+    return int(winners[0]) if len(winners) > 0 else None
+
+
+class SocialChoiceBaselines:
+    """SocialChoiceBaselines class.
+    This class computes, from the score matrix of a population, the items that
+    social choice rules would choose for each pair of agents (utilitarian,
+    egalitarian and Nash bargaining optima) and for the whole population
+    (Borda and Condorcet winners), without simulating any negociation.
+
+    attr:
+        agent_ids: the ids of the agents, sorted
+        items: the items of the negociation
+        scores: the agents x items score matrix
+        pair_items: for each rule, the index of the item chosen for each pair,
+        the pairs being in the order of itertools.combinations of the agents
+        borda_scores: the Borda count of each item
+        condorcet_winner: the index of the Condorcet winner, None if there is none
+    """
+
+    def __init__(self, agent_ids: List[int], scores: np.ndarray, items: List[Item]):
+        """Computes the baselines of a population from its score matrix."""
+        order = np.argsort(agent_ids, kind="stable")
+        self.agent_ids = [agent_ids[index] for index in order]
+        self.__indexes = {agent_id: i for i, agent_id in enumerate(self.agent_ids)}
+        self.items = items
+        self.scores = np.asarray(scores, dtype=float)[order]
+
+        num_agents = len(self.agent_ids)
+        first, second = np.triu_indices(num_agents, k=1)
+        item_type = np.min_scalar_type(max(len(items) - 1, 0))
+        self.pair_items = {
+            rule: np.empty(len(first), dtype=item_type) for rule in PAIR_RULES
+        }
+        for start in range(0, len(first), PAIRS_CHUNK_SIZE):
+            chunk = slice(start, start + PAIRS_CHUNK_SIZE)
+            for rule, chosen in choose_pair_items(
+                self.scores, first[chunk], second[chunk]
+            ).items():
+                self.pair_items[rule][chunk] = chosen
+
+        self.borda_scores = borda_scores(self.scores)
+        self.condorcet_winner = condorcet_winner(self.scores)
+
+    @classmethod
+    def from_model(
+        cls, argument_model: ArgumentModel, agent_ids: List[int]
+    ) -> "SocialChoiceBaselines":
+        """Computes the baselines of some agents of a model."""
+        return cls(
+            agent_ids,
+            build_score_matrix(
+                [
+                    argument_model.load_agent_preferences(agent_id)
+                    for agent_id in agent_ids
+                ],
+                argument_model.items,
+            ),
+            argument_model.items,
+        )
+
+    def pair_index(self, agent_1: int, agent_2: int) -> int:
+        """Returns the index of the pair of two agents in pair_items."""
+        first, second = sorted([self.__indexes[agent_1], self.__indexes[agent_2]])
+        if first == second:
+            raise ValueError("A pair is made of two different agents")
+        num_agents = len(self.agent_ids)
+        return first * (2 * num_agents - first - 1) // 2 + second - first - 1
+
+    def pair_item(self, rule: str, agent_1: int, agent_2: int) -> Item:
+        """Returns the item chosen by a rule for the pair of two agents."""
+        if rule not in self.pair_items:
+            raise ValueError(
+                f"Unknown rule {rule}, expected one of {', '.join(PAIR_RULES)}"
+            )
+        pair = self.pair_index(agent_1, agent_2)
+        return self.items[int(self.pair_items[rule][pair])]
+
+    def item_counts(self, rule: str) -> Dict[str, int]:
+        """Returns the number of pairs for which a rule chooses each item."""
+        counts = np.bincount(self.pair_items[rule], minlength=len(self.items))
+        return {item.name: int(count) for item, count in zip(self.items, counts)}
+
+    def borda_winner(self) -> Item:
+        """Returns the item with the highest Borda count."""
+        return self.items[int(np.argmax(self.borda_scores))]
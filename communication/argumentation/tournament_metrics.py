@@ -0,0 +1,169 @@
+"""Tournament metrics"""
+import math
+import random
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+# Number of negociation wall times kept to estimate their percentiles
+WALL_TIMES_RESERVOIR_SIZE = 10000
+# Window of the recent throughput, in seconds
+RECENT_WINDOW = 10
+PERCENTILES = [50, 95, 99]
+
+
+def histogram_percentile(histogram: Dict[int, int], percentile: float) -> float:
+    """Returns the percentile of the values counted by a histogram
+    (nearest-rank method), 0 if it is empty"""
+    total = sum(histogram.values())
+    if total == 0:
+        return 0.0
+    rank = max(1, math.ceil(percentile / 100 * total))
+    count = 0
+    for value in sorted(histogram):
+        count += histogram[value]
+        if count >= rank:
+            return float(value)
+    return float(max(histogram))
+
+
+def sample_percentile(samples: List[float], percentile: float) -> float:
+    """Returns the percentile of samples (nearest-rank method), 0 if empty"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(1, math.ceil(percentile / 100 * len(ordered))) - 1]
+
+
+class TournamentMetrics:  # pylint: disable=too-many-instance-attributes
+    """TournamentMetrics class.
+    This class gathers the metrics of a running tournament: the negociations
+    completed (and the number per second), the messages sent by performative
+    (see MessageService.set_metrics), the distribution of the steps and of the
+    wall time of the negociations, the negociations which reached the maximum
+    number of steps and the time each worker spent negociating. It can be
+    updated from several threads and read at any time with snapshot.
+
+    attr:
+        start_time: the time the metrics started to be gathered
+    """
+
+    def __init__(self):
+        """Creates new empty metrics."""
+        self.start_time = time.time()
+        self.__lock = threading.Lock()
+        self.__random = random.Random(0)
+        self.__num_negociations = 0
+        self.__num_agreements = 0
+        self.__num_max_steps = 0
+        self.__last_negociation_time: Optional[float] = None
+        self.__recent: Deque[List[int]] = deque()
+        self.__messages: Counter = Counter()
+        self.__steps: Counter = Counter()
+        self.__num_wall_times = 0
+        self.__wall_times: List[float] = []
+        self.__busy_times: Dict[str, float] = {}
+
+    def record_message(self, performative: Any) -> None:
+        """Counts a message sent with a performative."""
+        with self.__lock:
+            self.__messages[str(performative)] += 1
+
+    def record_busy(self, worker: str, seconds: float) -> None:
+        """Adds time a worker spent negociating."""
+        with self.__lock:
+            self.__busy_times[worker] = self.__busy_times.get(worker, 0.0) + seconds
+
+    def record_negociation(
+        self,
+        result: Optional[Dict[str, Any]],
+        wall_time: Optional[float] = None,
+        worker: str = "main",
+    ) -> None:
+        """Counts a completed negociation
+        :param result: its result, None if no agreement was found within the
+        maximum number of steps
+        :param wall_time: the time it took, if it was measured"""
+        now = time.time()
+        with self.__lock:
+            self.__num_negociations += 1
+            self.__last_negociation_time = now
+            second = int(now)
+            if self.__recent and self.__recent[-1][0] == second:
+                self.__recent[-1][1] += 1
+            else:
+                self.__recent.append([second, 1])
+                while self.__recent[0][0] <= second - RECENT_WINDOW:
+                    self.__recent.popleft()
+            if result is None:
+                self.__num_max_steps += 1
+            else:
+                self.__num_agreements += 1
+                if result.get("steps") is not None:
+                    self.__steps[result["steps"]] += 1
+            if wall_time is not None:
+                self.__add_wall_time(wall_time)
+                self.__busy_times[worker] = (
+                    self.__busy_times.get(worker, 0.0) + wall_time
+                )
+
+    def record_negociations(
+        self,
+        results: Iterable[Optional[Dict[str, Any]]],
+        busy_time: Optional[float] = None,
+        worker: str = "main",
+    ) -> None:
+        """Counts negociations run together (whose wall times are unknown)
+        :param busy_time: the time the worker took to run them, if measured"""
+        for result in results:
+            self.record_negociation(result)
+        if busy_time is not None:
+            self.record_busy(worker, busy_time)
+
+    def __add_wall_time(self, wall_time: float) -> None:
+        """Keeps a uniform sample of the wall times (reservoir sampling)."""
+        self.__num_wall_times += 1
+        if len(self.__wall_times) < WALL_TIMES_RESERVOIR_SIZE:
+            self.__wall_times.append(wall_time)
+            return
+        index = self.__random.randrange(self.__num_wall_times)
+        if index < WALL_TIMES_RESERVOIR_SIZE:
+            self.__wall_times[index] = wall_time
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the current values of the metrics."""
+        now = time.time()
+        with self.__lock:
+            elapsed = max(now - self.start_time, 1e-9)
+            recent = sum(
+                count
+                for second, count in self.__recent
+                if second > int(now) - RECENT_WINDOW
+            )
+            return {
+                "elapsed": elapsed,
+                "negociations": self.__num_negociations,
+                "agreements": self.__num_agreements,
+                "negociations_per_second": self.__num_negociations / elapsed,
+                "recent_negociations_per_second": recent / min(RECENT_WINDOW, elapsed),
+                "seconds_since_last_negociation": (
+                    now - self.__last_negociation_time
+                    if self.__last_negociation_time is not None
+                    else None
+                ),
+                "max_steps_reached": self.__num_max_steps,
+                "messages": dict(self.__messages),
+                "steps": {
+                    f"p{percentile}": histogram_percentile(self.__steps, percentile)
+                    for percentile in PERCENTILES
+                },
+                "wall_time": {
+                    f"p{percentile}": sample_percentile(self.__wall_times, percentile)
+                    for percentile in PERCENTILES
+                },
+                "worker_utilization": {
+                    worker: min(1.0, busy_time / elapsed)
+                    for worker, busy_time in sorted(self.__busy_times.items())
+                },
+            }
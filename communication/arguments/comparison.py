@@ -1,4 +1,5 @@
 """Comparison class"""
+from communication.preferences.criterion_name import CriterionName
 
 
 class Comparison:
@@ -6,36 +7,50 @@ class Comparison:
     This class implements a comparison object used in argument object.
 
     attr:
-        best_criterion_name:
-        worst_criterion_name:
+        best_criterion_id: the id of the best criterion
+        worst_criterion_id: the id of the worst criterion
     """
 
-    def __init__(self, best_criterion_name, worst_criterion_name):
+    def __init__(
+        self, best_criterion_name: CriterionName, worst_criterion_name: CriterionName
+    ):
         """Creates a new comparison."""
-        self.__best_criterion_name = best_criterion_name
-        self.__worst_criterion_name = worst_criterion_name
+        self.__best_criterion_id = best_criterion_name.id
+        self.__worst_criterion_id = worst_criterion_name.id
+
+    def __reduce__(self):
+        # The ids are specific to a process: the criteria are sent by name
+        return (Comparison, (self.best_criterion_name, self.worst_criterion_name))
+
+    @property
+    def best_criterion_id(self) -> int:
+        """Best criterion id getter"""
+        return self.__best_criterion_id
 
     @property
-    def best_criterion_name(self):
+    def worst_criterion_id(self) -> int:
+        """Worst criterion id getter"""
+        return self.__worst_criterion_id
+
+    @property
+    def best_criterion_name(self) -> CriterionName:
         """Best criterion name getter"""
-        return self.__best_criterion_name
+        return CriterionName.from_id(self.__best_criterion_id)
 
     @property
-    def worst_criterion_name(self):
+    def worst_criterion_name(self) -> CriterionName:
         """Worst criterion name"""
-        return self.__worst_criterion_name
+        return CriterionName.from_id(self.__worst_criterion_id)
 
     def __str__(self) -> str:
         """Stringyfy Comparison"""
-        return (
-            f"{self.__worst_criterion_name.name} <= {self.__best_criterion_name.name}"
-        )
+        return f"{self.worst_criterion_name.name} <= {self.best_criterion_name.name}"
 
     def __eq__(self, __o: object) -> bool:
         """Comparison equality"""
         if not isinstance(__o, Comparison):
             return False
         return bool(
-            self.__best_criterion_name == __o.best_criterion_name
-            and self.__worst_criterion_name == __o.worst_criterion_name
+            self.__best_criterion_id == __o.best_criterion_id
+            and self.__worst_criterion_id == __o.worst_criterion_id
         )
@@ -8,19 +8,28 @@ class CoupleValue:
     This class implements a couple value used in argument object.
 
     attr:
-        criterion_name:
+        criterion_id: the id of the criterion
         value:
     """
 
     def __init__(self, criterion_name: CriterionName, value: Value):
         """Creates a new couple value."""
-        self.__criterion_name = criterion_name
+        self.__criterion_id = criterion_name.id
         self.__value = value
 
+    def __reduce__(self):
+        # The ids are specific to a process: a criterion is sent by name
+        return (CoupleValue, (self.criterion_name, self.__value))
+
+    @property
+    def criterion_id(self) -> int:
+        """Criterion id"""
+        return self.__criterion_id
+
     @property
-    def criterion_name(self):
+    def criterion_name(self) -> CriterionName:
         """Criterion name"""
-        return self.__criterion_name
+        return CriterionName.from_id(self.__criterion_id)
 
     @property
     def value(self):
@@ -29,7 +38,7 @@ class CoupleValue:
 
     def __str__(self) -> str:
         """String couple value"""
-        return f"{self.__criterion_name.name} = {self.__value.name}"
+        return f"{self.criterion_name.name} = {self.__value.name}"
 
     def __eq__(self, __o: object) -> bool:
         """Couple value equality"""
@@ -37,5 +46,5 @@ class CoupleValue:
             return False
 
         return bool(
-            self.__criterion_name == __o.criterion_name and self.__value == __o.value
+            self.__criterion_id == __o.criterion_id and self.__value == __o.value
         )
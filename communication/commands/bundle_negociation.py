@@ -0,0 +1,55 @@
+"""Bundle negociations"""
+from itertools import combinations
+from typing import Any, Dict, List
+
+from communication.argumentation.argument_model import ArgumentModel
+
+
+def negociate_bundles(
+    argument_model: ArgumentModel, num_agents: int, bundle_size: int
+) -> List[Dict[str, Any]]:
+    """Run the negociations between all pairs of agents about bundles of
+    bundle_size items and report the bundle chosen by each pair, with its rank
+    among the bundles of each agent (0 for its favourite ones)"""
+    initial_bundle_size = argument_model.bundle_size
+    argument_model.bundle_size = bundle_size
+    report = []
+    try:
+        for pair in combinations(list(range(1, num_agents + 1)), 2):
+            result = argument_model.run_discussion_between(*pair)
+            negociation: Dict[str, Any] = {
+                "agents": pair,
+                "bundle": None,
+                "steps": argument_model.max_num_steps,
+                "ranks": [],
+            }
+            if result is not None:
+                negociation["bundle"] = result["chosen_item"]
+                negociation["steps"] = result["steps"]
+                for agent_id in pair:
+                    bundles = argument_model.build_bundles(
+                        argument_model.load_agent_preferences(agent_id)
+                    )
+                    negociation["ranks"].append(
+                        bundles.index(result["chosen_item"])  # type: ignore
+                    )
+            report.append(negociation)
+    finally:
+        argument_model.bundle_size = initial_bundle_size
+    return report
+
+
+def print_bundle_negociations(report: List[Dict[str, Any]]) -> None:
+    """To print the bundle chosen by each pair of agents"""
+    print("\nBUNDLES:")
+    print(f"{'agents':<8} {'steps':>5} {'ranks':>11}  bundle")
+    for negociation in report:
+        agents = "-".join(str(agent_id) for agent_id in negociation["agents"])
+        if negociation["bundle"] is None:
+            print(f"{agents:<8} {negociation['steps']:>5} {'-':>11}  no agreement")
+            continue
+        ranks = "/".join(str(rank) for rank in negociation["ranks"])
+        print(
+            f"{agents:<8} {negociation['steps']:>5} {ranks:>11}  "
+            f"{negociation['bundle'].name}"
+        )
@@ -0,0 +1,163 @@
+"""Tournament checkpoint"""
+import json
+import os
+import random
+from typing import Any, Dict, List, Optional
+
+from communication.preferences.item import Item
+
+CHECKPOINT_VERSION = 1
+
+
+def serialize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Converts the result of a negociation to JSON data"""
+    chosen_item = result["chosen_item"]
+    return {
+        "winning_agent": result["winning_agent"],
+        "losing_agent": result["losing_agent"],
+        "chosen_item": chosen_item
+        if isinstance(chosen_item, str)
+        else chosen_item.name,
+        "steps": result.get("steps"),
+        "messages": result.get("messages"),
+        "arguments": [str(argument) for argument in result["arguments"]],
+        "seed": result.get("seed"),
+    }
+
+
+def deserialize_result(data: Dict[str, Any], items: List[Item]) -> Dict[str, Any]:
+    """Converts JSON data to the result of a negociation, the arguments being
+    their description"""
+    item_by_name = {item.name: item for item in items}
+    return dict(data, chosen_item=item_by_name[data["chosen_item"]])
+
+
+class TournamentCheckpoint:  # pylint: disable=too-many-instance-attributes
+    """TournamentCheckpoint class.
+    Periodic snapshot of the progress of a tournament in a JSON file: its
+    configuration, the index of the next pair to negociate, the state of the
+    random generator of the model and the number of completed outcomes. The
+    outcomes kept in memory by the tournament are appended to a JSON lines file
+    next to the checkpoint (those streamed to a results store are already on
+    disk). The checkpoint is replaced atomically, so that a crash while saving
+    keeps the previous snapshot; the outcomes written after it are discarded
+    when resuming.
+
+    attr:
+        path: the path of the JSON file
+        results_path: the path of the JSON lines file of the outcomes
+        every: the number of negociated pairs between two snapshots
+        config: the configuration of the tournament, which must match to resume it
+        next_pair: the index of the next pair to negociate
+        random_state: the state of the random generator of the model
+        num_results: the number of outcomes in the JSON lines file
+        results_size: the size of the JSON lines file at the last snapshot
+        num_stored: the number of outcomes in the results store
+    """
+
+    def __init__(self, path: str, config: Dict[str, Any], every: int = 100):
+        """Creates a new checkpoint of a tournament which has not started."""
+        self.path = path
+        self.results_path = f"{path}.results"
+        self.every = every
+        self.config = config
+        self.next_pair = 0
+        self.random_state: Optional[Any] = None
+        self.num_results = 0
+        self.results_size = 0
+        self.num_stored = 0
+
+    @classmethod
+    def load(
+        cls, path: str, config: Dict[str, Any], every: int = 100
+    ) -> "TournamentCheckpoint":
+        """Loads the checkpoint of a tournament, or creates a new one if the
+        file does not exist."""
+        checkpoint = cls(path, config, every)
+        if not os.path.exists(path):
+            return checkpoint
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        if data["version"] != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {data['version']}")
+        if data["config"] != config:
+            raise ValueError(
+                f"The checkpoint {path} belongs to another tournament: {data['config']}"
+            )
+        checkpoint.next_pair = data["next_pair"]
+        checkpoint.random_state = data["random_state"]
+        checkpoint.num_results = data["num_results"]
+        checkpoint.results_size = data["results_size"]
+        checkpoint.num_stored = data["num_stored"]
+        return checkpoint
+
+    def is_due(self, next_pair: int) -> bool:
+        """Returns True if a snapshot should be saved before a pair."""
+        return next_pair - self.next_pair >= self.every
+
+    def save(
+        self,
+        next_pair: int,
+        rng: random.Random,
+        results: List[Dict[str, Any]],
+        num_stored: int = 0,
+    ) -> None:
+        """Saves a snapshot of the tournament.
+        :param results: the outcomes kept in memory by the tournament, including
+        those of the previous snapshots
+        :param num_stored: the number of outcomes in the results store"""
+        self.next_pair = next_pair
+        state = rng.getstate()
+        self.random_state = [state[0], list(state[1]), state[2]]
+        with open(self.results_path, "a", encoding="utf-8") as file:
+            file.truncate(self.results_size)
+            for result in results[self.num_results :]:
+                file.write(json.dumps(serialize_result(result)) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+            self.results_size = os.fstat(file.fileno()).st_size
+        self.num_results = len(results)
+        self.num_stored = num_stored
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "version": CHECKPOINT_VERSION,
+                    "config": self.config,
+                    "next_pair": self.next_pair,
+                    "random_state": self.random_state,
+                    "num_results": self.num_results,
+                    "results_size": self.results_size,
+                    "num_stored": self.num_stored,
+                },
+                file,
+            )
+        os.replace(temporary_path, self.path)
+
+    def restore_random_state(self, rng: random.Random) -> None:
+        """Restores the state of a random generator, if it was saved."""
+        if self.random_state is not None:
+            version, internal_state, gauss_next = self.random_state
+            rng.setstate((version, tuple(internal_state), gauss_next))
+
+    def restored_results(self, items: List[Item]) -> List[Dict[str, Any]]:
+        """Returns the outcomes of the completed pairs saved with the checkpoint,
+        the outcomes written after it being discarded."""
+        if not os.path.exists(self.results_path):
+            return []
+        with open(self.results_path, "r+", encoding="utf-8") as file:
+            file.truncate(self.results_size)
+            return [deserialize_result(json.loads(line), items) for line in file]
+
+
+def open_checkpoint(
+    path: str, config: Dict[str, Any], every: int = 100, resume: bool = False
+) -> TournamentCheckpoint:
+    """Opens the checkpoint of a tournament
+    :param config: the configuration of the tournament, which must be the one
+    of the checkpoint to resume it
+    :param resume: if True, the tournament resumes from the checkpoint if it
+    exists, else it starts over"""
+    if resume:
+        return TournamentCheckpoint.load(path, config, every)
+    return TournamentCheckpoint(path, config, every)
@@ -0,0 +1,67 @@
+"""Concession strategies benchmark"""
+from itertools import combinations
+from typing import Dict, List, Optional
+
+from communication.argumentation.argument_model import ArgumentModel
+from communication.argumentation.concession import (
+    CONCESSION_STRATEGIES,
+    ConcessionStrategy,
+)
+
+
+def benchmark_concession_strategies(
+    argument_model: ArgumentModel,
+    num_agents: int,
+    strategies: Optional[List[ConcessionStrategy]] = None,
+) -> Dict[str, Dict[str, float]]:
+    """Run the negociations between all pairs of agents for each strategy
+    and report the number of rounds needed to reach an agreement"""
+    if strategies is None:
+        strategies = [strategy() for strategy in CONCESSION_STRATEGIES.values()]
+
+    initial_strategy = argument_model.concession_strategy
+    report = {}
+    for strategy in strategies:
+        argument_model.concession_strategy = strategy
+        steps, messages, concessions = [], [], []
+        num_pairs = 0
+        for agent_1, agent_2 in combinations(list(range(1, num_agents + 1)), 2):
+            num_pairs += 1
+            result = argument_model.run_discussion_between(
+                agent_1, agent_2, argument_model.max_num_steps
+            )
+            if result is not None:
+                steps.append(result["steps"])
+                messages.append(result["messages"])
+                concessions.append(result["concessions"])
+
+        num_agreements = len(steps)
+        report[strategy.name] = {
+            "pairs": num_pairs,
+            "agreement_rate": num_agreements / num_pairs if num_pairs else 0.0,
+            "mean_steps": sum(steps) / num_agreements if num_agreements else 0.0,
+            "max_steps": max(steps, default=0),
+            "mean_messages": (
+                sum(messages) / num_agreements if num_agreements else 0.0
+            ),
+            "mean_concessions": (
+                sum(concessions) / num_agreements if num_agreements else 0.0
+            ),
+        }
+    argument_model.concession_strategy = initial_strategy
+    return report
+
+
+def print_concession_benchmark(report: Dict[str, Dict[str, float]]) -> None:
+    """To print the rounds to agreement of each strategy"""
+    print("\nCONCESSION STRATEGIES:")
+    print(
+        f"{'strategy':<12} {'agreements':>10} {'steps':>8} {'max':>5} "
+        f"{'messages':>9} {'concessions':>12}"
+    )
+    for name, stats in sorted(report.items(), key=lambda x: x[1]["mean_steps"]):
+        print(
+            f"{name:<12} {stats['agreement_rate']:>10.0%} "
+            f"{stats['mean_steps']:>8.2f} {stats['max_steps']:>5} "
+            f"{stats['mean_messages']:>9.2f} {stats['mean_concessions']:>12.2f}"
+        )
@@ -0,0 +1,370 @@
+"""Distributed negociations"""
+import json
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from communication.argumentation.argument_model import ArgumentModel, get_pair_seed
+from communication.argumentation.tournament_metrics import TournamentMetrics
+from communication.commands.checkpoint import deserialize_result, serialize_result
+
+Pair = Tuple[int, int]
+Address = Tuple[str, int]
+
+# Number of times a batch can be lost by a worker before the tournament fails
+MAX_BATCH_FAILURES = 3
+
+# Time without any connected worker after which a run fails, in seconds
+CONNECTION_TIMEOUT = 60.0
+
+# Time a worker can take to answer the coordinator, in seconds
+WORKER_TIMEOUT = 600.0
+
+
+def parse_address(address: str) -> Address:
+    """Parse a "host:port" address"""
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Invalid address {address}, expected host:port")
+    return host, int(port)
+
+
+def send_message(file: Any, message: Dict[str, Any]) -> None:
+    """Send a message as a line of JSON"""
+    file.write((json.dumps(message) + "\n").encode("utf-8"))
+    file.flush()
+
+
+def receive_message(file: Any) -> Optional[Dict[str, Any]]:
+    """Receive a line of JSON, None if the connection was closed"""
+    line = file.readline()
+    return json.loads(line) if line else None
+
+
+class TournamentCoordinator:  # pylint: disable=too-many-instance-attributes
+    """TournamentCoordinator class.
+    This class hands out batches of pairs to the workers connected to it over
+    TCP (see run_worker) and collects their outcomes. The messages are lines of
+    JSON: a worker says hello with the configuration of its tournament, then
+    asks for a batch of pairs with the outcomes of its previous batch until the
+    coordinator answers that the tournament is done. The coordinator can run
+    several lists of pairs (e.g. between the checkpoints of a tournament), the
+    workers waiting for the next one until it is closed.
+    The batches of a worker which disconnects, or does not answer within
+    worker_timeout, are handed out again. When no batch is left, an idle worker
+    steals a batch still run by another worker: the first outcomes received
+    win, so that a slow or hung worker does not delay the end of the
+    tournament. A run fails if no worker is connected (the rejected ones
+    excluded) for connection_timeout.
+
+    attr:
+        address: the address the coordinator listens to (its actual port once
+        started, if the port 0 is given)
+        config: the configuration of the tournament, which the workers must share
+        batch_size: the number of pairs of a batch
+        metrics: the metrics counting the negociations and the time each
+        worker spent on its batches, if any
+        connection_timeout: the time without any connected worker after which
+        a run fails, in seconds
+        worker_timeout: the time a worker can take to answer, in seconds
+    """
+
+    def __init__(
+        self,
+        address: Address,
+        tournament_config: Dict[str, Any],
+        batch_size: int = 64,
+        metrics: Optional[TournamentMetrics] = None,
+        connection_timeout: float = CONNECTION_TIMEOUT,
+        worker_timeout: float = WORKER_TIMEOUT,
+    ):  # pylint: disable=too-many-arguments
+        """Creates a new coordinator."""
+        self.address = address
+        self.config = tournament_config
+        self.batch_size = batch_size
+        self.metrics = metrics
+        self.connection_timeout = connection_timeout
+        self.worker_timeout = worker_timeout
+        self.__condition = threading.Condition()
+        # Batches of the current run, numbered across the runs
+        self.__batches: Dict[int, List[Pair]] = {}
+        self.__num_batches = 0
+        self.__pending: Deque[int] = deque()
+        self.__running: Dict[int, Set[int]] = {}
+        self.__failures: Dict[int, int] = {}
+        self.__results: Dict[int, List[Optional[Dict[str, Any]]]] = {}
+        self.__error: Optional[str] = None
+        self.__num_workers = 0
+        self.__num_connected = 0
+        self.__idle_since = time.monotonic()
+        self.__server: Optional[CoordinatorServer] = None
+        self.__closed = False
+
+    def __enter__(self) -> "TournamentCoordinator":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __is_done(self) -> bool:
+        return self.__error is not None or len(self.__results) == len(self.__batches)
+
+    def __next_batch(self, worker: int) -> Optional[Tuple[int, List[Pair]]]:
+        """Assigns a batch to a worker, waiting for one if all the running
+        batches are already run by this worker; None if the tournament is done."""
+        with self.__condition:
+            while not self.__closed and self.__error is None:
+                if self.__pending:
+                    batch = self.__pending.popleft()
+                else:
+                    # Steal the batch run by the fewest workers
+                    stealable = [
+                        batch
+                        for batch, workers in self.__running.items()
+                        if worker not in workers
+                    ]
+                    if not stealable:
+                        self.__condition.wait()
+                        continue
+                    batch = min(stealable, key=lambda b: len(self.__running[b]))
+                self.__running.setdefault(batch, set()).add(worker)
+                return batch, self.__batches[batch]
+            return None
+
+    def __complete_batch(
+        self, worker: int, batch: int, results: List[Optional[Dict[str, Any]]]
+    ) -> None:
+        with self.__condition:
+            self.__running.get(batch, set()).discard(worker)
+            # The batches of the previous runs were completed by other workers
+            if batch in self.__batches and batch not in self.__results:
+                self.__results[batch] = results
+                if self.metrics is not None:
+                    self.metrics.record_negociations(results)
+                self.__running.pop(batch, None)
+                if batch in self.__pending:
+                    self.__pending.remove(batch)
+            self.__condition.notify_all()
+
+    def __fail_batch(self, worker: int, batch: int) -> None:
+        """Hands out again the batch of a worker which disconnected."""
+        with self.__condition:
+            workers = self.__running.get(batch, set())
+            workers.discard(worker)
+            if batch not in self.__batches or batch in self.__results or workers:
+                return
+            self.__running.pop(batch, None)
+            self.__failures[batch] = self.__failures.get(batch, 0) + 1
+            if self.__failures[batch] >= MAX_BATCH_FAILURES:
+                self.__error = (
+                    f"The batch {self.__batches[batch]} failed too many times"
+                )
+            else:
+                self.__pending.appendleft(batch)
+            self.__condition.notify_all()
+
+    def __connect(self, connected: bool) -> None:
+        """Counts a worker which connected (with the configuration of the
+        tournament) or disconnected."""
+        with self.__condition:
+            self.__num_connected += 1 if connected else -1
+            if self.__num_connected == 0:
+                self.__idle_since = time.monotonic()
+                self.__condition.notify_all()
+
+    def __wait_for_results(self) -> None:
+        """Waits until the current run is done, failing it if no worker is
+        connected for connection_timeout."""
+        with self.__condition:
+            while not self.__is_done():
+                if self.__num_connected > 0:
+                    self.__condition.wait()
+                    continue
+                remaining = (
+                    self.__idle_since + self.connection_timeout - time.monotonic()
+                )
+                if remaining <= 0:
+                    self.__error = (
+                        "No worker connected to the coordinator for "
+                        f"{self.connection_timeout} seconds"
+                    )
+                    self.__condition.notify_all()
+                else:
+                    self.__condition.wait(remaining)
+
+    def serve_worker(self, connection: socket.socket) -> None:
+        """Serves the requests of a worker until the tournament is done."""
+        with self.__condition:
+            self.__num_workers += 1
+            worker = self.__num_workers
+        # A worker which does not answer is disconnected and its batch handed out
+        connection.settimeout(self.worker_timeout)
+        file = connection.makefile("rwb")
+        batch = None
+        connected = False
+        try:
+            hello = receive_message(file)
+            if hello is None or hello.get("config") != self.config:
+                send_message(
+                    file, {"type": "error", "message": "Configuration mismatch"}
+                )
+                return
+            connected = True
+            self.__connect(True)
+            while True:
+                assigned = self.__next_batch(worker)
+                if assigned is None:
+                    send_message(file, {"type": "done"})
+                    return
+                batch, pairs = assigned
+                send_message(file, {"type": "pairs", "batch": batch, "pairs": pairs})
+                start = time.perf_counter()
+                message = receive_message(file)
+                if message is None:
+                    break
+                if self.metrics is not None:
+                    self.metrics.record_busy(
+                        f"worker{worker}", time.perf_counter() - start
+                    )
+                self.__complete_batch(worker, batch, message["results"])
+                batch = None
+        except (OSError, ValueError, KeyError):
+            pass
+        finally:
+            if batch is not None:
+                self.__fail_batch(worker, batch)
+            if connected:
+                self.__connect(False)
+            file.close()
+
+    def start(self) -> "TournamentCoordinator":
+        """Starts listening to the workers, if the coordinator does not yet."""
+        if self.__server is None:
+            self.__server = CoordinatorServer(self.address, WorkerHandler)
+            self.__server.coordinator = self
+            self.address = (self.address[0], self.__server.server_address[1])
+            threading.Thread(target=self.__server.serve_forever, daemon=True).start()
+        return self
+
+    def close(self) -> None:
+        """Tells the workers that the tournament is done and stops listening."""
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+
+    def run(self, pairs: List[Pair]) -> List[Optional[Dict[str, Any]]]:
+        """Run the negociations of a list of pairs on the workers which connect
+        to the coordinator, until all of them are done
+        :return: the result of each pair, None if no agreement was found"""
+        if self.__closed:
+            raise ValueError("The coordinator is closed")
+        with self.__condition:
+            self.__batches = {
+                self.__num_batches + index: pairs[start : start + self.batch_size]
+                for index, start in enumerate(range(0, len(pairs), self.batch_size))
+            }
+            self.__num_batches += len(self.__batches)
+            self.__pending = deque(self.__batches)
+            self.__running, self.__failures, self.__results = {}, {}, {}
+            self.__error = None
+            if self.__num_connected == 0:
+                self.__idle_since = time.monotonic()
+            self.__condition.notify_all()
+        self.start()
+        self.__wait_for_results()
+        with self.__condition:
+            if self.__error is not None:
+                raise ValueError(self.__error)
+            return [
+                result
+                for batch in sorted(self.__batches)
+                for result in self.__results[batch]
+            ]
+
+
+class WorkerHandler(socketserver.BaseRequestHandler):
+    """Handler of the connection of a worker to a coordinator"""
+
+    def handle(self):
+        self.server.coordinator.serve_worker(self.request)  # type: ignore
+
+
+class CoordinatorServer(socketserver.ThreadingTCPServer):
+    """TCP server of a coordinator, serving each worker in a thread"""
+
+    allow_reuse_address = True
+    daemon_threads = True
+    coordinator: TournamentCoordinator
+
+
+def run_pairs_distributed(
+    argument_model: ArgumentModel,
+    pairs: List[Pair],
+    coordinator: TournamentCoordinator,
+) -> List[Optional[Dict[str, Any]]]:
+    """Run the negociations of a list of pairs on the workers of a coordinator
+    :return: the result of each pair, None if no agreement was found, the
+    arguments of the results being their description"""
+    return [
+        None if result is None else deserialize_result(result, argument_model.items)
+        for result in coordinator.run(pairs)
+    ]
+
+
+def run_worker(
+    argument_model: ArgumentModel,
+    address: Address,
+    tournament_config: Dict[str, Any],
+    connection_timeout: float = 60.0,
+) -> int:
+    """Run the negociations handed out by a coordinator until its tournament
+    is done
+    :param connection_timeout: the time to wait for the coordinator to listen
+    :return: the number of negociated pairs"""
+    deadline = time.monotonic() + connection_timeout
+    while True:
+        try:
+            connection = socket.create_connection(address)
+            break
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.5)
+
+    num_pairs = 0
+    with connection, connection.makefile("rwb") as file:
+        send_message(file, {"type": "hello", "config": tournament_config})
+        message = receive_message(file)
+        while message is not None and message["type"] == "pairs":
+            results = [
+                argument_model.run_discussion_between(
+                    agent_1,
+                    agent_2,
+                    argument_model.max_num_steps,
+                    get_pair_seed(argument_model.seed, agent_1, agent_2),
+                )
+                for agent_1, agent_2 in message["pairs"]
+            ]
+            num_pairs += len(results)
+            send_message(
+                file,
+                {
+                    "type": "results",
+                    "batch": message["batch"],
+                    "results": [
+                        None if result is None else serialize_result(result)
+                        for result in results
+                    ],
+                },
+            )
+            message = receive_message(file)
+    if message is not None and message["type"] == "error":
+        raise ValueError(message["message"])
+    return num_pairs
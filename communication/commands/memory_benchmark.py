@@ -0,0 +1,222 @@
+"""Memory benchmark"""
+import gc
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, List, Tuple
+
+from communication.argumentation.argument_agent import ArgumentAgent
+from communication.argumentation.argument_model import ArgumentModel
+from communication.argumentation.preferences_generator import (
+    generate_random_preferences,
+    load_preferences,
+    save_preferences,
+)
+from communication.argumentation.run_config import RunConfig
+from communication.commands.pairs_visualizer import visualize_pairs_negociations
+from communication.preferences.criterion_name import CriterionName
+from communication.preferences.item import Item
+
+# Measured operations, with the number of agents their retained memory is
+# divided by (the population, or the pair of agents negociating)
+BENCHMARKS = ["load_preferences", "agents", "negociation", "tournament"]
+
+# Relative margin above the baseline tolerated before a regression is reported
+TOLERANCE = 0.2
+
+# A point of the sweep: the number of agents and the number of items
+Point = Tuple[int, int]
+
+
+def measure_memory(function: Callable[[], Any]) -> Tuple[Any, Dict[str, int]]:
+    """Calls a function while tracing the memory allocations
+    :return: its result and the memory it allocated at the peak and which is
+    still allocated once it returned (its result included), in bytes"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, {"peak": peak, "retained": retained}
+
+
+def negociate(argument_model: ArgumentModel, agent_1: int, agent_2: int) -> Any:
+    """Run a negociation between two agents without releasing them
+    :return: the agents, whose mailboxes hold the history of the negociation"""
+    argument_model.setup_discussion_between(agent_1, agent_2)
+    for _ in range(argument_model.max_num_steps):
+        chosen_item, _ = argument_model.step()
+        if chosen_item is not None:
+            break
+    return list(argument_model.all_agents)
+
+
+def benchmark_point(
+    task: Tuple[Point, List[CriterionName], RunConfig]
+) -> Dict[str, Dict[str, int]]:
+    """Measure the memory of the operations of a population of random agents
+    in a new process (the message service of its model can only be created
+    once per process)
+    :return: the peak and retained memory of each operation"""
+    (num_agents, num_items), criteria, run_config = task
+    random.seed(f"{num_agents}:{num_items}")
+    items = [Item(f"Item{index}") for index in range(num_items)]
+    report = {}
+    with tempfile.TemporaryDirectory() as folder, open(
+        os.devnull, "w", encoding="utf-8"
+    ) as devnull, redirect_stdout(devnull):
+        paths = [
+            os.path.join(folder, f"p{agent_id}.csv")
+            for agent_id in range(1, num_agents + 1)
+        ]
+        for path in paths:
+            save_preferences(generate_random_preferences(items, criteria), items, path)
+        argument_model = ArgumentModel(
+            2, items, criteria, folder, run_config=run_config
+        )
+
+        profiles, report["load_preferences"] = measure_memory(
+            lambda: [load_preferences(path) for path in paths]
+        )
+        agents, report["agents"] = measure_memory(
+            lambda: [
+                ArgumentAgent(
+                    agent_id,
+                    argument_model,
+                    f"Agent{agent_id}",
+                    items,
+                    preferences,
+                    argument_model.concession_strategy,
+                )
+                for agent_id, preferences in enumerate(profiles, 1)
+            ]
+        )
+        del agents
+        _, report["negociation"] = measure_memory(
+            lambda: negociate(argument_model, 1, 2)
+        )
+        argument_model.release_agents()
+        _, report["tournament"] = measure_memory(
+            lambda: visualize_pairs_negociations(
+                argument_model, num_agents, results_plot="none"
+            )
+        )
+    return report
+
+
+def run_memory_benchmark(
+    argument_model: ArgumentModel,
+    populations: List[int],
+    catalogs: List[int],
+) -> Dict[Point, Dict[str, Dict[str, int]]]:
+    """Measure the memory used to load the preferences of random agents, to
+    create the agents, to run a negociation between two of them and a whole
+    tournament, for each population and each catalog size
+    :return: the peak and retained memory of each operation of each point"""
+    points = [
+        (num_agents, num_items) for num_agents in populations for num_items in catalogs
+    ]
+    if any(num_agents < 2 or num_items < 1 for num_agents, num_items in points):
+        raise ValueError("The populations must have two agents and one item at least")
+    # The negociations are seeded so that the measures can be compared
+    run_config = (argument_model.run_config or RunConfig()).replace(seed=0)
+    # Each point is measured in a new process, which starts from the same memory
+    with multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+        reports = pool.map(
+            benchmark_point,
+            [(point, argument_model.criteria, run_config) for point in points],
+            chunksize=1,
+        )
+    return dict(zip(points, reports))
+
+
+def get_bytes_per_agent(point: Point, benchmark: str, measure: Dict[str, int]) -> float:
+    """Returns the retained memory of an operation per agent involved"""
+    num_agents = 2 if benchmark == "negociation" else point[0]
+    return measure["retained"] / num_agents
+
+
+def build_baseline(
+    report: Dict[Point, Dict[str, Dict[str, int]]]
+) -> Dict[str, Dict[str, float]]:
+    """Returns the retained bytes per agent of each operation of each point"""
+    return {
+        benchmark: {
+            f"{num_agents}x{num_items}": get_bytes_per_agent(
+                (num_agents, num_items), benchmark, measures[benchmark]
+            )
+            for (num_agents, num_items), measures in report.items()
+        }
+        for benchmark in BENCHMARKS
+    }
+
+
+def check_memory_baseline(
+    report: Dict[Point, Dict[str, Dict[str, int]]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float = TOLERANCE,
+) -> List[str]:
+    """Compares the retained bytes per agent with a baseline (the points
+    missing from the baseline are not compared)
+    :return: the description of the regressions"""
+    regressions = []
+    for benchmark, points in build_baseline(report).items():
+        for point, bytes_per_agent in points.items():
+            expected = baseline.get(benchmark, {}).get(point)
+            if expected is not None and bytes_per_agent > expected * (1 + tolerance):
+                regressions.append(
+                    f"{benchmark} {point}: {bytes_per_agent:.0f} bytes per agent "
+                    f"instead of {expected:.0f}"
+                )
+    return regressions
+
+
+def print_memory_benchmark(report: Dict[Point, Dict[str, Dict[str, int]]]) -> None:
+    """To print the peak and retained memory of each operation of each point"""
+    print("\nMEMORY:")
+    print(
+        f"{'agents':>6} {'items':>5} {'operation':<16} {'peak (kB)':>10} "
+        f"{'retained (kB)':>14} {'bytes/agent':>12}"
+    )
+    for point, measures in report.items():
+        for benchmark in BENCHMARKS:
+            measure = measures[benchmark]
+            print(
+                f"{point[0]:>6} {point[1]:>5} {benchmark:<16} "
+                f"{measure['peak'] / 1024:>10.1f} {measure['retained'] / 1024:>14.1f} "
+                f"{get_bytes_per_agent(point, benchmark, measure):>12.0f}"
+            )
+
+
+def run_memory_gate(
+    argument_model: ArgumentModel,
+    populations: List[int],
+    catalogs: List[int],
+    baseline_path: str,
+    update: bool = False,
+) -> None:  # pylint: disable=too-many-arguments
+    """Run the memory benchmark and compare it with the baseline stored in a
+    JSON file, or store it as the new baseline
+    :param update: if True, the baseline is replaced by the measures"""
+    report = run_memory_benchmark(argument_model, populations, catalogs)
+    print_memory_benchmark(report)
+    if update:
+        os.makedirs(os.path.dirname(baseline_path) or ".", exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as file:
+            json.dump(build_baseline(report), file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"Baseline saved in {baseline_path}")
+        return
+    with open(baseline_path, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+    regressions = check_memory_baseline(report, baseline)
+    if regressions:
+        raise ValueError("Memory regressions:\n" + "\n".join(regressions))
+    print(f"No regression above {TOLERANCE:.0%} of the baseline")
@@ -0,0 +1,114 @@
+"""Metrics server"""
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+from communication.argumentation.tournament_metrics import TournamentMetrics
+
+
+def dump_metrics(metrics: TournamentMetrics, path: str) -> None:
+    """Write a snapshot of the metrics to a JSON file, atomically so that the
+    file can be read at any time"""
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(metrics.snapshot(), file, indent=2)
+    os.replace(temporary_path, path)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Handler of the requests of the metrics server"""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Answers the snapshot of the metrics in JSON on /metrics."""
+        if self.path.split("?")[0] not in ["/", "/metrics"]:
+            self.send_error(404)
+            return
+        body = json.dumps(self.server.metrics.snapshot()).encode()  # type: ignore
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Does not log the requests, the negociations being printed."""
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """HTTP server of the metrics of a tournament"""
+
+    daemon_threads = True
+    metrics: TournamentMetrics
+
+
+class MetricsReporter:
+    """MetricsReporter class.
+    This class exposes the metrics of a tournament while it runs: over HTTP
+    on localhost (GET /metrics) and in a JSON file rewritten periodically and
+    when the reporter is closed. Nothing is reported without metrics.
+
+    attr:
+        metrics: the metrics of the tournament
+        port: the port of the HTTP server, None for no server
+        path: the path of the JSON file, None for no file
+        interval: the number of seconds between two writes of the file
+    """
+
+    def __init__(
+        self,
+        metrics: Optional[TournamentMetrics],
+        port: Optional[int] = None,
+        path: Optional[str] = None,
+        interval: float = 10.0,
+    ):
+        """Creates a new reporter, which is not started."""
+        self.metrics = metrics
+        self.port = port
+        self.path = path
+        self.interval = interval
+        self.__server: Optional[MetricsServer] = None
+        self.__stopped = threading.Event()
+        self.__threads: List[threading.Thread] = []
+
+    def __enter__(self) -> "MetricsReporter":
+        return self.start()
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __dump_periodically(self) -> None:
+        while not self.__stopped.wait(self.interval):
+            dump_metrics(self.metrics, self.path)  # type: ignore
+
+    def start(self) -> "MetricsReporter":
+        """Starts the HTTP server and the periodic writes of the file."""
+        if self.metrics is None:
+            return self
+        if self.port is not None:
+            self.__server = MetricsServer(("127.0.0.1", self.port), MetricsHandler)
+            self.__server.metrics = self.metrics
+            self.__threads.append(
+                threading.Thread(target=self.__server.serve_forever, daemon=True)
+            )
+        if self.path is not None:
+            self.__threads.append(
+                threading.Thread(target=self.__dump_periodically, daemon=True)
+            )
+        for thread in self.__threads:
+            thread.start()
+        return self
+
+    def close(self) -> None:
+        """Stops the reporter, writing the final metrics to the file."""
+        self.__stopped.set()
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+        for thread in self.__threads:
+            thread.join()
+        self.__threads = []
+        if self.metrics is not None and self.path is not None:
+            dump_metrics(self.metrics, self.path)
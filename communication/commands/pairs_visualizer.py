@@ -1,16 +1,39 @@
 # pylint: disable=import-error
 """Pairs visualizer"""
-from itertools import combinations
-from typing import Any, Dict, List
+import os
+from itertools import combinations, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from communication import config
-from communication.argumentation.argument_model import ArgumentModel
+from communication.argumentation.agreement_predictor import AgreementPredictor
+from communication.argumentation.argument_model import ArgumentModel, get_pair_seed
+from communication.argumentation.batch_engine import run_pairs_batched
+from communication.argumentation.social_choice import SocialChoiceBaselines
+from communication.commands.checkpoint import TournamentCheckpoint
+from communication.commands.distributed_pairs import (
+    TournamentCoordinator,
+    run_pairs_distributed,
+)
+from communication.commands.parallel_pairs import run_pairs_parallel
+from communication.commands.results_store import ResultsStore
+from communication.commands.social_choice_report import (
+    build_baselines_report,
+    print_baselines_report,
+)
+from communication.commands.tournament_stream import iter_chunks, split_chunk
+from communication.visualization.plot_outcome_matrix import (
+    build_outcome_matrix,
+    plot_outcome_matrix,
+)
 from communication.visualization.plot_preferences import plot_agents_preferences
 from communication.visualization.plot_result_graph import plot_pair_result_graph
 
 
-def print_results(results: List[Dict[str, Any]]) -> None:
-    """To print the results of a simulation"""
+def print_results(
+    results: Iterable[Dict[str, Any]], item_win_counts: Optional[Dict[str, int]] = None
+) -> None:
+    """To print the results of a simulation
+    :param item_win_counts: if given, the scores of the items, which are not
+    counted from the results"""
     scores: Dict[str, int] = {}
     print("\nRESULTS:")
     for result in results:
@@ -20,40 +43,272 @@ def print_results(results: List[Dict[str, Any]]) -> None:
             f"ARGS: {'; '.join([str(arg) for arg in result['arguments']])}",
             "\n",
         )
-        scores[result["chosen_item"].name] = (
-            scores.get(result["chosen_item"].name, 0) + 1
-        )
+        if item_win_counts is None:
+            scores[result["chosen_item"].name] = (
+                scores.get(result["chosen_item"].name, 0) + 1
+            )
+    if item_win_counts is not None:
+        scores = item_win_counts
     print("\nSCORES:")
     for item, score in sorted(scores.items(), key=lambda x: x[1], reverse=True):
         print(f"{item}: {score}")
 
 
-def visualize_pairs_negociations(argument_model: ArgumentModel, num_agents: int):
-    """Visualize pairs negociation"""
-    results = []
-    for agent_1, agent_2 in combinations(list(range(1, num_agents + 1)), 2):
+def run_simulated_pairs(
+    argument_model: ArgumentModel,
+    pairs: List[Tuple[int, int]],
+    batch: bool = False,
+    num_workers: int = 1,
+    coordinator: Optional[TournamentCoordinator] = None,
+) -> Dict[Tuple[int, int], Optional[Dict[str, Any]]]:
+    """Run the negociations of several pairs at once: on the workers of a
+    coordinator, with the batch engine, in several processes or concurrently
+    in the model
+    :return: the result of each pair, None if no agreement was found"""
+    if not pairs:
+        return {}
+    if coordinator is not None:
+        results = run_pairs_distributed(argument_model, pairs, coordinator)
+    elif batch:
+        results = run_pairs_batched(argument_model, pairs)
+    elif num_workers > 1:
+        results = run_pairs_parallel(argument_model, pairs, num_workers)
+    else:
+        if argument_model.seed is not None:
+            argument_model.reset_randomizer(argument_model.seed)
+        results = argument_model.run_discussions(pairs)
+    return dict(zip(pairs, results))
+
 
+def negociate_chunk(
+    argument_model: ArgumentModel,
+    chunk: List[Tuple[int, int]],
+    known_results: Dict[Tuple[int, int], Optional[Dict[str, Any]]],
+) -> Iterator[Dict[str, Any]]:
+    """Run the negociations of a chunk of pairs one by one, unless their
+    result is already known (predicted or computed with the other pairs of the
+    chunk)
+    :return: the results of the pairs which found an agreement"""
+    for agent_1, agent_2 in chunk:
         print(f"\nNEGOCIATION BETWEEN {agent_1} AND {agent_2}:")
-        argument_model.setup_discussion_between(agent_1, agent_2)
-
-        for _ in range(config.MAX_NUM_STEPS):
-            chosen_item, leading_agent = argument_model.step()
-            if chosen_item is not None:
-                results.append(
-                    {
-                        "winning_agent": leading_agent.unique_id,
-                        "losing_agent": agent_1
-                        if agent_1 != leading_agent.unique_id
-                        else agent_2,
-                        "chosen_item": chosen_item,
-                        "arguments": leading_agent.list_supporting_proposal(
-                            chosen_item
-                        ),
-                    }
+        if (agent_1, agent_2) in known_results:
+            result = known_results[(agent_1, agent_2)]
+        else:
+            result = argument_model.run_discussion_between(
+                agent_1,
+                agent_2,
+                argument_model.max_num_steps,
+                get_pair_seed(argument_model.seed, agent_1, agent_2),
+            )
+        if result is not None:
+            yield result
+
+
+def resume_results(
+    argument_model: ArgumentModel,
+    checkpoint: Optional[TournamentCheckpoint],
+    results_store: Optional[ResultsStore] = None,
+) -> List[Dict[str, Any]]:
+    """Restore the state of a tournament from its checkpoint: the random
+    generator of the model and the outcomes of the completed pairs (none
+    without checkpoint, the outcomes of a previous run being deleted from
+    the store)
+    :return: the outcomes kept in memory (empty if they are stored)"""
+    if checkpoint is not None:
+        checkpoint.restore_random_state(argument_model.random)
+    if results_store is not None:
+        results_store.truncate(checkpoint.num_stored if checkpoint is not None else 0)
+        return []
+    return checkpoint.restored_results(argument_model.items) if checkpoint else []
+
+
+def save_checkpoint(
+    argument_model: ArgumentModel,
+    checkpoint: TournamentCheckpoint,
+    next_pair: int,
+    results: List[Dict[str, Any]],
+    results_store: Optional[ResultsStore] = None,
+) -> None:
+    """Save a snapshot of a tournament before one of its pairs"""
+    if results_store is not None:
+        results_store.flush()
+    checkpoint.save(
+        next_pair,
+        argument_model.random,
+        results,
+        len(results_store) if results_store is not None else 0,
+    )
+
+
+def iter_results(
+    argument_model: ArgumentModel,
+    results: List[Dict[str, Any]],
+    results_store: Optional[ResultsStore] = None,
+) -> Iterable[Dict[str, Any]]:
+    """Returns the results of a tournament: those kept in memory, or those of
+    the results store, read lazily, if one is given"""
+    if results_store is None:
+        return results
+    return iter_stored_results(argument_model, results_store)
+
+
+def iter_stored_results(
+    argument_model: ArgumentModel, results_store: ResultsStore
+) -> Iterator[Dict[str, Any]]:
+    """Iterates over the results of a results store, the chosen item being an
+    item of the model"""
+    items = {item.name: item for item in argument_model.items}
+    for result in results_store.iter_results():
+        yield dict(result, chosen_item=items[result["chosen_item"]])
+
+
+def plot_results(
+    argument_model: ArgumentModel,
+    num_agents: int,
+    results: Iterable[Dict[str, Any]],
+    results_plot: str = "graph",
+    plots_folder: Optional[str] = None,
+) -> None:  # pylint: disable=too-many-arguments
+    """Plot the preferences of the agents and the results of their negociations
+    :param results_plot: "graph" (winning graph), "matrix" (outcome matrix,
+    for large populations) or "none" (nothing is plotted)
+    :param plots_folder: if given, the plots are saved in this folder instead
+    of being shown"""
+    if results_plot == "none":
+        return
+    agent_ids = list(range(1, num_agents + 1))
+    item_names = [item.name for item in argument_model.items]
+    argument_model.summarize_agents(agent_ids)
+    plot_agents_preferences(
+        {agent_id: argument_model.agents_history[agent_id] for agent_id in agent_ids},
+        item_names,
+        None
+        if plots_folder is None
+        else os.path.join(plots_folder, "agents_preferences.png"),
+    )
+
+    if results_plot == "matrix":
+        plot_outcome_matrix(
+            build_outcome_matrix(results, agent_ids, item_names),
+            agent_ids,
+            item_names,
+            clustered=True,
+            path=None
+            if plots_folder is None
+            else os.path.join(plots_folder, "outcome_matrix.png"),
+        )
+    else:
+        plot_pair_result_graph(
+            argument_model.agents_history,
+            results,
+            None
+            if plots_folder is None
+            else os.path.join(plots_folder, "result_graph.png"),
+        )
+
+
+def visualize_pairs_negociations(
+    argument_model: ArgumentModel,
+    num_agents: int,
+    results_store: Optional[ResultsStore] = None,
+    predict_agreements: bool = False,
+    concurrent: bool = False,
+    batch: bool = False,
+    num_workers: int = 1,
+    results_plot: str = "graph",
+    plots_folder: Optional[str] = None,
+    checkpoint: Optional[TournamentCheckpoint] = None,
+    coordinator: Optional[TournamentCoordinator] = None,
+    baselines: bool = False,
+):  # pylint: disable=too-many-locals,too-many-arguments
+    """Visualize pairs negociation
+    :param results_store: if given, the results are streamed to this store
+    instead of being kept in memory (replacing the results it holds, unless
+    the tournament resumes from a checkpoint)
+    :param predict_agreements: if True, the pairs agreeing on the first proposal
+    are resolved without simulating their negociation
+    :param concurrent: if True, the negociations are run concurrently in the
+    model, as conversations of the same agents
+    :param batch: if True, the negociations are run by the batch engine
+    :param num_workers: number of processes running the negociations
+    :param results_plot: plot of the results, "graph", "matrix" or "none" (no plot)
+    :param plots_folder: if given, the plots are saved in this folder instead
+    of being shown
+    :param checkpoint: if given, the progress of the tournament is saved
+    periodically to this checkpoint, and the tournament resumes from it (the
+    parallel modes running the pairs between two checkpoints at once)
+    :param coordinator: if given, the negociations are run by the workers
+    connected to this coordinator
+    :param baselines: if True, the results are compared with the items chosen
+    by social choice rules"""
+    predictor = (
+        AgreementPredictor.from_model(argument_model, list(range(1, num_agents + 1)))
+        if predict_agreements
+        else None
+    )
+    num_pairs = num_agents * (num_agents - 1) // 2
+    first_pair = checkpoint.next_pair if checkpoint is not None else 0
+    results = resume_results(argument_model, checkpoint, results_store)
+    parallel = concurrent or batch or num_workers > 1 or coordinator is not None
+    # The pairs are run by chunks between two checkpoints, the parallel modes
+    # running the pairs of a chunk at once (all the pairs without checkpoints)
+    chunks = iter_chunks(
+        islice(combinations(range(1, num_agents + 1), 2), first_pair, None),
+        checkpoint.every
+        if checkpoint is not None
+        else max(1, num_pairs if parallel else 1),
+    )
+
+    next_pair = first_pair
+    for chunk in chunks:
+        if checkpoint is not None and checkpoint.is_due(next_pair):
+            save_checkpoint(
+                argument_model, checkpoint, next_pair, results, results_store
+            )
+        # Each pair is predicted once, the others being simulated
+        predicted_results, simulated_pairs = split_chunk(
+            argument_model, chunk, predictor
+        )
+        known_results: Dict[Tuple[int, int], Optional[Dict[str, Any]]] = dict(
+            predicted_results
+        )
+        if parallel:
+            known_results.update(
+                run_simulated_pairs(
+                    argument_model, simulated_pairs, batch, num_workers, coordinator
                 )
-                break
+            )
+        next_pair += len(chunk)
 
-    print_results(results)
-    plot_agents_preferences(argument_model.agents_history)
+        for result in negociate_chunk(argument_model, chunk, known_results):
+            if results_store is None:
+                results.append(result)
+            else:
+                results_store.append(result)
 
-    plot_pair_result_graph(argument_model.agents_history, results)
+    if checkpoint is not None:
+        save_checkpoint(argument_model, checkpoint, num_pairs, results, results_store)
+    if results_store is not None:
+        results_store.flush()
+
+    # The stored results are streamed from the store by each report
+    print_results(
+        iter_results(argument_model, results, results_store),
+        results_store.item_win_counts() if results_store is not None else None,
+    )
+    if baselines:
+        print_baselines_report(
+            build_baselines_report(
+                SocialChoiceBaselines.from_model(
+                    argument_model, list(range(1, num_agents + 1))
+                ),
+                iter_results(argument_model, results, results_store),
+            )
+        )
+    plot_results(
+        argument_model,
+        num_agents,
+        iter_results(argument_model, results, results_store),
+        results_plot,
+        plots_folder,
+    )
@@ -0,0 +1,112 @@
+"""Parallel negociations"""
+import multiprocessing
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from communication.argumentation.argument_model import ArgumentModel, get_pair_seed
+from communication.argumentation.concession import ConcessionStrategy
+from communication.argumentation.run_config import RunConfig
+from communication.preferences.criterion_name import CriterionName
+from communication.preferences.item import Item
+from communication.preferences.shared_preferences import SharedPopulation
+
+Pair = Tuple[int, int]
+
+# Model of a worker process (the message service can only be created once per process)
+WORKER_MODEL: Optional[ArgumentModel] = None
+
+
+def init_worker(  # pylint: disable=too-many-arguments
+    population: Optional[SharedPopulation],
+    items: List[Item],
+    criteria: List[CriterionName],
+    preferences_folder: str,
+    concession_strategy: ConcessionStrategy,
+    seed: Optional[int],
+    run_config: Optional[RunConfig],
+) -> None:
+    """Creates the model of a worker process, its agents reading their
+    preferences from the shared population (if any, else from their files)"""
+    global WORKER_MODEL  # pylint: disable=global-statement
+    WORKER_MODEL = ArgumentModel(
+        2,
+        items,
+        criteria,
+        preferences_folder,
+        concession_strategy,
+        seed,
+        population,
+        run_config,
+    )
+
+
+def run_pair(pair: Pair) -> Optional[Dict[str, Any]]:
+    """Run the negociation of a pair in a worker process"""
+    if WORKER_MODEL is None:
+        raise ValueError("The worker was not initialized")
+    agent_1, agent_2 = pair
+    return WORKER_MODEL.run_discussion_between(
+        agent_1,
+        agent_2,
+        WORKER_MODEL.max_num_steps,
+        get_pair_seed(WORKER_MODEL.seed, agent_1, agent_2),
+    )
+
+
+def run_timed_pair(pair: Pair) -> Tuple[Optional[Dict[str, Any]], float, str]:
+    """Run the negociation of a pair in a worker process
+    :return: its result, its wall time and the name of the worker"""
+    start = time.perf_counter()
+    result = run_pair(pair)
+    return result, time.perf_counter() - start, f"process{os.getpid()}"
+
+
+def record_timed_results(
+    argument_model: ArgumentModel,
+    timed_results: List[Tuple[Optional[Dict[str, Any]], float, str]],
+) -> List[Optional[Dict[str, Any]]]:
+    """Count the negociations run by worker processes in the metrics of a model
+    :return: the result of each pair"""
+    if argument_model.metrics is not None:
+        for result, wall_time, worker in timed_results:
+            argument_model.metrics.record_negociation(result, wall_time, worker)
+    return [result for result, _, _ in timed_results]
+
+
+def run_pairs_parallel(
+    argument_model: ArgumentModel,
+    pairs: List[Pair],
+    num_workers: Optional[int] = None,
+    chunksize: int = 16,
+) -> List[Optional[Dict[str, Any]]]:
+    """Run the negociations of a list of pairs in several processes, the
+    preferences of the agents being shared with the workers instead of copied
+    :return: the result of each pair, None if no agreement was found"""
+    agent_ids = sorted({agent_id for pair in pairs for agent_id in pair})
+    with SharedPopulation.from_preferences(
+        agent_ids,
+        [argument_model.load_agent_preferences(agent_id) for agent_id in agent_ids],
+        argument_model.items,
+        argument_model.criteria,
+    ) as population:
+        # The workers are spawned to create their own message service
+        with multiprocessing.get_context("spawn").Pool(
+            num_workers,
+            initializer=init_worker,
+            initargs=(
+                population,
+                argument_model.items,
+                argument_model.criteria,
+                argument_model.preferences_folder,
+                argument_model.concession_strategy,
+                argument_model.seed,
+                argument_model.run_config,
+            ),
+        ) as pool:
+            # The items of the results are unpickled as the items of the catalog
+            if argument_model.metrics is not None:
+                return record_timed_results(
+                    argument_model, pool.map(run_timed_pair, pairs, chunksize)
+                )
+            return pool.map(run_pair, pairs, chunksize)
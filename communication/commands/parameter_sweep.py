@@ -0,0 +1,170 @@
+"""Parameter sweep"""
+import itertools
+import multiprocessing
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from communication.argumentation.argument_model import ArgumentModel, get_pair_seed
+from communication.argumentation.run_config import RunConfig
+from communication.commands import parallel_pairs
+from communication.preferences.shared_preferences import SharedPopulation
+
+Pair = Tuple[int, int]
+
+
+def parse_boolean(value: str) -> bool:
+    """Parse a boolean parameter value (true/false, yes/no or 1/0)"""
+    if value.lower() not in ["true", "false", "yes", "no", "1", "0"]:
+        raise ValueError(f"Invalid boolean {value}")
+    return value.lower() in ["true", "yes", "1"]
+
+
+# Type of the values of each parameter of a run configuration
+PARAMETER_TYPES: Dict[str, Callable[[str], Any]] = {
+    "concession": str,
+    "initial_percentage": int,
+    "acceptance_margin": float,
+    "increase_percentage": int,
+    "max_num_steps": int,
+    "seed": int,
+    "settle_debates": parse_boolean,
+}
+
+
+def parse_grid(specifications: List[str]) -> Dict[str, List[Any]]:
+    """Parse the values of the parameters of a grid
+    :param specifications: strings like "initial_percentage=10,20,30"
+    :return: the values of each parameter"""
+    grid: Dict[str, List[Any]] = {}
+    for specification in specifications:
+        name, _, values = specification.partition("=")
+        if name not in PARAMETER_TYPES or not values:
+            raise ValueError(
+                f"Invalid parameter {specification}, expected name=value,... "
+                f"with name one of {', '.join(PARAMETER_TYPES)}"
+            )
+        grid[name] = [PARAMETER_TYPES[name](value) for value in values.split(",")]
+    return grid
+
+
+def build_grid(base: RunConfig, grid: Dict[str, List[Any]]) -> List[RunConfig]:
+    """Returns the run configurations of all the combinations of the values
+    of a grid, the other parameters being those of a base configuration"""
+    names = list(grid)
+    return [
+        base.replace(**dict(zip(names, values)))
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+
+
+def evaluate_run_config(
+    argument_model: ArgumentModel, run_config: RunConfig, pairs: List[Pair]
+) -> Dict[str, float]:
+    """Run the negociations of a list of pairs with a run configuration and
+    report the number of rounds needed to reach an agreement"""
+    argument_model.configure(run_config)
+    start = time.perf_counter()
+    results = [
+        argument_model.run_discussion_between(
+            agent_1, agent_2, seed=get_pair_seed(run_config.seed, agent_1, agent_2)
+        )
+        for agent_1, agent_2 in pairs
+    ]
+    wall_time = time.perf_counter() - start
+
+    steps = [result["steps"] for result in results if result is not None]
+    messages = [result["messages"] for result in results if result is not None]
+    num_agreements = len(steps)
+    return {
+        "pairs": len(pairs),
+        "agreement_rate": num_agreements / len(pairs) if pairs else 0.0,
+        "mean_steps": sum(steps) / num_agreements if num_agreements else 0.0,
+        "max_steps": max(steps, default=0),
+        "mean_messages": sum(messages) / num_agreements if num_agreements else 0.0,
+        "wall_time": wall_time,
+    }
+
+
+def run_grid_point(task: Tuple[RunConfig, List[Pair]]) -> Dict[str, float]:
+    """Evaluate a run configuration in a worker process"""
+    if parallel_pairs.WORKER_MODEL is None:
+        raise ValueError("The worker was not initialized")
+    run_config, pairs = task
+    return evaluate_run_config(parallel_pairs.WORKER_MODEL, run_config, pairs)
+
+
+def run_parameter_sweep(
+    argument_model: ArgumentModel,
+    num_agents: int,
+    run_configs: List[RunConfig],
+    num_workers: Optional[int] = None,
+) -> List[Tuple[RunConfig, Dict[str, float]]]:
+    """Run the negociations between all pairs of agents for each run
+    configuration, the configurations being evaluated in parallel by several
+    processes (each one with its own model, see parallel_pairs.init_worker)
+    :return: each configuration and its report"""
+    pairs = list(itertools.combinations(range(1, num_agents + 1), 2))
+    if num_workers == 1:
+        initial_parameters = (
+            argument_model.run_config,
+            argument_model.concession_strategy,
+            argument_model.seed,
+            argument_model.max_num_steps,
+            argument_model.settle_debates,
+        )
+        reports = [
+            evaluate_run_config(argument_model, run_config, pairs)
+            for run_config in run_configs
+        ]
+        (
+            argument_model.run_config,
+            argument_model.concession_strategy,
+            argument_model.seed,
+            argument_model.max_num_steps,
+            argument_model.settle_debates,
+        ) = initial_parameters
+        return list(zip(run_configs, reports))
+
+    agent_ids = list(range(1, num_agents + 1))
+    with SharedPopulation.from_preferences(
+        agent_ids,
+        [argument_model.load_agent_preferences(agent_id) for agent_id in agent_ids],
+        argument_model.items,
+        argument_model.criteria,
+    ) as population:
+        with multiprocessing.get_context("spawn").Pool(
+            num_workers,
+            initializer=parallel_pairs.init_worker,
+            initargs=(
+                population,
+                argument_model.items,
+                argument_model.criteria,
+                argument_model.preferences_folder,
+                argument_model.concession_strategy,
+                argument_model.seed,
+                argument_model.run_config,
+            ),
+        ) as pool:
+            reports = pool.map(
+                run_grid_point, [(run_config, pairs) for run_config in run_configs], 1
+            )
+    return list(zip(run_configs, reports))
+
+
+def print_parameter_sweep(sweep: List[Tuple[RunConfig, Dict[str, float]]]) -> None:
+    """To print the rounds to agreement and the wall time of each grid point"""
+    print("\nPARAMETER SWEEP:")
+    print(
+        f"{'concession':<11} {'initial':>7} {'margin':>6} {'increase':>8} "
+        f"{'max':>4} {'settle':>6} {'agreements':>10} {'steps':>8} {'max':>5} "
+        f"{'messages':>9} {'time (s)':>9}"
+    )
+    for run_config, stats in sweep:
+        print(
+            f"{run_config.concession:<11} {run_config.initial_percentage:>7} "
+            f"{run_config.acceptance_margin:>6} {run_config.increase_percentage:>8} "
+            f"{run_config.max_num_steps:>4} {str(run_config.settle_debates):>6} "
+            f"{stats['agreement_rate']:>10.0%} "
+            f"{stats['mean_steps']:>8.2f} {stats['max_steps']:>5} "
+            f"{stats['mean_messages']:>9.2f} {stats['wall_time']:>9.2f}"
+        )
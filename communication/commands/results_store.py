@@ -0,0 +1,124 @@
+"""Results store"""
+import sqlite3
+from typing import Any, Dict, Iterator, Optional
+
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    winner INTEGER NOT NULL,
+    loser INTEGER NOT NULL,
+    item TEXT NOT NULL,
+    steps INTEGER,
+    messages INTEGER,
+    premises TEXT,
+    seed INTEGER
+)
+"""
+
+
+class ResultsStore:
+    """ResultsStore class.
+    Results sink which appends the outcomes of the negociations to a local
+    SQLite database as they are produced, so that a tournament does not keep
+    them in memory and the completed outcomes survive a crash.
+
+    attr:
+        path: the path of the SQLite database
+        commit_every: the number of outcomes buffered before a commit
+    """
+
+    def __init__(self, path: str, commit_every: int = 100):
+        """Opens (or creates) a results store."""
+        self.path = path
+        self.commit_every = commit_every
+        self.__connection = sqlite3.connect(path)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute(RESULTS_SCHEMA)
+        self.__connection.commit()
+        self.__num_pending = 0
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Returns the number of stored outcomes."""
+        return int(
+            self.__connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        )
+
+    def append(self, result: Dict[str, Any]) -> None:
+        """Appends the result of a negociation to the store."""
+        self.__connection.execute(
+            "INSERT INTO results (winner, loser, item, steps, messages, premises, seed) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                result["winning_agent"],
+                result["losing_agent"],
+                result["chosen_item"].name,
+                result.get("steps"),
+                result.get("messages"),
+                "; ".join(str(arg) for arg in result["arguments"]),
+                result.get("seed"),
+            ),
+        )
+        self.__num_pending += 1
+        if self.__num_pending >= self.commit_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commits the buffered outcomes to the database."""
+        self.__connection.commit()
+        self.__num_pending = 0
+
+    def truncate(self, num_results: int) -> None:
+        """Deletes the outcomes appended after the first ones."""
+        self.__connection.execute(
+            "DELETE FROM results WHERE id NOT IN "
+            "(SELECT id FROM results ORDER BY id LIMIT ?)",
+            (num_results,),
+        )
+        self.flush()
+
+    def close(self) -> None:
+        """Commits the buffered outcomes and closes the database."""
+        self.flush()
+        self.__connection.close()
+
+    def iter_results(self) -> Iterator[Dict[str, Any]]:
+        """Iterates over the stored outcomes, the chosen item being its name."""
+        cursor = self.__connection.execute(
+            "SELECT winner, loser, item, steps, messages, premises, seed "
+            "FROM results ORDER BY id"
+        )
+        for winner, loser, item, steps, messages, premises, seed in cursor:
+            yield {
+                "winning_agent": winner,
+                "losing_agent": loser,
+                "chosen_item": item,
+                "steps": steps,
+                "messages": messages,
+                "arguments": premises.split("; ") if premises else [],
+                "seed": seed,
+            }
+
+    def item_win_counts(self) -> Dict[str, int]:
+        """Returns the number of negociations won by each item."""
+        return dict(
+            self.__connection.execute(
+                "SELECT item, COUNT(*) FROM results GROUP BY item"
+            ).fetchall()
+        )
+
+    def agent_win_rates(self, agent_id: Optional[int] = None) -> Dict[int, float]:
+        """Returns the proportion of its negociations won by each agent."""
+        rows = self.__connection.execute(
+            "SELECT agent, SUM(won), COUNT(*) FROM ("
+            "SELECT winner AS agent, 1 AS won FROM results "
+            "UNION ALL SELECT loser AS agent, 0 AS won FROM results"
+            ") WHERE ? IS NULL OR agent = ? GROUP BY agent",
+            (agent_id, agent_id),
+        ).fetchall()
+        return {agent: wins / total for agent, wins, total in rows}
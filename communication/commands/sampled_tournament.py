@@ -0,0 +1,331 @@
+"""Sampled tournaments"""
+import math
+import random
+from itertools import islice
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from communication.argumentation.argument_model import ArgumentModel, get_pair_seed
+from communication.argumentation.matchmaking import MatchmakingIndex
+from communication.commands.results_store import ResultsStore
+
+# Quantile of the normal distribution used for the 95% confidence intervals
+Z_95 = 1.96
+
+Pair = Tuple[int, int]
+
+
+def unrank_pair(index: int, num_agents: int) -> Pair:
+    """Returns the pair of agents (numbered from 1) at a given index in the
+    order of itertools.combinations, without enumerating the previous pairs"""
+    first = (
+        num_agents
+        - 2
+        - (math.isqrt(-8 * index + 4 * num_agents * (num_agents - 1) - 7) - 1) // 2
+    )
+    second = (
+        index
+        + first
+        + 1
+        - num_agents * (num_agents - 1) // 2
+        + (num_agents - first) * (num_agents - first - 1) // 2
+    )
+    return first + 1, second + 1
+
+
+def sample_random_pairs(
+    num_agents: int, num_pairs: int, rng: random.Random
+) -> List[Pair]:
+    """Sample distinct pairs of agents uniformly"""
+    total_pairs = num_agents * (num_agents - 1) // 2
+    return [
+        unrank_pair(index, num_agents)
+        for index in rng.sample(range(total_pairs), min(num_pairs, total_pairs))
+    ]
+
+
+class ItemWinEstimator:
+    """ItemWinEstimator class.
+    This class estimates the proportion of all the pairs of a population won
+    by each item from the outcomes of a sample of pairs, by strata.
+
+    attr:
+        strata: for each stratum, its number of pairs in the population,
+        its number of sampled pairs and the number of sampled pairs won by each item
+    """
+
+    def __init__(self):
+        """Creates a new estimator."""
+        self.strata: Dict[object, Tuple[int, int, Dict[str, int]]] = {}
+
+    def add_stratum(self, stratum: object, num_pairs: int) -> None:
+        """Declares a stratum and its number of pairs in the population."""
+        self.strata[stratum] = (num_pairs, 0, {})
+
+    def add_outcome(self, stratum: object, result: Optional[Dict[str, Any]]) -> None:
+        """Adds the result of a sampled pair (None if no agreement was found)."""
+        num_pairs, num_sampled, wins = self.strata[stratum]
+        if result is not None:
+            item_name = result["chosen_item"].name
+            wins[item_name] = wins.get(item_name, 0) + 1
+        self.strata[stratum] = (num_pairs, num_sampled + 1, wins)
+
+    def estimate(self) -> Dict[str, Dict[str, float]]:
+        """Returns, for each item, its estimated win rate and number of wins
+        (the SCORES of an exhaustive tournament) with their 95% error bars."""
+        total_pairs = sum(num_pairs for num_pairs, _, _ in self.strata.values())
+        total_sampled = sum(num_sampled for _, num_sampled, _ in self.strata.values())
+        items = {item for _, _, wins in self.strata.values() for item in wins}
+        estimates = {}
+        for item in items:
+            pooled_rate = (
+                sum(wins.get(item, 0) for _, _, wins in self.strata.values())
+                / total_sampled
+            )
+            rate, variance = 0.0, 0.0
+            for num_pairs, num_sampled, wins in self.strata.values():
+                if num_sampled == 0:
+                    continue
+                weight = num_pairs / total_pairs
+                stratum_rate = wins.get(item, 0) / num_sampled
+                # The variance of a stratum with a single sampled pair cannot be
+                # estimated from it, the pooled rate of the sample is used instead
+                variance_rate = stratum_rate if num_sampled > 1 else pooled_rate
+                # Finite population correction: the pairs are sampled without replacement
+                correction = (
+                    (num_pairs - num_sampled) / (num_pairs - 1) if num_pairs > 1 else 0
+                )
+                rate += weight * stratum_rate
+                variance += (
+                    weight**2
+                    * variance_rate
+                    * (1 - variance_rate)
+                    / num_sampled
+                    * correction
+                )
+            error = Z_95 * math.sqrt(variance)
+            estimates[item] = {
+                "win_rate": rate,
+                "win_rate_error": error,
+                "score": rate * total_pairs,
+                "score_error": error * total_pairs,
+            }
+        return estimates
+
+
+def run_pairs(
+    argument_model: ArgumentModel,
+    pairs: Sequence[Pair],
+    results_store: Optional[ResultsStore] = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """Run the negociations of a list of pairs
+    :return: the result of each pair, None if no agreement was found"""
+    results: List[Optional[Dict[str, Any]]] = []
+    for agent_1, agent_2 in pairs:
+        print(f"\nNEGOCIATION BETWEEN {agent_1} AND {agent_2}:")
+        result = argument_model.run_discussion_between(
+            agent_1,
+            agent_2,
+            argument_model.max_num_steps,
+            get_pair_seed(argument_model.seed, agent_1, agent_2),
+        )
+        if result is not None and results_store is not None:
+            results_store.append(result)
+        results.append(result)
+    return results
+
+
+def random_tournament(
+    argument_model: ArgumentModel,
+    num_agents: int,
+    num_pairs: int,
+    results_store: Optional[ResultsStore] = None,
+) -> Dict[str, Dict[str, float]]:
+    """Estimate the SCORES of the population from uniformly sampled pairs"""
+    rng = random.Random(argument_model.seed)
+    pairs = sample_random_pairs(num_agents, num_pairs, rng)
+
+    estimator = ItemWinEstimator()
+    estimator.add_stratum(None, num_agents * (num_agents - 1) // 2)
+    for result in run_pairs(argument_model, pairs, results_store):
+        estimator.add_outcome(None, result)
+    return estimator.estimate()
+
+
+def swiss_tournament(
+    argument_model: ArgumentModel,
+    num_agents: int,
+    num_rounds: int,
+    results_store: Optional[ResultsStore] = None,
+) -> Dict[str, Dict[str, float]]:
+    """Estimate the SCORES of the population from a Swiss-system tournament:
+    at each round, agents with the same number of won negociations are paired.
+    The pairs are not sampled uniformly, so the error bars are only indicative."""
+    rng = random.Random(argument_model.seed)
+    agents = list(range(1, num_agents + 1))
+    wins = {agent: 0 for agent in agents}
+    played: Set[Pair] = set()
+
+    estimator = ItemWinEstimator()
+    estimator.add_stratum(None, num_agents * (num_agents - 1) // 2)
+    for _ in range(num_rounds):
+        rng.shuffle(agents)
+        standings = sorted(agents, key=lambda agent: wins[agent], reverse=True)
+        pairs: List[Pair] = []
+        paired: Set[int] = set()
+        for index, agent in enumerate(standings):
+            if agent in paired:
+                continue
+            # The closest agent in the standings that was not already met
+            opponent = next(
+                (
+                    other
+                    for other in islice(standings, index + 1, None)
+                    if other not in paired
+                    and (min(agent, other), max(agent, other)) not in played
+                ),
+                None,
+            )
+            if opponent is None:
+                continue
+            paired.update((agent, opponent))
+            pairs.append((min(agent, opponent), max(agent, opponent)))
+        if len(pairs) == 0:
+            break
+
+        played.update(pairs)
+        for result in run_pairs(argument_model, pairs, results_store):
+            estimator.add_outcome(None, result)
+            if result is not None:
+                wins[result["winning_agent"]] += 1
+    return estimator.estimate()
+
+
+def get_matchmaking_pairs(
+    argument_model: ArgumentModel, num_agents: int, num_partners: int
+) -> List[Pair]:
+    """Pair each agent with the agents whose item scores are the most similar
+    to its own, found with a matchmaking index"""
+    index = MatchmakingIndex.from_model(
+        argument_model, list(range(1, num_agents + 1)), seed=argument_model.seed
+    )
+    pairs: Set[Pair] = set()
+    for agent in index.agent_ids:
+        for partner, _ in index.top_partners(agent, num_partners):
+            pairs.add((min(agent, partner), max(agent, partner)))
+    return sorted(pairs)
+
+
+def matchmaking_tournament(
+    argument_model: ArgumentModel,
+    num_agents: int,
+    num_partners: int,
+    results_store: Optional[ResultsStore] = None,
+) -> Dict[str, Dict[str, float]]:
+    """Estimate the SCORES of the population from the pairs of each agent with
+    its most similar agents, those most likely to agree quickly.
+    The pairs are not sampled uniformly, so the error bars are only indicative."""
+    estimator = ItemWinEstimator()
+    estimator.add_stratum(None, num_agents * (num_agents - 1) // 2)
+    pairs = get_matchmaking_pairs(argument_model, num_agents, num_partners)
+    for result in run_pairs(argument_model, pairs, results_store):
+        estimator.add_outcome(None, result)
+    return estimator.estimate()
+
+
+def get_preference_clusters(
+    argument_model: ArgumentModel, num_agents: int
+) -> Dict[str, List[int]]:
+    """Cluster the agents according to their favourite item"""
+    clusters: Dict[str, List[int]] = {}
+    for agent_id in range(1, num_agents + 1):
+        preferences = argument_model.load_agent_preferences(agent_id)
+        favourite = max(
+            argument_model.items,
+            key=lambda item: item.get_score(preferences),  # type: ignore
+        )
+        clusters.setdefault(favourite.name, []).append(agent_id)
+    return clusters
+
+
+def stratified_tournament(
+    argument_model: ArgumentModel,
+    num_agents: int,
+    num_pairs: int,
+    results_store: Optional[ResultsStore] = None,
+) -> Dict[str, Dict[str, float]]:
+    """Estimate the SCORES of the population from pairs sampled in each couple of
+    preference clusters, proportionally to the number of pairs of the couple"""
+    rng = random.Random(argument_model.seed)
+    clusters = list(get_preference_clusters(argument_model, num_agents).values())
+    total_pairs = num_agents * (num_agents - 1) // 2
+
+    estimator = ItemWinEstimator()
+    for i, members_1 in enumerate(clusters):
+        for j in range(i, len(clusters)):
+            members_2 = clusters[j]
+            if i == j:
+                num_stratum_pairs = len(members_1) * (len(members_1) - 1) // 2
+            else:
+                num_stratum_pairs = len(members_1) * len(members_2)
+            if num_stratum_pairs == 0:
+                continue
+
+            num_sampled = min(
+                num_stratum_pairs,
+                max(1, round(num_pairs * num_stratum_pairs / total_pairs)),
+            )
+            pairs = []
+            for index in rng.sample(range(num_stratum_pairs), num_sampled):
+                if i == j:
+                    first, second = unrank_pair(index, len(members_1))
+                    agent_1, agent_2 = members_1[first - 1], members_1[second - 1]
+                else:
+                    agent_1 = members_1[index // len(members_2)]
+                    agent_2 = members_2[index % len(members_2)]
+                pairs.append((min(agent_1, agent_2), max(agent_1, agent_2)))
+
+            estimator.add_stratum((i, j), num_stratum_pairs)
+            for result in run_pairs(argument_model, pairs, results_store):
+                estimator.add_outcome((i, j), result)
+    return estimator.estimate()
+
+
+def run_sampled_tournament(
+    argument_model: ArgumentModel,
+    tournament: str,
+    num_agents: int,
+    num_pairs: int = 100,
+    num_rounds: int = 5,
+    results_store: Optional[ResultsStore] = None,
+    num_partners: int = 3,
+) -> Dict[str, Dict[str, float]]:  # pylint: disable=too-many-arguments
+    """Estimate the SCORES of the population with a sampled tournament
+    :param tournament: "random", "swiss" (num_rounds rounds), "stratified" or
+    "matchmaking" (each agent against its num_partners most similar agents)
+    :param num_pairs: the number of sampled pairs of the random and stratified
+    tournaments"""
+    if tournament == "random":
+        return random_tournament(argument_model, num_agents, num_pairs, results_store)
+    if tournament == "swiss":
+        return swiss_tournament(argument_model, num_agents, num_rounds, results_store)
+    if tournament == "stratified":
+        return stratified_tournament(
+            argument_model, num_agents, num_pairs, results_store
+        )
+    if tournament == "matchmaking":
+        return matchmaking_tournament(
+            argument_model, num_agents, num_partners, results_store
+        )
+    raise ValueError(f"Unknown tournament {tournament}")
+
+
+def print_estimated_scores(estimates: Dict[str, Dict[str, float]]) -> None:
+    """To print the estimated scores with their 95% error bars"""
+    print("\nESTIMATED SCORES:")
+    for item, estimate in sorted(
+        estimates.items(), key=lambda x: x[1]["score"], reverse=True
+    ):
+        print(
+            f"{item}: {estimate['score']:.1f} ± {estimate['score_error']:.1f} "
+            f"(win rate {estimate['win_rate']:.1%} ± {estimate['win_rate_error']:.1%})"
+        )
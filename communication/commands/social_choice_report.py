@@ -0,0 +1,89 @@
+"""Social choice baselines report"""
+from typing import Any, Dict, Iterable, Optional
+
+from communication.argumentation.social_choice import (
+    PAIR_RULES,
+    SocialChoiceBaselines,
+)
+
+
+def build_baselines_report(
+    baselines: SocialChoiceBaselines,
+    results: Optional[Iterable[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Compare the items chosen by the social choice rules with the results of
+    the negociations, if given
+    :return: the scores of each item (number of pairs choosing it) for the
+    negociations (as the SCORES of print_results) and for each rule, the
+    proportion of the agreements on the item of each rule, and the winners of
+    the population"""
+    scores: Dict[str, Dict[str, int]] = {
+        rule: baselines.item_counts(rule) for rule in PAIR_RULES
+    }
+    matches = {rule: 0 for rule in PAIR_RULES}
+    negociated = {item.name: 0 for item in baselines.items}
+    num_agreements = 0
+    for result in results if results is not None else []:
+        num_agreements += 1
+        negociated[result["chosen_item"].name] += 1
+        for rule in PAIR_RULES:
+            if (
+                baselines.pair_item(
+                    rule, result["winning_agent"], result["losing_agent"]
+                )
+                is result["chosen_item"]
+            ):
+                matches[rule] += 1
+    if results is not None:
+        scores = {"negociated": negociated, **scores}
+
+    return {
+        "scores": scores,
+        "num_agreements": num_agreements,
+        "match_rates": {
+            rule: matches[rule] / num_agreements if num_agreements else 0.0
+            for rule in PAIR_RULES
+        },
+        "borda": {
+            item.name: int(points)
+            for item, points in zip(baselines.items, baselines.borda_scores)
+        },
+        "borda_winner": baselines.borda_winner().name,
+        "condorcet_winner": (
+            baselines.items[baselines.condorcet_winner].name
+            if baselines.condorcet_winner is not None
+            else None
+        ),
+    }
+
+
+def print_baselines_report(report: Dict[str, Any]) -> None:
+    """To print the scores of the items according to the social choice rules
+    next to the scores of the negociations"""
+    print("\nSOCIAL CHOICE BASELINES:")
+    columns = list(report["scores"])
+    print(f"{'item':<10} " + " ".join(f"{column:>11}" for column in columns))
+    first_column = report["scores"][columns[0]]
+    for item in sorted(first_column, key=lambda x: first_column[x], reverse=True):
+        print(
+            f"{item:<10} "
+            + " ".join(f"{report['scores'][column][item]:>11}" for column in columns)
+        )
+    if report["num_agreements"]:
+        print(
+            "Agreements on the item of the rule: "
+            + ", ".join(
+                f"{rule} {rate:.1%}" for rule, rate in report["match_rates"].items()
+            )
+        )
+    print(
+        "Borda count: "
+        + ", ".join(
+            f"{item} {points}"
+            for item, points in sorted(
+                report["borda"].items(), key=lambda x: x[1], reverse=True
+            )
+        )
+    )
+    print(f"Borda winner: {report['borda_winner']}")
+    print(f"Condorcet winner: {report['condorcet_winner'] or 'none'}")
@@ -0,0 +1,456 @@
+"""Stress harness"""
+import csv
+import multiprocessing
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from communication.argumentation.argument_model import ArgumentModel, get_pair_seed
+from communication.argumentation.concession import ConcessionStrategy
+from communication.argumentation.preferences_generator import (
+    load_preferences,
+    save_preferences,
+)
+from communication.argumentation.run_config import RunConfig
+from communication.preferences.criterion_name import CriterionName
+from communication.preferences.criterion_value import CriterionValue
+from communication.preferences.item import Item
+from communication.preferences.preferences import Preferences
+from communication.preferences.value import Value
+
+# A profile: the order of the criteria (indexes in the criteria of the model)
+# and the value of each item on each criterion
+Profile = Tuple[List[int], List[List[int]]]
+
+OBJECTIVES = ["steps", "messages"]
+
+# Summary of the cases saved in a fixtures folder
+CASES_FILE = "cases.csv"
+CASES_FIELDS = [
+    "case",
+    "seed",
+    "objective",
+    "agreement",
+    "steps",
+    "messages",
+    "error",
+]
+
+# Model of a worker process (the message service can only be created once per process)
+STRESS_MODEL: Optional["ProfileModel"] = None
+
+
+class ProfileModel(ArgumentModel):
+    """ProfileModel class.
+    This class implements a model whose two agents, 1 and 2, use preferences
+    given in memory instead of reading them from files.
+
+    attr:
+        profiles: the preferences of each agent
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Creates a new model (see ArgumentModel)."""
+        super().__init__(*args, **kwargs)
+        self.profiles: Dict[int, Preferences] = {}
+
+    def load_agent_preferences(self, agent_id: int) -> Preferences:
+        """Returns the preferences given to an agent"""
+        return self.profiles[agent_id]
+
+
+def random_profile(num_items: int, num_criteria: int, rng: random.Random) -> Profile:
+    """Draw a profile uniformly"""
+    order = list(range(num_criteria))
+    rng.shuffle(order)
+    values = [
+        [rng.choice(list(Value)).value for _ in range(num_criteria)]
+        for _ in range(num_items)
+    ]
+    return order, values
+
+
+def mutate_profile(profile: Profile, rng: random.Random) -> Profile:
+    """Returns a neighbour of a profile: one value changed, or two adjacent
+    criteria swapped in the order"""
+    order, values = list(profile[0]), [list(row) for row in profile[1]]
+    if rng.random() < 0.25 and len(order) > 1:
+        rank = rng.randrange(len(order) - 1)
+        order[rank], order[rank + 1] = order[rank + 1], order[rank]
+    else:
+        item = rng.randrange(len(values))
+        criterion = rng.randrange(len(order))
+        values[item][criterion] = rng.choice(
+            [value.value for value in Value if value.value != values[item][criterion]]
+        )
+    return order, values
+
+
+def build_preferences(
+    profile: Profile, items: List[Item], criteria: List[CriterionName]
+) -> Preferences:
+    """Build the preferences of a profile"""
+    order, values = profile
+    preferences = Preferences()
+    preferences.set_criterion_name_list([criteria[index] for index in order])
+    for item, row in zip(items, values):
+        for criterion, value in zip(criteria, row):
+            preferences.add_criterion_value(
+                CriterionValue(item, criterion, Value(value))
+            )
+    return preferences
+
+
+def init_stress_worker(
+    items: List[Item],
+    criteria: List[CriterionName],
+    concession_strategy: ConcessionStrategy,
+    run_config: Optional[RunConfig],
+) -> None:
+    """Creates the model of a worker process"""
+    global STRESS_MODEL  # pylint: disable=global-statement
+    STRESS_MODEL = ProfileModel(
+        2,
+        items,
+        criteria,
+        "",
+        concession_strategy,
+        run_config=run_config,
+    )
+
+
+def measure_negociation(
+    preferences_1: Preferences, preferences_2: Preferences, seed: Optional[int]
+) -> Dict[str, Any]:
+    """Run the negociation between two profiles in a worker process
+    :return: whether an agreement was found, the error raised by the agents if
+    any, the number of steps (the maximum number of steps without agreement),
+    of messages (None without agreement) and the wall time of the negociation"""
+    if STRESS_MODEL is None:
+        raise ValueError("The worker was not initialized")
+    STRESS_MODEL.profiles = {1: preferences_1, 2: preferences_2}
+    start = time.perf_counter()
+    try:
+        result = STRESS_MODEL.run_discussion_between(1, 2, seed=seed)
+    except ValueError as error:
+        # A failure of the protocol is the worst case the harness can find
+        return {
+            "agreement": False,
+            "error": str(error),
+            "steps": None,
+            "messages": None,
+            "wall_time": time.perf_counter() - start,
+        }
+    return {
+        "agreement": result is not None,
+        "error": None,
+        "steps": result["steps"] if result is not None else STRESS_MODEL.max_num_steps,
+        "messages": result["messages"] if result is not None else None,
+        "wall_time": time.perf_counter() - start,
+    }
+
+
+def get_score(measure: Dict[str, Any], objective: str) -> Tuple[bool, bool, int]:
+    """Returns the score of a negociation, the negociations failing then the
+    ones without agreement being the worst ones"""
+    return (
+        measure["error"] is not None,
+        not measure["agreement"],
+        measure[objective] or 0,
+    )
+
+
+def is_regression(saved: Dict[str, Any], measure: Dict[str, Any]) -> bool:
+    """Returns whether a negociation got worse than its saved measure: it
+    fails or does not reach an agreement anymore, or needs more steps or
+    messages"""
+    if measure["error"] is not None:
+        return saved["error"] is None
+    if not saved["agreement"] or not measure["agreement"]:
+        return bool(saved["agreement"])
+    return bool(
+        measure["steps"] > saved["steps"] or measure["messages"] > saved["messages"]
+    )
+
+
+def climb(task: Tuple[int, int, int, str, Optional[int]]) -> Dict[str, Any]:
+    """Search the longest negociation in a worker process: the best of random
+    pairs of profiles, then improved by hill-climbing (a neighbour as long as
+    the current one is accepted, to cross plateaus)
+    :return: the profiles of the case, its measure and its seed"""
+    if STRESS_MODEL is None:
+        raise ValueError("The worker was not initialized")
+    chain_seed, num_random, num_iterations, objective, seed = task
+    rng = random.Random(chain_seed)
+    items, criteria = STRESS_MODEL.items, STRESS_MODEL.criteria
+
+    def evaluate(profiles: Tuple[Profile, Profile]) -> Dict[str, Any]:
+        return measure_negociation(
+            build_preferences(profiles[0], items, criteria),
+            build_preferences(profiles[1], items, criteria),
+            seed,
+        )
+
+    def draw() -> Tuple[Profile, Profile]:
+        return (
+            random_profile(len(items), len(criteria), rng),
+            random_profile(len(items), len(criteria), rng),
+        )
+
+    best_profiles = draw()
+    best = evaluate(best_profiles)
+    for _ in range(num_random - 1):
+        profiles = draw()
+        measure = evaluate(profiles)
+        if get_score(measure, objective) > get_score(best, objective):
+            best_profiles, best = profiles, measure
+
+    for _ in range(num_iterations):
+        agent = rng.randrange(2)
+        profiles = (
+            mutate_profile(best_profiles[0], rng) if agent == 0 else best_profiles[0],
+            mutate_profile(best_profiles[1], rng) if agent == 1 else best_profiles[1],
+        )
+        measure = evaluate(profiles)
+        if get_score(measure, objective) >= get_score(best, objective):
+            best_profiles, best = profiles, measure
+    return {"profiles": best_profiles, "measure": best, "seed": seed}
+
+
+def new_stress_pool(argument_model: ArgumentModel, num_workers: int) -> Any:
+    """Creates the pool of processes running the negociations of the harness,
+    each one with its own model"""
+    return multiprocessing.get_context("spawn").Pool(
+        num_workers,
+        initializer=init_stress_worker,
+        initargs=(
+            argument_model.items,
+            argument_model.criteria,
+            argument_model.concession_strategy,
+            argument_model.run_config,
+        ),
+    )
+
+
+def search_worst_cases(
+    argument_model: ArgumentModel,
+    num_cases: int = 4,
+    num_random: int = 50,
+    num_iterations: int = 100,
+    objective: str = "steps",
+    num_workers: int = 1,
+) -> List[Dict[str, Any]]:  # pylint: disable=too-many-arguments
+    """Search the pairs of profiles whose negociation is the longest, with the
+    items, the criteria and the concession strategy of a model. Each case is
+    searched independently (random search followed by hill-climbing).
+    :param objective: "steps" or "messages", the length to maximize
+    :return: the cases found, the longest first"""
+    if objective not in OBJECTIVES:
+        raise ValueError(
+            f"Unknown objective {objective}, expected one of {', '.join(OBJECTIVES)}"
+        )
+    seed = get_pair_seed(
+        argument_model.seed if argument_model.seed is not None else 0, 1, 2
+    )
+    rng = random.Random(argument_model.seed)
+    tasks = [
+        (rng.getrandbits(32), num_random, num_iterations, objective, seed)
+        for _ in range(num_cases)
+    ]
+    with new_stress_pool(argument_model, num_workers) as pool:
+        cases = pool.map(climb, tasks, 1)
+    return sorted(
+        cases,
+        key=lambda case: get_score(case["measure"], objective),
+        reverse=True,
+    )
+
+
+def save_stress_cases(
+    argument_model: ArgumentModel,
+    cases: List[Dict[str, Any]],
+    folder: str,
+    objective: str = "steps",
+) -> List[str]:
+    """Save cases as regression fixtures: the preferences of each case in the
+    files p1.csv and p2.csv of its folder, and its measure in cases.csv,
+    after the cases already saved in the folder
+    :return: the names of the new cases"""
+    os.makedirs(folder, exist_ok=True)
+    cases_path = os.path.join(folder, CASES_FILE)
+    first_case = len(read_stress_cases(folder))
+    names = []
+    with open(cases_path, "a", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=CASES_FIELDS, lineterminator="\n")
+        if first_case == 0:
+            writer.writeheader()
+        for index, case in enumerate(cases, first_case):
+            name = f"case{index}"
+            os.makedirs(os.path.join(folder, name), exist_ok=True)
+            for agent_id, profile in enumerate(case["profiles"], 1):
+                save_preferences(
+                    build_preferences(
+                        profile, argument_model.items, argument_model.criteria
+                    ),
+                    argument_model.items,
+                    os.path.join(folder, name, f"p{agent_id}.csv"),
+                )
+            writer.writerow(
+                {
+                    "case": name,
+                    "seed": case["seed"],
+                    "objective": objective,
+                    "agreement": int(case["measure"]["agreement"]),
+                    "steps": case["measure"]["steps"],
+                    "messages": case["measure"]["messages"],
+                    "error": case["measure"]["error"],
+                }
+            )
+            names.append(name)
+    return names
+
+
+def read_stress_cases(folder: str) -> List[Dict[str, str]]:
+    """Read the cases saved in a fixtures folder"""
+    cases_path = os.path.join(folder, CASES_FILE)
+    if not os.path.exists(cases_path):
+        return []
+    with open(cases_path, "r", encoding="utf-8", newline="") as file:
+        return list(csv.DictReader(file))
+
+
+def replay_case(task: Tuple[str, str, Optional[int]]) -> Dict[str, Any]:
+    """Run the negociation of a saved case in a worker process"""
+    path_1, path_2, seed = task
+    return measure_negociation(load_preferences(path_1), load_preferences(path_2), seed)
+
+
+def check_stress_cases(
+    argument_model: ArgumentModel,
+    folder: str,
+    num_workers: int = 1,
+    max_wall_time: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Run again the negociations of the cases saved in a fixtures folder and
+    compare them with their saved measure (see is_regression)
+    :param max_wall_time: if given, the cases taking more seconds are slow
+    :return: the saved and the new measure of each case"""
+    cases = read_stress_cases(folder)
+    tasks = [
+        (
+            os.path.join(folder, case["case"], "p1.csv"),
+            os.path.join(folder, case["case"], "p2.csv"),
+            int(case["seed"]) if case["seed"] else None,
+        )
+        for case in cases
+    ]
+    with new_stress_pool(argument_model, num_workers) as pool:
+        measures = pool.map(replay_case, tasks, 1)
+
+    report = []
+    for case, measure in zip(cases, measures):
+        saved = {
+            "agreement": case["agreement"] == "1",
+            "error": case["error"] or None,
+            "steps": int(case["steps"]) if case["steps"] else None,
+            "messages": int(case["messages"]) if case["messages"] else None,
+        }
+        report.append(
+            {
+                "case": case["case"],
+                "saved": saved,
+                "measure": measure,
+                "regression": is_regression(saved, measure),
+                "slow": max_wall_time is not None
+                and measure["wall_time"] > max_wall_time,
+            }
+        )
+    return report
+
+
+def describe_measure(measure: Dict[str, Any]) -> str:
+    """Describe the measure of a negociation in one line"""
+    if measure["error"] is not None:
+        return f"ERROR ({measure['error']})"
+    return (
+        f"{'agreement' if measure['agreement'] else 'NO AGREEMENT'} in "
+        f"{measure['steps']} steps, {measure['messages']} messages"
+    )
+
+
+def check_stress_report(report: List[Dict[str, Any]]) -> List[str]:
+    """Lists the checked cases which got longer or slow
+    :return: the description of the regressions"""
+    return [
+        f"{case['case']}: {describe_measure(case['measure'])} "
+        f"(saved: {describe_measure(case['saved'])})"
+        + (" REGRESSION" if case["regression"] else "")
+        + (
+            f" SLOW ({case['measure']['wall_time'] * 1000:.1f} ms)"
+            if case["slow"]
+            else ""
+        )
+        for case in report
+        if case["regression"] or case["slow"]
+    ]
+
+
+def print_stress_cases(cases: List[Dict[str, Any]], names: List[str]) -> None:
+    """To print the cases found by the harness"""
+    print("\nSTRESS CASES:")
+    for name, case in zip(names, cases):
+        measure = case["measure"]
+        print(
+            f"{name}: {describe_measure(measure)}, "
+            f"{measure['wall_time'] * 1000:.1f} ms"
+        )
+
+
+def print_stress_check(report: List[Dict[str, Any]]) -> None:
+    """To print the comparison of the cases with their saved measure"""
+    print("\nSTRESS CHECK:")
+    for case in report:
+        print(
+            f"{case['case']}: {describe_measure(case['measure'])} "
+            f"(saved: {describe_measure(case['saved'])}), "
+            f"{case['measure']['wall_time'] * 1000:.1f} ms"
+            + (" REGRESSION" if case["regression"] else "")
+            + (" SLOW" if case["slow"] else "")
+        )
+    wall_times = [case["measure"]["wall_time"] for case in report]
+    print(
+        f"{sum(case['regression'] for case in report)} regressions, "
+        f"{sum(case['slow'] for case in report)} slow, "
+        f"worst wall time {max(wall_times, default=0) * 1000:.1f} ms"
+    )
+
+
+def run_stress_harness(  # pylint: disable=too-many-arguments
+    argument_model: ArgumentModel,
+    folder: str,
+    check: bool = False,
+    objective: str = "steps",
+    num_iterations: int = 100,
+    num_workers: int = 1,
+    max_wall_time: Optional[float] = None,
+) -> None:
+    """Search the longest negociations and save them as fixtures in a folder,
+    or check the fixtures of a folder, failing if some of them got longer or
+    slow"""
+    if check:
+        report = check_stress_cases(argument_model, folder, num_workers, max_wall_time)
+        print_stress_check(report)
+        regressions = check_stress_report(report)
+        if regressions:
+            raise ValueError("Stress regressions:\n" + "\n".join(regressions))
+        return
+    cases = search_worst_cases(
+        argument_model,
+        num_iterations=num_iterations,
+        objective=objective,
+        num_workers=num_workers,
+    )
+    print_stress_cases(
+        cases, save_stress_cases(argument_model, cases, folder, objective)
+    )
@@ -0,0 +1,257 @@
+"""Streamed tournaments"""
+import asyncio
+import itertools
+import multiprocessing
+import threading
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from communication.argumentation.agreement_predictor import AgreementPredictor
+from communication.argumentation.argument_model import ArgumentModel, get_pair_seed
+from communication.argumentation.batch_engine import run_pairs_batched
+from communication.commands import parallel_pairs
+
+Pair = Tuple[int, int]
+Outcome = Tuple[Pair, Optional[Dict[str, Any]]]
+
+T = TypeVar("T")
+
+# Delay after which a producer waiting for room in the queue checks if the
+# consumer stopped, in seconds
+STOP_POLL_INTERVAL = 0.1
+
+
+def iter_chunks(iterable: Iterable[T], chunk_size: int) -> Iterator[List[T]]:
+    """Split an iterable, possibly infinite, into lists of chunk_size elements
+    (the last one may be shorter), consuming it lazily"""
+    if chunk_size < 1:
+        raise ValueError("The size of the chunks must be positive")
+    iterator = iter(iterable)
+    chunk = list(itertools.islice(iterator, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(iterator, chunk_size))
+
+
+def run_pairs_chunk(
+    pairs: List[Pair],
+) -> List[Tuple[Optional[Dict[str, Any]], float, str]]:
+    """Run the negociations of a chunk of pairs in a worker process
+    :return: the result, the wall time and the worker of each pair"""
+    return [parallel_pairs.run_timed_pair(pair) for pair in pairs]
+
+
+def merge_predicted(
+    chunk: List[Pair],
+    predicted: Dict[Pair, Dict[str, Any]],
+    simulated: List[Optional[Dict[str, Any]]],
+) -> Iterator[Outcome]:
+    """Yields the outcome of each pair of a chunk in order, from its predicted
+    result or else from the results of the simulated pairs"""
+    num_simulated = 0
+    for pair in chunk:
+        if pair in predicted:
+            yield pair, predicted[pair]
+        else:
+            yield pair, simulated[num_simulated]
+            num_simulated += 1
+
+
+def split_predicted(
+    chunk: List[Pair], predictor: Optional[AgreementPredictor]
+) -> Tuple[Dict[Pair, Dict[str, Any]], List[Pair]]:
+    """Resolve the pairs of a chunk which agree on the first proposal
+    :return: the predicted results and the pairs to simulate"""
+    predicted = {}
+    for pair in chunk if predictor is not None else []:
+        result = predictor.predict(*pair)  # type: ignore
+        if result is not None:
+            predicted[pair] = result
+    return predicted, [pair for pair in chunk if pair not in predicted]
+
+
+def split_chunk(
+    argument_model: ArgumentModel,
+    chunk: List[Pair],
+    predictor: Optional[AgreementPredictor],
+) -> Tuple[Dict[Pair, Dict[str, Any]], List[Pair]]:
+    """Resolve the pairs of a chunk which agree on the first proposal, counting
+    them in the metrics of the model
+    :return: the predicted results and the pairs to simulate"""
+    predicted, simulated = split_predicted(chunk, predictor)
+    if argument_model.metrics is not None:
+        argument_model.metrics.record_negociations(predicted.values())
+    return predicted, simulated
+
+
+def iter_parallel_outcomes(
+    argument_model: ArgumentModel,
+    chunks: Iterator[List[Pair]],
+    predictor: Optional[AgreementPredictor],
+    num_workers: int,
+    max_pending_chunks: int,
+) -> Iterator[Outcome]:
+    """Yields the outcomes of chunks of pairs run by a pool of processes, at
+    most max_pending_chunks chunks being submitted before their outcomes are
+    consumed"""
+    # The workers read the preferences files, the agents of the pairs being unknown
+    with multiprocessing.get_context("spawn").Pool(
+        num_workers,
+        initializer=parallel_pairs.init_worker,
+        initargs=(
+            None,
+            argument_model.items,
+            argument_model.criteria,
+            argument_model.preferences_folder,
+            argument_model.concession_strategy,
+            argument_model.seed,
+            argument_model.run_config,
+        ),
+    ) as pool:
+        pending: Deque[Tuple[List[Pair], Dict[Pair, Dict[str, Any]], Any]] = deque()
+        for chunk in chunks:
+            predicted, simulated = split_chunk(argument_model, chunk, predictor)
+            pending.append(
+                (chunk, predicted, pool.apply_async(run_pairs_chunk, (simulated,)))
+            )
+            if len(pending) >= max_pending_chunks:
+                chunk, predicted, results = pending.popleft()
+                yield from merge_predicted(
+                    chunk,
+                    predicted,
+                    parallel_pairs.record_timed_results(argument_model, results.get()),
+                )
+        while pending:
+            chunk, predicted, results = pending.popleft()
+            yield from merge_predicted(
+                chunk,
+                predicted,
+                parallel_pairs.record_timed_results(argument_model, results.get()),
+            )
+
+
+def iter_tournament(  # pylint: disable=too-many-arguments
+    argument_model: ArgumentModel,
+    pairs: Iterable[Pair],
+    predictor: Optional[AgreementPredictor] = None,
+    batch: bool = False,
+    num_workers: int = 1,
+    chunk_size: int = 64,
+    max_pending_chunks: Optional[int] = None,
+) -> Generator[Outcome, None, None]:
+    """Run the negociations of a source of pairs, which is consumed lazily and
+    may be a generator, and yield the outcome of each pair as soon as it is
+    known, in the order of the pairs. The negociations are only run as the
+    outcomes are consumed (at most a few chunks ahead), so that a slow consumer
+    holds the tournament back, and closing the iterator stops the tournament.
+    :param predictor: if given, the pairs agreeing on the first proposal are
+    resolved without simulating their negociation
+    :param batch: if True, the chunks of pairs are run by the batch engine
+    :param num_workers: number of processes running the chunks of pairs
+    :param chunk_size: the number of pairs taken from the source at once by the
+    batch engine and the processes (the model runs the pairs one by one)
+    :param max_pending_chunks: the number of chunks submitted to the processes
+    ahead of the consumer, by default twice the number of processes
+    :return: each pair and its result, None if no agreement was found"""
+    if num_workers > 1:
+        yield from iter_parallel_outcomes(
+            argument_model,
+            iter_chunks(pairs, chunk_size),
+            predictor,
+            num_workers,
+            max_pending_chunks if max_pending_chunks is not None else 2 * num_workers,
+        )
+        return
+
+    for chunk in iter_chunks(pairs, chunk_size if batch else 1):
+        predicted, simulated = split_chunk(argument_model, chunk, predictor)
+        if batch and simulated:
+            results = run_pairs_batched(argument_model, simulated)
+        else:
+            results = [
+                argument_model.run_discussion_between(
+                    agent_1,
+                    agent_2,
+                    seed=get_pair_seed(argument_model.seed, agent_1, agent_2),
+                )
+                for agent_1, agent_2 in simulated
+            ]
+        yield from merge_predicted(chunk, predicted, results)
+
+
+def produce_outcomes(
+    outcomes: Generator[Outcome, None, None],
+    put: Callable[[Tuple[str, Any]], None],
+    room: threading.Semaphore,
+    stopped: threading.Event,
+) -> None:
+    """Run a tournament in a thread, each outcome waiting for room in the
+    queue of the consumer until it stops"""
+    try:
+        for outcome in outcomes:
+            while not room.acquire(  # pylint: disable=consider-using-with
+                timeout=STOP_POLL_INTERVAL
+            ):
+                if stopped.is_set():
+                    return
+            if stopped.is_set():
+                return
+            put(("outcome", outcome))
+        put(("done", None))
+    except Exception as error:  # pylint: disable=broad-except
+        put(("error", error))
+    finally:
+        outcomes.close()
+
+
+async def aiter_tournament(
+    argument_model: ArgumentModel,
+    pairs: Iterable[Pair],
+    max_queue_size: int = 256,
+    **options: Any,
+) -> AsyncIterator[Outcome]:
+    """Asynchronous version of iter_tournament: the tournament runs in a thread
+    while the event loop consumes its outcomes, at most max_queue_size outcomes
+    waiting to be consumed (the tournament pauses when the queue is full).
+    Leaving the iteration early stops the tournament.
+    :param options: the options of iter_tournament"""
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue[Tuple[str, Any]]" = asyncio.Queue()
+    room = threading.Semaphore(max_queue_size)
+    stopped = threading.Event()
+    producer = threading.Thread(
+        target=produce_outcomes,
+        args=(
+            iter_tournament(argument_model, pairs, **options),
+            lambda message: loop.call_soon_threadsafe(queue.put_nowait, message),
+            room,
+            stopped,
+        ),
+        daemon=True,
+    )
+    producer.start()
+    try:
+        while True:
+            kind, payload = await queue.get()
+            if kind == "done":
+                break
+            if kind == "error":
+                raise payload
+            room.release()
+            yield payload
+    finally:
+        stopped.set()
+        await loop.run_in_executor(None, producer.join)
@@ -1,24 +1,27 @@
 import os
 
-from communication.preferences.item import Item
+from communication.preferences.item import ITEM_CATALOG
 
 # PERCENTAGES OF PREFERENCES
 INITIAL_PERCENTAGE = 10
 INCREASE_PERCENTAGE = 20
+# Margin applied to the percentage when accepting an argued item
+ACCEPTANCE_MARGIN = 1.2
+# Default concession strategy (see communication.argumentation.concession)
+CONCESSION_STRATEGY = "linear"
+# Whether the agents stop arguing about an argument whose status in their
+# argumentation framework is settled (see ArgumentationFramework)
+SETTLE_DEBATES = False
 
-CAR_ITEMS = [
-    Item("E", "The nice electric car"),
-    Item("ICED", "The great diesel car"),
-    Item("HYBRID", "The super hybrid car"),
-]
+# Catalogs of the items of each mode (name and description columns), relative
+# to the repository so that the items are loaded whatever the working directory
+ITEMS_FOLDER = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "items"
+)
 
-PRESIDENTIAL_ITEMS = [
-    Item("MANIOC", "Center"),
-    Item("MELON", "Far-Left"),
-    Item("ZEBRA", "Far-Right"),
-    Item("JASMIN", "Left"),
-    Item("PECANS", "Right"),
-]
+CAR_ITEMS = ITEM_CATALOG.load(os.path.join(ITEMS_FOLDER, "cars.csv"))
+
+PRESIDENTIAL_ITEMS = ITEM_CATALOG.load(os.path.join(ITEMS_FOLDER, "presidential.csv"))
 
 ITEM_COLORS = {
     "MELON": "red",
@@ -35,3 +38,5 @@ CARS_PREFERENCES_FOLDER = os.path.join("data", "preferences", "cars")
 PRESIDENTIAL_PREFERENCES_FOLDER = os.path.join("data", "preferences", "presidential")
 
 MAX_NUM_STEPS = 100
+
+MEMORY_BASELINE = os.path.join("data", "benchmarks", "memory.json")
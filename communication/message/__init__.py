@@ -1,3 +1,4 @@
 from communication.message.message import *
+from communication.message.message_codec import *
 from communication.message.message_performative import *
 from communication.message.message_service import *
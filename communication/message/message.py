@@ -1,5 +1,5 @@
 """Message class."""
-from typing import Union
+from typing import Optional, Union
 
 from communication.arguments.argument import Argument
 from communication.message.message_performative import MessagePerformative
@@ -17,6 +17,8 @@ class Message:
         to_agent: the receiver of the message (id)
         message_performative: the performative of the message
         content: the content of the message
+        conversation_id: the id of the conversation of the message (None for
+        the default conversation)
     """
 
     def __init__(
@@ -25,12 +27,14 @@ class Message:
         to_agent: str,
         message_performative: MessagePerformative,
         content: Union[Argument, Item, str],
-    ):
+        conversation_id: Optional[int] = None,
+    ):  # pylint: disable=too-many-arguments
         """Create a new message."""
         self.__from_agent = from_agent
         self.__to_agent = to_agent
         self.__message_performative = message_performative
         self.__content = content
+        self.__conversation_id = conversation_id
 
     def __str__(self):
         """Return Message as a String."""
@@ -63,3 +67,8 @@ class Message:
     def content(self) -> Union[Argument, Item, str]:
         """Return the content of the message."""
         return self.__content
+
+    @property
+    def conversation_id(self) -> Optional[int]:
+        """Return the id of the conversation of the message."""
+        return self.__conversation_id
@@ -0,0 +1,296 @@
+"""Message codec"""
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from communication.arguments.argument import Argument
+from communication.arguments.comparison import Comparison
+from communication.arguments.couple_value import CoupleValue
+from communication.message.message import Message
+from communication.message.message_performative import MessagePerformative
+from communication.preferences.bundle import Bundle
+from communication.preferences.criterion_name import CriterionName
+from communication.preferences.item import Item
+from communication.preferences.value import Value
+
+PERFORMATIVES = {
+    performative.value: performative for performative in MessagePerformative
+}
+VALUES = {value.value: value for value in Value}
+
+
+class ContentKind(Enum):
+    """ContentKind enum class.
+    Enumeration containing the possible kinds of content of an encoded message.
+    """
+
+    TEXT = 0
+    ITEM = 1
+    BUNDLE = 2
+    ARGUMENT = 3
+
+
+def write_varint(buffer: bytearray, value: int) -> None:
+    """Writes a non negative integer in as few bytes as possible (7 bits
+    per byte, the high bit marking the bytes followed by another one)"""
+    if value < 0:
+        raise ValueError("Only non negative integers can be encoded")
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    """Reads an integer written by write_varint
+    :return: the integer and the position following it"""
+    value = 0
+    shift = 0
+    while True:
+        if position >= len(data):
+            raise ValueError("Truncated message")
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+class MessageCodec:
+    """MessageCodec class.
+    This class implements a compact binary encoding of the messages, so that
+    they can be sent between processes or hosts without pickling their
+    contents. The agents, the items and the criteria are encoded by their
+    index in the lists the codec is created with, which must be the same on
+    both sides (the ids of the catalog being specific to a process), the
+    values and the performatives by their enum value.
+
+    A message is encoded as the varints of its performative, its sender, its
+    recipient and its conversation id (plus one, 0 for the default
+    conversation), followed by the kind of its content and the content:
+        - a text: its length and its UTF-8 bytes
+        - an item: its index
+        - a bundle: its number of items and their indexes
+        - an argument: its decision, its item (kind and index(es)), its couple
+        values (criterion and value) and its comparisons (best and worst
+        criteria), each list preceded by its length
+    A list of messages is encoded as its length followed by the messages.
+
+    attr:
+        agents: the names of the agents
+        items: the items of the messages
+        criteria: the criteria of the arguments
+    """
+
+    def __init__(
+        self, agents: List[str], items: List[Item], criteria: List[CriterionName]
+    ):
+        """Creates a new codec."""
+        self.agents = agents
+        self.items = items
+        self.criteria = criteria
+        self.__agent_indexes: Dict[str, int] = {
+            agent: index for index, agent in enumerate(agents)
+        }
+        self.__item_indexes: Dict[Item, int] = {
+            item: index for index, item in enumerate(items)
+        }
+        self.__criterion_indexes: Dict[CriterionName, int] = {
+            criterion: index for index, criterion in enumerate(criteria)
+        }
+
+    def encode(self, message: Message) -> bytes:
+        """Encodes a message."""
+        buffer = bytearray()
+        self.__write_message(buffer, message)
+        return bytes(buffer)
+
+    def decode(self, data: bytes) -> Message:
+        """Decodes a message encoded by encode."""
+        message, position = self.__read_message(data, 0)
+        if position != len(data):
+            raise ValueError("Unexpected bytes after the message")
+        return message
+
+    def encode_messages(self, messages: List[Message]) -> bytes:
+        """Encodes a list of messages at once."""
+        buffer = bytearray()
+        write_varint(buffer, len(messages))
+        for message in messages:
+            self.__write_message(buffer, message)
+        return bytes(buffer)
+
+    def decode_messages(self, data: bytes) -> List[Message]:
+        """Decodes a list of messages encoded by encode_messages."""
+        num_messages, position = read_varint(data, 0)
+        messages = []
+        for _ in range(num_messages):
+            message, position = self.__read_message(data, position)
+            messages.append(message)
+        if position != len(data):
+            raise ValueError("Unexpected bytes after the messages")
+        return messages
+
+    @staticmethod
+    def __index(indexes: Dict[Any, int], key: Any, kind: str) -> int:
+        """Returns the index of an agent, an item or a criterion."""
+        index = indexes.get(key)
+        if index is None:
+            raise ValueError(f"Unknown {kind} {key}")
+        return index
+
+    @staticmethod
+    def __get(values: List, index: int, kind: str):
+        """Returns the agent, the item or the criterion of an index."""
+        if index >= len(values):
+            raise ValueError(f"Unknown {kind} index {index}")
+        return values[index]
+
+    def __write_message(self, buffer: bytearray, message: Message) -> None:
+        """Writes a message at the end of a buffer."""
+        write_varint(buffer, message.performative.value)
+        write_varint(
+            buffer, self.__index(self.__agent_indexes, message.sender, "agent")
+        )
+        write_varint(
+            buffer, self.__index(self.__agent_indexes, message.recipient, "agent")
+        )
+        write_varint(
+            buffer,
+            message.conversation_id + 1 if message.conversation_id is not None else 0,
+        )
+        content = message.content
+        if isinstance(content, Argument):
+            buffer.append(ContentKind.ARGUMENT.value)
+            self.__write_argument(buffer, content)
+        elif isinstance(content, Item):
+            self.__write_item(buffer, content)
+        elif isinstance(content, str):
+            buffer.append(ContentKind.TEXT.value)
+            text = content.encode("utf-8")
+            write_varint(buffer, len(text))
+            buffer.extend(text)
+        else:
+            raise ValueError(f"Content {content!r} cannot be encoded")
+
+    def __write_item(self, buffer: bytearray, item: Item) -> None:
+        """Writes the kind and the index(es) of an item or a bundle."""
+        if isinstance(item, Bundle):
+            buffer.append(ContentKind.BUNDLE.value)
+            write_varint(buffer, len(item.items))
+            for item_ in item.items:
+                write_varint(buffer, self.__index(self.__item_indexes, item_, "item"))
+        else:
+            buffer.append(ContentKind.ITEM.value)
+            write_varint(buffer, self.__index(self.__item_indexes, item, "item"))
+
+    def __write_argument(self, buffer: bytearray, argument: Argument) -> None:
+        """Writes an argument and its premises."""
+        buffer.append(int(argument.decision))
+        self.__write_item(buffer, argument.item)
+        write_varint(buffer, len(argument.premises_couple_values))
+        for couple_value in argument.premises_couple_values:
+            write_varint(
+                buffer,
+                self.__index(
+                    self.__criterion_indexes, couple_value.criterion_name, "criterion"
+                ),
+            )
+            write_varint(buffer, couple_value.value.value)
+        write_varint(buffer, len(argument.premises_comparison))
+        for comparison in argument.premises_comparison:
+            for criterion in [
+                comparison.best_criterion_name,
+                comparison.worst_criterion_name,
+            ]:
+                write_varint(
+                    buffer,
+                    self.__index(self.__criterion_indexes, criterion, "criterion"),
+                )
+
+    def __read_message(self, data: bytes, position: int) -> Tuple[Message, int]:
+        """Reads a message from a position
+        :return: the message and the position following it"""
+        code, position = read_varint(data, position)
+        if code not in PERFORMATIVES:
+            raise ValueError(f"Unknown performative {code}")
+        sender, position = read_varint(data, position)
+        recipient, position = read_varint(data, position)
+        conversation_id: Optional[int]
+        conversation_id, position = read_varint(data, position)
+        conversation_id = conversation_id - 1 if conversation_id > 0 else None
+        content: Union[Argument, Item, str]
+        kind, position = self.__read_kind(data, position)
+        if kind == ContentKind.TEXT:
+            length, position = read_varint(data, position)
+            if position + length > len(data):
+                raise ValueError("Truncated message")
+            content = data[position : position + length].decode("utf-8")
+            position += length
+        elif kind == ContentKind.ARGUMENT:
+            content, position = self.__read_argument(data, position)
+        else:
+            content, position = self.__read_item(data, position, kind)
+        return (
+            Message(
+                self.__get(self.agents, sender, "agent"),
+                self.__get(self.agents, recipient, "agent"),
+                PERFORMATIVES[code],
+                content,
+                conversation_id,
+            ),
+            position,
+        )
+
+    @staticmethod
+    def __read_kind(data: bytes, position: int) -> Tuple[ContentKind, int]:
+        """Reads the kind of a content."""
+        if position >= len(data):
+            raise ValueError("Truncated message")
+        try:
+            return ContentKind(data[position]), position + 1
+        except ValueError as error:
+            raise ValueError(f"Unknown content kind {data[position]}") from error
+
+    def __read_item(
+        self, data: bytes, position: int, kind: ContentKind
+    ) -> Tuple[Item, int]:
+        """Reads the index(es) of an item or a bundle of a given kind."""
+        if kind == ContentKind.ITEM:
+            index, position = read_varint(data, position)
+            return self.__get(self.items, index, "item"), position
+        if kind != ContentKind.BUNDLE:
+            raise ValueError(f"Expected an item, got a content of kind {kind.name}")
+        num_items, position = read_varint(data, position)
+        items = []
+        for _ in range(num_items):
+            index, position = read_varint(data, position)
+            items.append(self.__get(self.items, index, "item"))
+        return Bundle(items), position
+
+    def __read_criterion(self, data: bytes, position: int) -> Tuple[CriterionName, int]:
+        """Reads the index of a criterion."""
+        index, position = read_varint(data, position)
+        return self.__get(self.criteria, index, "criterion"), position
+
+    def __read_argument(self, data: bytes, position: int) -> Tuple[Argument, int]:
+        """Reads an argument and its premises."""
+        if position >= len(data):
+            raise ValueError("Truncated message")
+        decision = bool(data[position])
+        kind, position = self.__read_kind(data, position + 1)
+        item, position = self.__read_item(data, position, kind)
+        argument = Argument(decision, item)
+        num_couple_values, position = read_varint(data, position)
+        for _ in range(num_couple_values):
+            criterion, position = self.__read_criterion(data, position)
+            value, position = read_varint(data, position)
+            if value not in VALUES:
+                raise ValueError(f"Unknown value {value}")
+            argument.add_premiss_couple_values(CoupleValue(criterion, VALUES[value]))
+        num_comparisons, position = read_varint(data, position)
+        for _ in range(num_comparisons):
+            best_criterion, position = self.__read_criterion(data, position)
+            worst_criterion, position = self.__read_criterion(data, position)
+            argument.add_premiss_comparison(Comparison(best_criterion, worst_criterion))
+        return argument, position
@@ -1,7 +1,7 @@
 """Message service."""
 
-
 from typing import Any
+from weakref import WeakValueDictionary
 
 
 class MessageService:
@@ -13,6 +13,9 @@ class MessageService:
     attr:
         scheduler: the scheduler of the sma (Scheduler)
         messages_to_proceed: the list of message to proceed mailbox of the agent (list)
+        agents_by_name: cache of the agents found from their name, which does not
+        keep them alive (WeakValueDictionary)
+        metrics: the metrics counting the messages sent by performative, if any
     """
 
     __instance = None
@@ -31,11 +34,17 @@ class MessageService:
         self.__scheduler = scheduler
         self.__instant_delivery = instant_delivery
         self.__messages_to_proceed = []
+        self.__agents_by_name: Any = WeakValueDictionary()
+        self.__metrics: Any = None
 
     def set_instant_delivery(self, instant_delivery):
         """Set the instant delivery parameter."""
         self.__instant_delivery = instant_delivery
 
+    def set_metrics(self, metrics):
+        """Set the metrics counting the messages sent (None to stop counting)."""
+        self.__metrics = metrics
+
     @property
     def messages_to_proceed(self) -> Any:
         """Return the list of message to proceed."""
@@ -44,6 +53,8 @@ class MessageService:
     def send_message(self, message):
         """Dispatch message if instant delivery active,
         otherwise add the message to proceed list."""
+        if self.__metrics is not None:
+            self.__metrics.record_message(message.performative)
         if self.__instant_delivery:
             self.dispatch_message(message)
         else:
@@ -64,7 +75,13 @@ class MessageService:
 
     def find_agent_from_name(self, agent_name):
         """Return the agent according to the agent name given."""
+        agent = self.__agents_by_name.get(agent_name)
+        # The cached agent may have been removed from the scheduler since
+        # pylint: disable=protected-access
+        if agent is not None and self.__scheduler._agents.get(agent.unique_id) is agent:
+            return agent
         for agent in self.__scheduler.agents:
             if agent.name == agent_name:
+                self.__agents_by_name[agent_name] = agent
                 return agent
         return None
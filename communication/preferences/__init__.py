@@ -1,3 +1,4 @@
+from communication.preferences.bundle import *
 from communication.preferences.criterion_name import *
 from communication.preferences.item import *
 from communication.preferences.preferences import *
@@ -0,0 +1,75 @@
+"""Bundle class"""
+from __future__ import annotations
+
+import itertools
+from typing import Iterable, List, Tuple
+from weakref import WeakValueDictionary
+
+from communication.preferences.criterion_name import CriterionName
+from communication.preferences.item import Item
+from communication.preferences.value import Value
+
+BUNDLE_SEPARATOR = " + "
+
+# The bundles in use, by name: a bundle is forgotten once it is no longer used
+BUNDLE_CACHE: WeakValueDictionary[str, Bundle] = WeakValueDictionary()
+# Ids of the bundles, negative so that they are never those of catalog items
+BUNDLE_IDS = itertools.count(-1, -1)
+
+
+class Bundle(Item):
+    """Bundle class.
+    This class implements a combination of items proposed at once, which can
+    be proposed, accepted and committed like any item. A bundle is named
+    after its items and is unique while it is in use, whatever the order in
+    which its items are given, but it is not registered in the catalog (the
+    number of bundles is combinatorial): its id is negative, so that
+    preferences compute its values from those of its items.
+
+    The value of a bundle on a criterion is the best value of its items (the
+    bundle offers what its best item offers) and its score is the sum of the
+    scores of its items (see BundleSpace for interactions between the items).
+
+    attr:
+        items: the items of the bundle, by name
+    """
+
+    __slots__ = ("items", "__weakref__")
+    items: Tuple[Item, ...]
+
+    def __new__(  # pylint: disable=signature-differs
+        cls, items: Iterable[Item]
+    ) -> Bundle:
+        """Returns the bundle of some items, creating it if it is not in use."""
+        sorted_items = tuple(sorted(set(items), key=lambda item: item.name))
+        if len(sorted_items) < 2:
+            raise ValueError("A bundle must contain at least two items")
+        name = BUNDLE_SEPARATOR.join(item.name for item in sorted_items)
+        bundle = BUNDLE_CACHE.get(name)
+        if bundle is None:
+            bundle = object.__new__(Bundle)
+            bundle.id = next(BUNDLE_IDS)
+            bundle.name = name
+            bundle.description = "Bundle of " + ", ".join(
+                item.name for item in sorted_items
+            )
+            bundle.items = sorted_items
+            BUNDLE_CACHE[name] = bundle
+        return bundle
+
+    def __reduce__(self):
+        # The ids are specific to a process: a bundle is sent by its items
+        return (Bundle, (self.items,))
+
+    def get_value(self, preferences, criterion_name: CriterionName) -> Value:
+        """Returns the Value of the Bundle according to agent preferences: the
+        best value of its items."""
+        values: List[Value] = [
+            item.get_value(preferences, criterion_name) for item in self.items
+        ]
+        return max(values, key=lambda value: value.value)
+
+    def get_score(self, preferences):
+        """Returns the score of the Bundle according to agent preferences: the
+        sum of the scores of its items."""
+        return sum(item.get_score(preferences) for item in self.items)
@@ -0,0 +1,110 @@
+"""Copy-on-write preferences"""
+from typing import Dict, List, Tuple
+
+from communication.preferences.bundle import Bundle
+from communication.preferences.criterion_name import CriterionName
+from communication.preferences.criterion_value import CriterionValue
+from communication.preferences.item import Item
+from communication.preferences.preferences import Preferences
+from communication.preferences.value import Value
+
+
+class CopyOnWritePreferences(Preferences):
+    """CopyOnWritePreferences class.
+    This class implements preferences which share a base profile with other
+    agents and only store what differs from it: the values which were set or
+    added, and the order of the criteria once it is changed. The base profile must
+    not be modified while it is shared.
+
+    attr:
+        base: the shared base preferences
+        overridden_values: the values which differ from the base, by item id
+        and criterion id
+    """
+
+    def __init__(self, base: Preferences):
+        """Creates new preferences sharing a base profile."""
+        super().__init__()
+        self.base = base
+        self.overridden_values: Dict[Tuple[int, int], Value] = {}
+        self.__has_own_criteria = False
+
+    def __own_criteria(self) -> None:
+        """Copies the order of the criteria of the base before changing it."""
+        if not self.__has_own_criteria:
+            super().set_criterion_name_list(list(self.base.get_criterion_name_list()))
+            self.__has_own_criteria = True
+
+    def get_criterion_name_list(self) -> List[CriterionName]:
+        """Returns the list of criterion name."""
+        if self.__has_own_criteria:
+            return super().get_criterion_name_list()
+        return self.base.get_criterion_name_list()
+
+    def get_criterion_value_list(self) -> List[CriterionValue]:
+        """Returns a copy of the list of criterion value."""
+        return [
+            CriterionValue(
+                criterion_value.item,
+                criterion_value.get_criterion_name(),
+                self.get_value(
+                    criterion_value.item, criterion_value.get_criterion_name()
+                ),
+            )
+            for criterion_value in self.base.get_criterion_value_list()
+        ] + super().get_criterion_value_list()
+
+    def set_criterion_name_list(self, criterion_name_list: List[CriterionName]) -> None:
+        """Sets the list of criterion name."""
+        super().set_criterion_name_list(criterion_name_list)
+        self.__has_own_criteria = True
+
+    def add_criterion_value(self, criterion_value: CriterionValue) -> None:
+        """Adds a criterion value in the list."""
+        super().add_criterion_value(criterion_value)
+        # As in the list, the first value of a criterion is the one used
+        self.overridden_values.setdefault(
+            (criterion_value.item.id, criterion_value.get_criterion_name().id),
+            criterion_value.value,
+        )
+
+    def get_value(self, item: Item, criterion_name: CriterionName) -> Value:
+        """Gets the value for a given item and a given criterion name."""
+        if self.overridden_values:
+            value = self.overridden_values.get((item.id, criterion_name.id))
+            if value is not None:
+                return value
+        if isinstance(item, Bundle):
+            # The values of the items of the bundle may be overridden
+            return item.get_value(self, criterion_name)
+        return self.base.get_value(item, criterion_name)
+
+    def is_preferred_criterion(
+        self, criterion_name_1: CriterionName, criterion_name_2: CriterionName
+    ) -> bool:
+        """Returns if a criterion 1 is preferred to the criterion 2."""
+        if self.__has_own_criteria:
+            return super().is_preferred_criterion(criterion_name_1, criterion_name_2)
+        return self.base.is_preferred_criterion(criterion_name_1, criterion_name_2)
+
+    def set_criterion_pair(
+        self, less_preferred: CriterionName, more_preferred: CriterionName
+    ) -> None:
+        """To set a criterion pair."""
+        self.__own_criteria()
+        super().set_criterion_pair(less_preferred, more_preferred)
+
+    def set_criterion_value(
+        self, item: Item, criterion_name: CriterionName, item_value: Value
+    ) -> None:
+        """To set a criterion value."""
+        key = (item.id, criterion_name.id)
+        if key not in self.overridden_values:
+            if isinstance(item, Bundle):
+                return
+            try:
+                self.base.get_value(item, criterion_name)
+            except ValueError:
+                return
+        super().set_criterion_value(item, criterion_name, item_value)
+        self.overridden_values[key] = item_value
@@ -1,75 +1,141 @@
 """Criterion Name"""
 from __future__ import annotations
 
-from enum import Enum
-from typing import List
+from typing import ClassVar, Dict, Iterator, List
 
-# class CriterionNameCars(Enum):
-#     """CriterionName enum class.
-#     Enumeration containing the possible CriterionName for cars.
-#     """
 
-#     PRODUCTION_COST = "production_cost"
-#     CONSUMPTION = "consumption"
-#     DURABILITY = "durability"
-#     ENVIRONMENT_IMPACT = "environment_impact"
-#     NOISE = "noise"
+class CriterionName:
+    """CriterionName class.
+    This class implements the criteria of the preferences. The criteria are
+    registered in a CriterionRegistry the first time they are named, for
+    instance in the header of a preferences file, and get a dense integer id,
+    so that the preferences can be stored in arrays indexed by criterion.
+    A criterion is unique: CriterionName("education") is CriterionName.EDUCATION.
 
-#     @staticmethod
-#     def list():
-#         return list(map(lambda c: c, CriterionNameCars))
+    attr:
+        id: the id of the criterion in the registry
+        value: the name of the criterion in the data
+        name: the upper case name of the criterion
+    """
 
+    # Criteria of the presidential mode
+    EDUCATION: ClassVar[CriterionName]
+    LIBERALISM: ClassVar[CriterionName]
+    IMMIGRATION: ClassVar[CriterionName]
+    ENVIRONMENT: ClassVar[CriterionName]
+    SECURITY: ClassVar[CriterionName]
+    WORK: ClassVar[CriterionName]
 
-class CriterionName(Enum):
-    """CriterionName enum class.
-    Enumeration containing the possible CriterionName for presidents.
-    """
+    # Criteria of the cars mode
+    PRODUCTION_COST: ClassVar[CriterionName]
+    CONSUMPTION: ClassVar[CriterionName]
+    DURABILITY: ClassVar[CriterionName]
+    ENVIRONMENT_IMPACT: ClassVar[CriterionName]
+    NOISE: ClassVar[CriterionName]
 
-    EDUCATION = "education"
-    LIBERALISM = "liberalism"
-    IMMIGRATION = "immigration"
-    ENVIRONMENT = "environment"
-    SECURITY = "security"
-    WORK = "work"
+    __slots__ = ("id", "value", "name")
+    id: int
+    value: str
+    name: str
 
-    PRODUCTION_COST = "production_cost"
-    CONSUMPTION = "consumption"
-    DURABILITY = "durability"
-    ENVIRONMENT_IMPACT = "environment_impact"
-    NOISE = "noise"
+    def __new__(cls, value: str) -> CriterionName:
+        """Returns the criterion of a given name, registering it if needed."""
+        return CRITERION_REGISTRY.register(value)
 
     def __str__(self) -> str:
         return self.value
 
+    def __repr__(self) -> str:
+        return f"<CriterionName.{self.name}: {self.id}>"
+
+    def __reduce__(self):
+        # The ids are specific to a process: a criterion is sent by name
+        return (CriterionName, (self.value,))
+
+    @staticmethod
+    def from_id(criterion_id: int) -> CriterionName:
+        """Return the criterion of a given id."""
+        return CRITERION_REGISTRY[criterion_id]
+
     @staticmethod
     def list_presidential() -> List[CriterionName]:
         """Return the list of presidential CriterionName."""
         return [
-            c
-            for c in CriterionName
-            if c.name
-            in [
-                "EDUCATION",
-                "LIBERALISM",
-                "IMMIGRATION",
-                "ENVIRONMENT",
-                "SECURITY",
-                "WORK",
-            ]
+            CriterionName.EDUCATION,
+            CriterionName.LIBERALISM,
+            CriterionName.IMMIGRATION,
+            CriterionName.ENVIRONMENT,
+            CriterionName.SECURITY,
+            CriterionName.WORK,
         ]
 
     @staticmethod
     def list_cars() -> List[CriterionName]:
         """Return the list of the cars CriterionName"""
         return [
-            c
-            for c in CriterionName
-            if c.name
-            in [
-                "PRODUCTION_COST",
-                "CONSUMPTION",
-                "DURABILITY",
-                "ENVIRONMENT_IMPACT",
-                "NOISE",
-            ]
+            CriterionName.PRODUCTION_COST,
+            CriterionName.CONSUMPTION,
+            CriterionName.DURABILITY,
+            CriterionName.ENVIRONMENT_IMPACT,
+            CriterionName.NOISE,
         ]
+
+
+class CriterionRegistry:
+    """CriterionRegistry class.
+    This class assigns dense integer ids, from 0, to the criteria in the order
+    they are registered.
+    """
+
+    def __init__(self):
+        """Creates a new empty registry."""
+        self.__criteria: List[CriterionName] = []
+        self.__by_value: Dict[str, CriterionName] = {}
+
+    def __len__(self) -> int:
+        return len(self.__criteria)
+
+    def __iter__(self) -> Iterator[CriterionName]:
+        return iter(list(self.__criteria))
+
+    def __getitem__(self, criterion_id: int) -> CriterionName:
+        """Returns the criterion of a given id."""
+        return self.__criteria[criterion_id]
+
+    def __contains__(self, value: str) -> bool:
+        return value in self.__by_value
+
+    def register(self, value: str) -> CriterionName:
+        """Returns the criterion of a given name, registering it if needed."""
+        criterion = self.__by_value.get(value)
+        if criterion is None:
+            criterion = object.__new__(CriterionName)
+            criterion.id = len(self.__criteria)
+            criterion.value = value
+            criterion.name = value.upper()
+            self.__criteria.append(criterion)
+            self.__by_value[value] = criterion
+        return criterion
+
+    def register_all(self, values: List[str]) -> List[CriterionName]:
+        """Returns the criteria of a list of names, for instance the header
+        of a preferences file, registering them if needed."""
+        return [self.register(value) for value in values]
+
+
+CRITERION_REGISTRY = CriterionRegistry()
+
+for _value in [
+    "education",
+    "liberalism",
+    "immigration",
+    "environment",
+    "security",
+    "work",
+    "production_cost",
+    "consumption",
+    "durability",
+    "environment_impact",
+    "noise",
+]:
+    setattr(CriterionName, _value.upper(), CRITERION_REGISTRY.register(_value))
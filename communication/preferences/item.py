@@ -1,32 +1,44 @@
 """Item class"""
+from __future__ import annotations
+
+import csv
+from typing import Dict, Iterator, List, Optional
 
 
 class Item:
     """Item class.
     This class implements the objects about which the argument will be conducted.
+    The items are registered in an ItemCatalog the first time they are named
+    and get a dense integer id: an item is unique, so that items are compared
+    by identity and preferences are stored in arrays indexed by item.
 
     attr:
+        id: the id of the item in the catalog
         name: the name of the item
         description: the description of the item
     """
 
-    def __init__(self, name, description):
-        """Creates a new Item."""
-        self.__name = name
-        self.__description = description
+    __slots__ = ("id", "name", "description")
+    id: int
+    name: str
+    description: str
+
+    def __new__(cls, name: str, description: Optional[str] = None) -> Item:
+        """Returns the item of a given name, registering it if needed (the
+        description of an item is the one it was registered with)."""
+        return ITEM_CATALOG.register(name, description)
 
     def __str__(self):
         """Returns Item as a String."""
-        return self.__name + " (" + self.__description + ")"
+        return self.name + " (" + self.description + ")"
 
-    @property
-    def name(self):
-        """Returns the name of the item."""
-        return self.__name
+    def __reduce__(self):
+        # The ids are specific to a process: an item is sent by name
+        return (Item, (self.name, self.description))
 
     def get_description(self):
         """Returns the description of the item."""
-        return self.__description
+        return self.description
 
     def get_value(self, preferences, criterion_name):
         """Returns the Value of the Item according to agent preferences."""
@@ -44,3 +56,58 @@ class Item:
             )
             criterion_weight = criterion_weight / 2
         return sum_result
+
+
+class ItemCatalog:
+    """ItemCatalog class.
+    This class assigns dense integer ids, from 0, to the items in the order
+    they are registered, so that all the agents share the same items.
+    """
+
+    def __init__(self):
+        """Creates a new empty catalog."""
+        self.__items: List[Item] = []
+        self.__by_name: Dict[str, Item] = {}
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(list(self.__items))
+
+    def __getitem__(self, item_id: int) -> Item:
+        """Returns the item of a given id."""
+        return self.__items[item_id]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__by_name
+
+    def get(self, name: str) -> Optional[Item]:
+        """Returns the item of a given name, None if it is not registered."""
+        return self.__by_name.get(name)
+
+    def register(self, name: str, description: Optional[str] = None) -> Item:
+        """Returns the item of a given name, registering it if needed."""
+        item = self.__by_name.get(name)
+        if item is None:
+            item = object.__new__(Item)
+            item.id = len(self.__items)
+            item.name = name
+            item.description = (
+                description if description is not None else f"This is a {name}"
+            )
+            self.__items.append(item)
+            self.__by_name[name] = item
+        return item
+
+    def load(self, path: str) -> List[Item]:
+        """Loads the items of a csv file (with name and description columns),
+        registering them if needed."""
+        with open(path, "r", encoding="utf-8") as file:
+            return [
+                self.register(row["name"], row["description"])
+                for row in csv.DictReader(file)
+            ]
+
+
+ITEM_CATALOG = ItemCatalog()
@@ -2,8 +2,9 @@
 
 
 import random
-from typing import List
+from typing import List, Optional
 
+from communication.preferences.bundle import Bundle
 from communication.preferences.criterion_name import CriterionName
 from communication.preferences.criterion_value import CriterionValue
 from communication.preferences.item import Item
@@ -23,6 +24,10 @@ class Preferences:
         """Creates a new Preferences object."""
         self.__criterion_name_list: List[CriterionName] = []
         self.__criterion_value_list: List[CriterionValue] = []
+        # Criterion values indexed by item id, then by criterion id
+        self.__criterion_values: List[List[Optional[CriterionValue]]] = []
+        # Rank of each criterion, indexed by criterion id (-1 if it is not ranked)
+        self.__criterion_ranks: List[int] = []
 
     def __str__(self):
         """Returns a string representation of the preferences."""
@@ -58,31 +63,67 @@ class Preferences:
     def set_criterion_name_list(self, criterion_name_list: List[CriterionName]) -> None:
         """Sets the list of criterion name."""
         self.__criterion_name_list = criterion_name_list
+        self.__update_criterion_ranks()
+
+    def __update_criterion_ranks(self) -> None:
+        self.__criterion_ranks = [-1] * (
+            max((criterion.id for criterion in self.__criterion_name_list), default=-1)
+            + 1
+        )
+        for rank, criterion in reversed(list(enumerate(self.__criterion_name_list))):
+            self.__criterion_ranks[criterion.id] = rank
+
+    def __get_criterion_rank(self, criterion_name: CriterionName) -> int:
+        if criterion_name.id < len(self.__criterion_ranks):
+            return self.__criterion_ranks[criterion_name.id]
+        return -1
+
+    def __get_indexed_criterion_value(
+        self, item: Item, criterion_name: CriterionName
+    ) -> Optional[CriterionValue]:
+        if not 0 <= item.id < len(self.__criterion_values):
+            return None
+        criterion_values = self.__criterion_values[item.id]
+        if criterion_name.id >= len(criterion_values):
+            return None
+        return criterion_values[criterion_name.id]
 
     def add_criterion_value(self, criterion_value: CriterionValue) -> None:
         """Adds a criterion value in the list."""
+        if isinstance(criterion_value.item, Bundle):
+            raise ValueError("The values of a bundle are those of its items")
         self.__criterion_value_list.append(criterion_value)
+        item_id = criterion_value.item.id
+        criterion_id = criterion_value.get_criterion_name().id
+        if item_id >= len(self.__criterion_values):
+            self.__criterion_values.extend(
+                [] for _ in range(item_id + 1 - len(self.__criterion_values))
+            )
+        criterion_values = self.__criterion_values[item_id]
+        if criterion_id >= len(criterion_values):
+            criterion_values.extend([None] * (criterion_id + 1 - len(criterion_values)))
+        # As in the list, the first value of a criterion is the one used
+        if criterion_values[criterion_id] is None:
+            criterion_values[criterion_id] = criterion_value
 
     def get_value(self, item: Item, criterion_name: CriterionName) -> Value:
         """Gets the value for a given item and a given criterion name."""
-        for criterion_value in self.__criterion_value_list:
-            if (
-                criterion_value.item.name == item.name
-                and criterion_value.get_criterion_name() == criterion_name
-            ):
-                return criterion_value.value
-        raise ValueError("The criterion_name is not in the list of criterion values.")
+        criterion_value = self.__get_indexed_criterion_value(item, criterion_name)
+        if criterion_value is None:
+            if isinstance(item, Bundle):
+                return item.get_value(self, criterion_name)
+            raise ValueError(
+                "The criterion_name is not in the list of criterion values."
+            )
+        return criterion_value.value
 
     def is_preferred_criterion(
         self, criterion_name_1: CriterionName, criterion_name_2: CriterionName
     ) -> bool:
         """Returns if a criterion 1 is preferred to the criterion 2."""
-        for criterion_name in self.__criterion_name_list:
-            if criterion_name == criterion_name_1:
-                return True
-            if criterion_name == criterion_name_2:
-                return False
-        return False
+        rank_1 = self.__get_criterion_rank(criterion_name_1)
+        rank_2 = self.__get_criterion_rank(criterion_name_2)
+        return rank_1 != -1 and (rank_2 == -1 or rank_1 <= rank_2)
 
     def is_preferred_item(self, item_1: Item, item_2: Item) -> bool:
         """Returns if the item 1 is preferred to the item 2."""
@@ -127,25 +168,25 @@ class Preferences:
             if criterion == less_preferred:
                 i_less = i
             if criterion == more_preferred:
-                i_most = i
-        if i_less == -1 or i_most == -1:
-            raise Exception("The criterion pair is not in the list of criterion names.")
-        if i_less < i_most:
+                i_more = i
+        if i_less == -1 or i_more == -1:
+            raise ValueError(
+                "The criterion pair is not in the list of criterion names."
+            )
+        if i_less < i_more:
             self.__criterion_name_list[i_less], self.__criterion_name_list[i_more] = (
                 self.__criterion_name_list[i_more],
                 self.__criterion_name_list[i_less],
             )
+            self.__update_criterion_ranks()
 
     def set_criterion_value(
         self, item: Item, criterion_name: CriterionName, item_value: Value
     ) -> None:
         """To set a criterion value."""
-        for criterion_value in self.__criterion_value_list:
-            if (
-                criterion_value.item.name == item.name
-                and criterion_value.get_criterion_name() == criterion_name
-            ):
-                criterion_value.value = item_value
+        criterion_value = self.__get_indexed_criterion_value(item, criterion_name)
+        if criterion_value is not None:
+            criterion_value.value = item_value
 
 
 if __name__ == "__main__":
@@ -0,0 +1,186 @@
+"""Shared preferences"""
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from communication.preferences.bundle import Bundle
+from communication.preferences.criterion_name import CriterionName
+from communication.preferences.criterion_value import CriterionValue
+from communication.preferences.item import Item
+from communication.preferences.preferences import Preferences
+from communication.preferences.value import Value
+
+VALUES = list(Value)
+
+
+class SharedPreferences(Preferences):
+    """SharedPreferences class.
+    This class implements a read-only view of the preferences of an agent of a
+    SharedPopulation, which can be used instead of Preferences.
+
+    attr:
+        population: the population holding the preferences
+        agent: the index of the agent in the population
+    """
+
+    def __init__(self, population: "SharedPopulation", agent: int):
+        """Creates a new view of the preferences of an agent."""
+        super().__init__()
+        self.population = population
+        self.agent = agent
+        super().set_criterion_name_list(
+            [population.criteria[index] for index in population.criteria_order[agent]]
+        )
+
+    def get_criterion_value_list(self) -> List[CriterionValue]:
+        """Returns a copy of the list of criterion value."""
+        return [
+            CriterionValue(item, criterion, self.get_value(item, criterion))
+            for item in self.population.items
+            for criterion in self.get_criterion_name_list()
+        ]
+
+    def get_value(self, item: Item, criterion_name: CriterionName) -> Value:
+        """Gets the value for a given item and a given criterion name."""
+        item_index = self.population.item_indexes.get(item.id)
+        criterion_index = self.population.criterion_indexes.get(criterion_name)
+        if item_index is None or criterion_index is None:
+            if isinstance(item, Bundle):
+                return item.get_value(self, criterion_name)
+            raise ValueError(
+                "The criterion_name is not in the list of criterion values."
+            )
+        return VALUES[
+            int(self.population.values[self.agent, item_index, criterion_index])
+        ]
+
+    def set_criterion_name_list(self, criterion_name_list: List[CriterionName]) -> None:
+        raise ValueError("Shared preferences are read-only")
+
+    def add_criterion_value(self, criterion_value: CriterionValue) -> None:
+        raise ValueError("Shared preferences are read-only")
+
+    def set_criterion_pair(
+        self, less_preferred: CriterionName, more_preferred: CriterionName
+    ) -> None:
+        raise ValueError("Shared preferences are read-only")
+
+    def set_criterion_value(
+        self, item: Item, criterion_name: CriterionName, item_value: Value
+    ) -> None:
+        raise ValueError("Shared preferences are read-only")
+
+
+class SharedPopulation:  # pylint: disable=too-many-instance-attributes
+    """SharedPopulation class.
+    This class implements the preferences of a population of agents stored in a
+    shared memory block, so that several processes can read them without copying
+    them. Pickling a population only sends the name of its block: the process
+    unpickling it attaches to the block.
+
+    attr:
+        name: the name of the shared memory block
+        agent_ids: the ids of the agents
+        items: the items of the preferences
+        criteria: the criteria of the preferences
+        values: the agents x items x criteria array of the values
+        criteria_order: the agents x criteria array of the indexes of the criteria
+        of each agent, by order of importance
+    """
+
+    def __init__(
+        self,
+        agent_ids: List[int],
+        items: List[Item],
+        criteria: List[CriterionName],
+        name: Optional[str] = None,
+    ):
+        """Creates a new shared memory block, or attaches to an existing one if
+        its name is given."""
+        self.agent_ids = list(agent_ids)
+        self.items = items
+        self.criteria = criteria
+        self.item_indexes = {item.id: i for i, item in enumerate(items)}
+        self.criterion_indexes = {criterion: i for i, criterion in enumerate(criteria)}
+        self.agent_indexes = {agent_id: i for i, agent_id in enumerate(agent_ids)}
+
+        values_shape = (len(agent_ids), len(items), len(criteria))
+        order_shape = (len(agent_ids), len(criteria))
+        # The indexes of the criteria may not fit in a byte, unlike the values
+        order_dtype = np.dtype(np.min_scalar_type(max(0, len(criteria) - 1)))
+        order_size = order_dtype.itemsize
+        # The indexes of the criteria follow the values, aligned on their size
+        order_offset = -(-int(np.prod(values_shape)) // order_size) * order_size
+        size = max(1, order_offset + int(np.prod(order_shape)) * order_size)
+        self.__is_owner = name is None
+        self.__shared_memory = shared_memory.SharedMemory(
+            name=name, create=name is None, size=size
+        )
+        self.name = self.__shared_memory.name
+        self.values = np.ndarray(
+            values_shape, dtype=np.int8, buffer=self.__shared_memory.buf
+        )
+        self.criteria_order = np.ndarray(
+            order_shape,
+            dtype=order_dtype,
+            buffer=self.__shared_memory.buf,
+            offset=order_offset,
+        )
+        if not self.__is_owner:
+            self.values.flags.writeable = False
+            self.criteria_order.flags.writeable = False
+        self.__views: Dict[int, SharedPreferences] = {}
+
+    @classmethod
+    def from_preferences(
+        cls,
+        agent_ids: List[int],
+        preferences_list: List[Preferences],
+        items: List[Item],
+        criteria: List[CriterionName],
+    ) -> "SharedPopulation":
+        """Copies the preferences of a population to a new shared memory block."""
+        population = cls(agent_ids, items, criteria)
+        for agent, preferences in enumerate(preferences_list):
+            for rank, criterion in enumerate(preferences.get_criterion_name_list()):
+                population.criteria_order[agent, rank] = population.criterion_indexes[
+                    criterion
+                ]
+                for item_index, item in enumerate(items):
+                    population.values[
+                        agent, item_index, population.criterion_indexes[criterion]
+                    ] = preferences.get_value(item, criterion).value
+        return population
+
+    def __reduce__(self):
+        return (
+            self.__class__,
+            (self.agent_ids, self.items, self.criteria, self.name),
+        )
+
+    def __enter__(self) -> "SharedPopulation":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __contains__(self, agent_id: int) -> bool:
+        return agent_id in self.agent_indexes
+
+    def preferences(self, agent_id: int) -> SharedPreferences:
+        """Returns the read-only preferences of an agent."""
+        agent = self.agent_indexes[agent_id]
+        if agent not in self.__views:
+            self.__views[agent] = SharedPreferences(self, agent)
+        return self.__views[agent]
+
+    def close(self) -> None:
+        """Detaches from the shared memory block, which is destroyed if this
+        population created it."""
+        self.__views = {}
+        del self.values
+        del self.criteria_order
+        self.__shared_memory.close()
+        if self.__is_owner:
+            self.__shared_memory.unlink()
@@ -0,0 +1,25 @@
+"""Figures"""
+from typing import Optional, Tuple
+
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+def new_figure(figsize: Tuple[float, float], path: Optional[str] = None) -> Figure:
+    """Create a figure, outside of pyplot (non-interactive backend) if it is
+    saved to a file"""
+    if path is None:
+        return plt.figure(figsize=figsize)
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def show_figure(figure: Figure, path: Optional[str] = None, dpi: int = 100) -> None:
+    """Show a figure created by new_figure, or save it to a file"""
+    figure.tight_layout()
+    if path is None:
+        plt.show()
+    else:
+        figure.savefig(path, dpi=dpi)
@@ -0,0 +1,100 @@
+"""Plot outcome matrix"""
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from matplotlib.colors import ListedColormap
+from matplotlib.patches import Patch
+
+from communication import config
+from communication.visualization.figure import new_figure, show_figure
+
+# Color of the pairs without agreement (and of the diagonal)
+NO_OUTCOME_COLOR = "white"
+
+
+def build_outcome_matrix(
+    results: Iterable[Dict[str, Any]], agent_ids: List[int], item_names: List[str]
+) -> np.ndarray:
+    """Build the agents x agents outcome matrix of a tournament: the cell of the
+    winning agent's row and the losing agent's column holds the index of the
+    chosen item, the other cells -1
+    :param results: the results, whose chosen item is an Item or its name"""
+    agents = np.asarray(agent_ids)
+    order = np.argsort(agents, kind="stable")
+    item_indexes = {name: i for i, name in enumerate(item_names)}
+    winners, losers, items = [], [], []
+    for result in results:
+        chosen_item = result["chosen_item"]
+        winners.append(result["winning_agent"])
+        losers.append(result["losing_agent"])
+        items.append(
+            item_indexes[
+                chosen_item if isinstance(chosen_item, str) else chosen_item.name
+            ]
+        )
+
+    matrix = np.full((len(agents), len(agents)), -1, dtype=np.int16)
+    if len(items) > 0:
+        rows = order[np.searchsorted(agents[order], winners)]
+        columns = order[np.searchsorted(agents[order], losers)]
+        matrix[rows, columns] = items
+    return matrix
+
+
+def cluster_order(matrix: np.ndarray) -> np.ndarray:
+    """Order the agents by the item they most often agree on (won or lost),
+    so that the agents of a same cluster are contiguous"""
+    num_agents = matrix.shape[0]
+    num_items = int(matrix.max()) + 1 if matrix.size > 0 else 0
+    counts = np.zeros((num_agents, max(num_items, 1)), dtype=np.int64)
+    for outcomes in (matrix, matrix.T):
+        agents, items = np.nonzero(outcomes >= 0)
+        np.add.at(counts, (agents, outcomes[agents, items]), 1)
+    dominant = np.where(counts.any(axis=1), counts.argmax(axis=1), num_items)
+    return np.lexsort((np.arange(num_agents), dominant))
+
+
+def plot_outcome_matrix(  # pylint: disable=too-many-arguments
+    matrix: np.ndarray,
+    agent_ids: List[int],
+    item_names: List[str],
+    clustered: bool = False,
+    path: Optional[str] = None,
+    dpi: int = 100,
+):
+    """Plot the outcome matrix of a tournament, each cell being colored by the
+    item chosen by the pair (see build_outcome_matrix)
+    :param clustered: if True, the agents are ordered by cluster (see cluster_order)
+    :param path: if given, the plot is saved to this file with a non-interactive
+    backend instead of being shown"""
+    order = cluster_order(matrix) if clustered else np.arange(len(agent_ids))
+    colormap = ListedColormap(
+        [NO_OUTCOME_COLOR] + [config.ITEM_COLORS[name] for name in item_names]
+    )
+
+    size = min(20.0, max(6.0, len(agent_ids) / 50))
+    figure = new_figure((size, size), path)
+    ax = figure.add_subplot()
+    ax.imshow(
+        matrix[np.ix_(order, order)] + 1,
+        cmap=colormap,
+        vmin=0,
+        vmax=len(item_names),
+        interpolation="nearest",
+    )
+    if len(agent_ids) <= 50:
+        labels = [f"A{agent_ids[index]}" for index in order]
+        ax.set_xticks(list(range(len(labels))))
+        ax.set_xticklabels(labels, rotation=90)
+        ax.set_yticks(list(range(len(labels))))
+        ax.set_yticklabels(labels)
+    ax.set_xlabel("Losing agent")
+    ax.set_ylabel("Winning agent")
+    ax.legend(
+        handles=[
+            Patch(color=config.ITEM_COLORS[name], label=name) for name in item_names
+        ],
+        loc="upper left",
+        bbox_to_anchor=(1.01, 1),
+    )
+    show_figure(figure, path, dpi)
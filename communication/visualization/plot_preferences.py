@@ -1,11 +1,14 @@
 """Plot agent preferences"""
-from typing import Any, Dict
+from typing import Dict, List, Optional
 
 import matplotlib.pyplot as plt
-import pandas as pd
+import numpy as np
 import seaborn as sns
+from matplotlib.patches import Patch
 
+from communication.argumentation.agent_summary import AgentSummary
 from communication.argumentation.argument_agent import ArgumentAgent
+from communication.visualization.figure import new_figure, show_figure
 
 
 def plot_one_agent_preferences(agent: ArgumentAgent):
@@ -29,35 +32,76 @@ def plot_one_agent_preferences(agent: ArgumentAgent):
     plt.show()
 
 
-def plot_agents_preferences(agents: Dict[int, ArgumentAgent]):
-    """Plot agent preferences"""
-
-    items = list(agents.values())[1].items
-
-    items_dict = {item: i for i, item in enumerate(items)}
-    _, ax = plt.subplots(figsize=(7, 5))
-
-    agents_preferences: Dict[str, Any] = {
-        "Agent": [],
-        "Item": [],
-        "Scores": [],
-    }
-
-    for agent in agents.values():
-        scores = [
-            (item.get_score(agent.preferences), item) for item in items_dict.keys()
-        ]
-        for score, item in scores:
-            for _ in range(int(score)):
-                agents_preferences["Scores"].append(1)
-                agents_preferences["Agent"].append(agent.name)
-                agents_preferences["Item"].append(items_dict[item])
-
-    df = pd.DataFrame(agents_preferences)
-
-    sns.histplot(df, x="Item", hue="Agent", multiple="dodge", shrink=4)
+def build_agents_scores(
+    agents: Dict[int, AgentSummary], item_names: List[str]
+) -> np.ndarray:
+    """Build the agents x items score matrix of some agents"""
+    return np.array(
+        [[agent.scores[name] for name in item_names] for agent in agents.values()],
+        dtype=float,
+    ).reshape(len(agents), len(item_names))
+
+
+def plot_scores(
+    scores: np.ndarray,
+    agent_names: List[str],
+    item_names: List[str],
+    path: Optional[str] = None,
+):
+    """Plot an agents x items score matrix as bars grouped by item
+    :param path: if given, the plot is saved to this file with a non-interactive
+    backend instead of being shown"""
+    num_agents, num_items = scores.shape
+    width = 0.8 / max(num_agents, 1)
+    # Position of the bar of each agent and item, the agents being side by side
+    positions = (
+        np.arange(num_items)[np.newaxis, :]
+        - 0.4
+        + width * (np.arange(num_agents)[:, np.newaxis] + 0.5)
+    )
+    colors = (
+        plt.get_cmap("tab10")(np.arange(num_agents))
+        if num_agents <= 10
+        else plt.get_cmap("viridis")(np.linspace(0, 1, num_agents))
+    )
+
+    figure = new_figure((max(7.0, num_items * 1.5), 5), path)
+    ax = figure.add_subplot()
+    ax.bar(
+        positions.ravel(),
+        scores.ravel(),
+        width=width,
+        color=np.repeat(colors, num_items, axis=0),
+    )
     ax.set_ylabel("Score")
-    ax.set_xticks(list(range(len(items))))
-    ax.set_xticklabels([str(item) for item in items])
-
-    plt.show()
+    ax.set_xticks(list(range(num_items)))
+    ax.set_xticklabels(item_names)
+    if num_agents <= 20:
+        ax.legend(
+            handles=[
+                Patch(color=color, label=name)
+                for color, name in zip(colors, agent_names)
+            ],
+            title="Agent",
+            loc="upper left",
+            bbox_to_anchor=(1.01, 1),
+        )
+    show_figure(figure, path)
+
+
+def plot_agents_preferences(
+    agents: Dict[int, AgentSummary],
+    item_names: Optional[List[str]] = None,
+    path: Optional[str] = None,
+):
+    """Plot agent preferences
+    :param item_names: the items to plot, those of an agent by default
+    :param path: if given, the plot is saved to this file instead of being shown"""
+    if item_names is None:
+        item_names = list(agents.values())[min(1, len(agents) - 1)].items
+    plot_scores(
+        build_agents_scores(agents, item_names),
+        [agent.name for agent in agents.values()],
+        item_names,
+        path,
+    )
@@ -1,18 +1,21 @@
 """Plot pair result graph"""
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Optional
 
 import matplotlib.pyplot as plt
 import networkx as nx
 from networkx.drawing.nx_pydot import graphviz_layout
 
 from communication import config
-from communication.argumentation.argument_agent import ArgumentAgent
+from communication.argumentation.agent_summary import AgentSummary
 
 
 def plot_pair_result_graph(
-    agents: Dict[int, ArgumentAgent], results: List[Dict[str, Any]]
+    agents: Dict[int, AgentSummary],
+    results: Iterable[Dict[str, Any]],
+    path: Optional[str] = None,
 ):
-    """Plot winning graph"""
+    """Plot winning graph
+    :param path: if given, the plot is saved to this file instead of being shown"""
 
     def get_node_label(agent_id: int) -> str:
         """Get node label"""
@@ -24,7 +27,7 @@ def plot_pair_result_graph(
     node_color_map = []
     for agent_id, agent in agents.items():
         graph.add_node(get_node_label(agent_id), fillcolor="white")
-        node_color_map.append(config.ITEM_COLORS[agent.items[0].name])
+        node_color_map.append(config.ITEM_COLORS[agent.items[0]])
 
     # Add the winning pairs
     edge_labels = {}
@@ -66,4 +69,8 @@ def plot_pair_result_graph(
         font_color="black",
     )
 
-    plt.show()
+    if path is None:
+        plt.show()
+    else:
+        plt.savefig(path)
+        plt.close()
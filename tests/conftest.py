@@ -0,0 +1,33 @@
+"""Fixtures of the tests"""
+# pylint: disable=redefined-outer-name
+from typing import Iterator
+
+import pytest
+
+from communication import config
+from communication.argumentation.argument_model import ArgumentModel
+from communication.argumentation.run_config import RunConfig
+from communication.preferences.criterion_name import CriterionName
+
+RUN_CONFIG = RunConfig(seed=5)
+
+
+@pytest.fixture(scope="session")
+def session_model() -> ArgumentModel:
+    """Model of the presidential negociations, shared by the tests since the
+    message service can only be created once per process"""
+    return ArgumentModel(
+        2,
+        config.PRESIDENTIAL_ITEMS,
+        CriterionName.list_presidential(),
+        config.PRESIDENTIAL_PREFERENCES_FOLDER,
+        run_config=RUN_CONFIG,
+    )
+
+
+@pytest.fixture
+def argument_model(session_model: ArgumentModel) -> Iterator[ArgumentModel]:
+    """Model of the presidential negociations, configured again after each test"""
+    yield session_model
+    session_model.configure(RUN_CONFIG)
+    session_model.release_agents()
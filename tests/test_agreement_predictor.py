@@ -0,0 +1,49 @@
+"""Tests of the agreement predictor"""
+from itertools import combinations
+
+import numpy as np
+
+from communication.argumentation.agreement_predictor import AgreementPredictor
+from communication.argumentation.argument_model import ArgumentModel, get_pair_seed
+
+AGENT_IDS = list(range(1, 11))
+
+
+def test_predicted_pairs_match_simulation(argument_model: ArgumentModel) -> None:
+    """The trivial pairs are predicted as they are negociated"""
+    predictor = AgreementPredictor.from_model(argument_model, AGENT_IDS)
+    num_predicted = 0
+    for agent_1, agent_2 in combinations(AGENT_IDS, 2):
+        predicted = predictor.predict(agent_1, agent_2)
+        if predicted is None:
+            continue
+        num_predicted += 1
+        simulated = argument_model.run_discussion_between(
+            agent_1,
+            agent_2,
+            argument_model.max_num_steps,
+            get_pair_seed(argument_model.seed, agent_1, agent_2),
+        )
+        assert simulated is not None
+        for key in ["winning_agent", "losing_agent", "messages", "concessions"]:
+            assert predicted[key] == simulated[key], (agent_1, agent_2, key)
+        assert predicted["chosen_item"] is simulated["chosen_item"]
+        assert [str(argument) for argument in predicted["arguments"]] == [
+            str(argument) for argument in simulated["arguments"]
+        ]
+    assert num_predicted > 0
+
+
+def test_predict_all_pairs_matches_predict(argument_model: ArgumentModel) -> None:
+    """The matrices of all the pairs hold the predictions of each pair"""
+    predictor = AgreementPredictor.from_model(argument_model, AGENT_IDS)
+    resolved, chosen = predictor.predict_all_pairs()
+    for index_1, index_2 in combinations(range(len(AGENT_IDS)), 2):
+        predicted = predictor.predict(AGENT_IDS[index_1], AGENT_IDS[index_2])
+        assert resolved[index_1, index_2] == (predicted is not None)
+        if predicted is not None:
+            assert argument_model.items[chosen[index_1, index_2]] is (
+                predicted["chosen_item"]
+            )
+            assert predictor.top_sets_intersect()[index_1, index_2]
+    assert np.array_equal(resolved, resolved.T)
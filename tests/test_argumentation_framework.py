@@ -0,0 +1,135 @@
+"""Tests of the argumentation frameworks"""
+import random
+from itertools import combinations
+from typing import FrozenSet, List, Set, Tuple
+
+import pytest
+
+from communication import config
+from communication.argumentation.argumentation_framework import ArgumentationFramework
+from communication.arguments.argument import Argument
+
+Attack = Tuple[int, int]
+
+
+def build_framework(
+    num_arguments: int, attacks: List[Attack]
+) -> ArgumentationFramework:
+    """Builds a framework of distinct arguments (at most 10) and attacks"""
+    framework = ArgumentationFramework()
+    items = config.PRESIDENTIAL_ITEMS
+    for index in range(num_arguments):
+        argument = Argument(index < len(items), items[index % len(items)])
+        assert framework.add_argument(argument) == index
+    for attacker, target in attacks:
+        framework.add_attack(attacker, target)
+    return framework
+
+
+def is_admissible(arguments: Set[int], attacks: Set[Attack]) -> bool:
+    """Returns whether a set of arguments is conflict-free and defends its
+    arguments"""
+    attackers = {attacker for attacker, target in attacks if target in arguments}
+    return not attackers & arguments and all(
+        any((defender, attacker) in attacks for defender in arguments)
+        for attacker in attackers
+    )
+
+
+def brute_force_preferred(
+    num_arguments: int, attacks: Set[Attack]
+) -> List[FrozenSet[int]]:
+    """Returns the maximal admissible sets, enumerating all the sets"""
+    admissible = [
+        frozenset(arguments)
+        for size in range(num_arguments + 1)
+        for arguments in combinations(range(num_arguments), size)
+        if is_admissible(set(arguments), attacks)
+    ]
+    return sorted(
+        (
+            arguments
+            for arguments in admissible
+            if not any(arguments < other for other in admissible)
+        ),
+        key=sorted,
+    )
+
+
+def brute_force_grounded(num_arguments: int, attacks: Set[Attack]) -> Set[int]:
+    """Returns the least fixed point of the characteristic function"""
+    grounded: Set[int] = set()
+    while True:
+        defended = {
+            index
+            for index in range(num_arguments)
+            if all(
+                any((defender, attacker) in attacks for defender in grounded)
+                for attacker, target in attacks
+                if target == index
+            )
+        }
+        if defended == grounded:
+            return grounded
+        grounded = defended
+
+
+@pytest.mark.parametrize(
+    "num_arguments, attacks, grounded, preferred",
+    [
+        # Odd cycle: nothing can be defended
+        (3, [(0, 1), (1, 2), (2, 0)], set(), [set()]),
+        # Even cycle: either side of the cycle
+        (2, [(0, 1), (1, 0)], set(), [{0}, {1}]),
+        (4, [(0, 1), (1, 2), (2, 3), (3, 0)], set(), [{0, 2}, {1, 3}]),
+        # Reinstatement chain: 3 defeats 2, which reinstates 1 against 0
+        (4, [(3, 2), (2, 1), (1, 0)], {3, 1}, [{3, 1}]),
+        # An odd cycle attacking an argument outside of it
+        (4, [(0, 1), (1, 2), (2, 0), (2, 3)], set(), [set()]),
+        # An even cycle attacking an argument outside of it
+        (3, [(0, 1), (1, 0), (1, 2)], set(), [{0, 2}, {1}]),
+    ],
+)
+def test_known_frameworks(
+    num_arguments: int,
+    attacks: List[Attack],
+    grounded: Set[int],
+    preferred: List[Set[int]],
+) -> None:
+    """The extensions of small frameworks whose extensions are known"""
+    framework = build_framework(num_arguments, attacks)
+    assert framework.grounded_extension() == grounded
+    assert sorted(map(sorted, framework.preferred_extensions())) == sorted(
+        map(sorted, preferred)
+    )
+
+
+def test_independent_cycles() -> None:
+    """The extensions of independent cycles are combined"""
+    framework = build_framework(5, [(0, 1), (1, 0), (2, 3), (3, 2)])
+    assert sorted(map(sorted, framework.preferred_extensions())) == [
+        [0, 2, 4],
+        [0, 3, 4],
+        [1, 2, 4],
+        [1, 3, 4],
+    ]
+
+
+def test_incremental_extensions() -> None:
+    """The extensions updated after each attack are those of the framework
+    built at once"""
+    rng = random.Random(0)
+    num_arguments = 8
+    for _ in range(20):
+        framework = build_framework(num_arguments, [])
+        attacks: Set[Attack] = set()
+        for _ in range(12):
+            attack = (rng.randrange(num_arguments), rng.randrange(num_arguments))
+            attacks.add(attack)
+            framework.add_attack(*attack)
+            assert framework.grounded_extension() == brute_force_grounded(
+                num_arguments, attacks
+            )
+            assert framework.preferred_extensions() == brute_force_preferred(
+                num_arguments, attacks
+            )
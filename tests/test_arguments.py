@@ -0,0 +1,46 @@
+"""Tests of the arguments"""
+import multiprocessing
+import pickle
+from typing import Tuple
+
+from communication import config
+from communication.arguments.argument import Argument
+from communication.arguments.comparison import Comparison
+from communication.arguments.couple_value import CoupleValue
+from communication.preferences.criterion_name import CRITERION_REGISTRY, CriterionName
+from communication.preferences.value import Value
+
+
+def describe_premises(data: bytes) -> Tuple[str, str]:
+    """Unpickles a couple value and a comparison in a process whose registry
+    gives another criterion the ids of the parent process"""
+    CRITERION_REGISTRY.register_all(["worker_criterion_1", "worker_criterion_2"])
+    couple_value, comparison = pickle.loads(data)
+    return str(couple_value), str(comparison)
+
+
+def test_premises_are_pickled_by_criterion_name() -> None:
+    """The criteria of the premises are sent by name, their ids being
+    specific to a process"""
+    criterion_1, criterion_2 = CRITERION_REGISTRY.register_all(
+        ["parent_criterion_1", "parent_criterion_2"]
+    )
+    couple_value = CoupleValue(criterion_1, Value.GOOD)
+    comparison = Comparison(criterion_2, CriterionName.WORK)
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        described = pool.apply(
+            describe_premises, (pickle.dumps((couple_value, comparison)),)
+        )
+    assert described == (str(couple_value), str(comparison))
+
+
+def test_argument_round_trip() -> None:
+    """An argument is equal to its copy"""
+    argument = Argument(True, config.PRESIDENTIAL_ITEMS[0])
+    argument.add_premiss_couple_values(CoupleValue(CriterionName.EDUCATION, Value.GOOD))
+    argument.add_premiss_comparison(
+        Comparison(CriterionName.EDUCATION, CriterionName.SECURITY)
+    )
+    copy = pickle.loads(pickle.dumps(argument))
+    assert copy.premises_couple_values == argument.premises_couple_values
+    assert copy.premises_comparison == argument.premises_comparison
@@ -0,0 +1,34 @@
+"""Tests of the batch negociation engine"""
+from itertools import combinations
+
+import pytest
+
+from communication.argumentation.argument_model import ArgumentModel
+from communication.argumentation.batch_engine import (
+    BatchNegociationEngine,
+    compare_with_model,
+)
+from communication.argumentation.concession import CONCESSION_STRATEGIES
+from communication.argumentation.run_config import RunConfig
+
+AGENT_IDS = list(range(1, 11))
+PAIRS = list(combinations(AGENT_IDS, 2))
+
+
+@pytest.mark.parametrize("concession", list(CONCESSION_STRATEGIES))
+def test_engine_reproduces_the_agents(
+    argument_model: ArgumentModel, concession: str
+) -> None:
+    """The engine takes the decisions of ArgumentAgent for every strategy"""
+    argument_model.configure(RunConfig(concession, seed=5))
+    mismatches = compare_with_model(argument_model, PAIRS)
+    assert not mismatches, mismatches
+
+
+def test_results_have_no_steps(argument_model: ArgumentModel) -> None:
+    """The number of steps depends on the activation order, which the engine
+    does not simulate"""
+    results, _ = BatchNegociationEngine.from_model(argument_model, AGENT_IDS).run(PAIRS)
+    agreements = [result for result in results if result is not None]
+    assert agreements
+    assert all(result["steps"] is None for result in agreements)
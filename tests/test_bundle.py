@@ -0,0 +1,49 @@
+"""Tests of the bundles"""
+import gc
+import os
+import pickle
+
+import pytest
+
+from communication import config
+from communication.argumentation.preferences_generator import load_preferences
+from communication.preferences.bundle import BUNDLE_CACHE, Bundle
+from communication.preferences.criterion_value import CriterionValue
+from communication.preferences.item import ITEM_CATALOG
+from communication.preferences.value import Value
+
+
+def test_bundles_are_not_registered() -> None:
+    """A bundle is unique while it is in use, named by the names of its items,
+    and is forgotten afterwards without growing the catalog"""
+    num_items = len(ITEM_CATALOG)
+    num_bundles = len(BUNDLE_CACHE)
+    item_1, item_2, item_3 = config.PRESIDENTIAL_ITEMS[:3]
+    bundle = Bundle([item_3, item_1, item_2])
+    assert Bundle([item_2, item_3, item_1]) is bundle
+    assert bundle.name == " + ".join(sorted([item_1.name, item_2.name, item_3.name]))
+    assert bundle.id < 0 and bundle.name not in ITEM_CATALOG
+    assert pickle.loads(pickle.dumps(bundle)) is bundle
+    assert len(ITEM_CATALOG) == num_items
+    del bundle
+    gc.collect()
+    assert len(BUNDLE_CACHE) == num_bundles
+
+
+def test_bundle_values() -> None:
+    """The value of a bundle is the best value of its items, and cannot be
+    set in the preferences"""
+    preferences = load_preferences(
+        os.path.join(config.PRESIDENTIAL_PREFERENCES_FOLDER, "p1.csv")
+    )
+    items = config.PRESIDENTIAL_ITEMS[:2]
+    bundle = Bundle(items)
+    for criterion in preferences.get_criterion_name_list():
+        assert preferences.get_value(bundle, criterion) == max(
+            (preferences.get_value(item, criterion) for item in items),
+            key=lambda value: value.value,
+        )
+    with pytest.raises(ValueError):
+        preferences.add_criterion_value(
+            CriterionValue(bundle, preferences.get_criterion_name_list()[0], Value.GOOD)
+        )
@@ -0,0 +1,94 @@
+"""Tests of the bundle spaces"""
+import random
+from itertools import combinations
+from typing import Dict, List, Tuple
+
+import pytest
+
+from communication import config
+from communication.argumentation.bundle_space import BundleSpace
+from communication.preferences.bundle import Bundle
+from communication.preferences.criterion_name import CriterionName
+from communication.preferences.criterion_value import CriterionValue
+from communication.preferences.item import Item
+from communication.preferences.preferences import Preferences
+from communication.preferences.value import Value
+
+ITEMS = config.PRESIDENTIAL_ITEMS + config.CAR_ITEMS
+CRITERIA = CriterionName.list_presidential()
+
+
+def build_preferences(rng: random.Random) -> Preferences:
+    """Random preferences over the items"""
+    preferences = Preferences()
+    preferences.set_criterion_name_list(rng.sample(CRITERIA, len(CRITERIA)))
+    for item in ITEMS:
+        for criterion in CRITERIA:
+            preferences.add_criterion_value(
+                CriterionValue(item, criterion, rng.choice(list(Value)))
+            )
+    return preferences
+
+
+def build_interactions(
+    rng: random.Random, items: List[Item], kind: str
+) -> Dict[Tuple[Item, Item], float]:
+    """Random interactions of some pairs of items: complementary (positive),
+    substitutes (negative) or both"""
+    if kind == "none":
+        return {}
+    low, high = {"positive": (1, 60), "negative": (-60, -1), "mixed": (-60, 60)}[kind]
+    return {
+        pair: float(rng.randint(low, high))
+        for pair in combinations(items, 2)
+        if rng.random() < 0.5
+    }
+
+
+def brute_force_scores(
+    preferences: Preferences,
+    items: List[Item],
+    size: int,
+    interactions: Dict[Tuple[Item, Item], float],
+) -> Dict[Bundle, float]:
+    """Scores all the bundles of a space, enumerating them"""
+    scores: Dict[Bundle, float] = {}
+    for bundle_items in combinations(items, size):
+        score = sum(item.get_score(preferences) for item in bundle_items)
+        for item_1, item_2 in combinations(bundle_items, 2):
+            score += interactions.get(
+                (item_1, item_2), interactions.get((item_2, item_1), 0)
+            )
+        scores[Bundle(bundle_items)] = score
+    return scores
+
+
+@pytest.mark.parametrize("kind", ["none", "positive", "negative", "mixed"])
+@pytest.mark.parametrize("seed", range(4))
+def test_bundle_space_matches_brute_force(kind: str, seed: int) -> None:
+    """The enumeration order, ranks and top percentages of the bundles are
+    those of the sorted combinations of items"""
+    rng = random.Random(seed)
+    preferences = build_preferences(rng)
+    items = rng.sample(ITEMS, rng.randint(4, len(ITEMS)))
+    interactions = build_interactions(rng, items, kind)
+    for size in range(2, len(items) + 1):
+        space = BundleSpace(items, preferences, size, interactions)
+        scores = brute_force_scores(preferences, items, size, interactions)
+        assert len(space) == len(scores)
+
+        bundles = list(space)
+        assert set(bundles) == set(scores)
+        assert all(isinstance(bundle, Bundle) for bundle in bundles)
+        assert [
+            scores[bundle] for bundle in bundles if isinstance(bundle, Bundle)
+        ] == sorted(scores.values(), reverse=True)
+        for bundle, score in scores.items():
+            rank = sum(other > score for other in scores.values())
+            assert space.index(bundle) == rank
+            assert space.score(bundle) == score
+            for percentage in [1, 20, 50, 100]:
+                num_top = max(1, int(len(scores) * percentage / 100))
+                assert space.is_among_top_percent(bundle, percentage) == (
+                    rank < num_top
+                )
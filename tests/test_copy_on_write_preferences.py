@@ -0,0 +1,53 @@
+"""Tests of the copy-on-write preferences"""
+import os
+
+from communication import config
+from communication.argumentation.preferences_generator import load_shared_preferences
+from communication.preferences.bundle import Bundle
+from communication.preferences.copy_on_write_preferences import CopyOnWritePreferences
+from communication.preferences.criterion_value import CriterionValue
+from communication.preferences.value import Value
+
+PREFERENCES_PATH = os.path.join(config.PRESIDENTIAL_PREFERENCES_FOLDER, "p1.csv")
+
+
+def test_override_does_not_mutate_base() -> None:
+    """A value set in the preferences of an agent changes its values and its
+    preferred item, but not the shared base"""
+    preferences = load_shared_preferences(PREFERENCES_PATH, {})
+    assert isinstance(preferences, CopyOnWritePreferences)
+    base = preferences.base
+    items = config.PRESIDENTIAL_ITEMS
+    least_preferred = min(items, key=lambda item: item.get_score(base))
+    base_values = {
+        criterion: base.get_value(least_preferred, criterion)
+        for criterion in base.get_criterion_name_list()
+    }
+    base_most_preferred = max(items, key=lambda item: item.get_score(base))
+    for criterion in base.get_criterion_name_list():
+        preferences.set_criterion_value(least_preferred, criterion, Value.VERY_GOOD)
+    for criterion, value in base_values.items():
+        assert preferences.get_value(least_preferred, criterion) == Value.VERY_GOOD
+        assert base.get_value(least_preferred, criterion) == value
+    assert preferences.most_preferred(items) == least_preferred
+    assert max(items, key=lambda item: item.get_score(base)) == base_most_preferred
+
+
+def test_added_value_shadows_base() -> None:
+    """A value added to the preferences of an agent is used instead of the
+    value of the base, also in the value of the bundles"""
+    preferences = load_shared_preferences(PREFERENCES_PATH, {})
+    assert isinstance(preferences, CopyOnWritePreferences)
+    base = preferences.base
+    item_1, item_2 = config.PRESIDENTIAL_ITEMS[:2]
+    criterion = base.get_criterion_name_list()[0]
+    preferences.add_criterion_value(CriterionValue(item_1, criterion, Value.VERY_GOOD))
+    preferences.add_criterion_value(CriterionValue(item_2, criterion, Value.VERY_BAD))
+    preferences.set_criterion_value(item_2, criterion, Value.BAD)
+    assert preferences.get_value(item_1, criterion) == Value.VERY_GOOD
+    assert preferences.get_value(item_2, criterion) == Value.BAD
+    bundle = Bundle([item_1, item_2])
+    assert preferences.get_value(bundle, criterion) == Value.VERY_GOOD
+    assert bundle.get_score(preferences) == item_1.get_score(
+        preferences
+    ) + item_2.get_score(preferences)
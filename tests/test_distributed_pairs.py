@@ -0,0 +1,95 @@
+"""Tests of the coordinator of distributed tournaments"""
+import socket
+import threading
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from communication.commands.distributed_pairs import (
+    TournamentCoordinator,
+    receive_message,
+    send_message,
+)
+
+CONFIG = {"mode": "presidential", "num_agents": 4}
+PAIRS = [(1, 2), (1, 3), (1, 4), (2, 3), (2, 4), (3, 4)]
+
+
+def fake_worker(
+    coordinator: TournamentCoordinator,
+    tournament_config: Dict[str, Any],
+    hang: bool = False,
+) -> List[Dict[str, Any]]:
+    """Connects to a coordinator and answers no agreement to each pair, or
+    hangs on its first batch
+    :return: the messages received from the coordinator"""
+    messages = []
+    with socket.create_connection(coordinator.address) as connection:
+        with connection.makefile("rwb") as file:
+            send_message(file, {"type": "hello", "config": tournament_config})
+            message = receive_message(file)
+            while message is not None:
+                messages.append(message)
+                if message["type"] != "pairs":
+                    break
+                if hang:
+                    time.sleep(2 * coordinator.worker_timeout)
+                    break
+                send_message(
+                    file,
+                    {
+                        "type": "results",
+                        "batch": message["batch"],
+                        "results": [None] * len(message["pairs"]),
+                    },
+                )
+                message = receive_message(file)
+    return messages
+
+
+def start_worker(*args: Any, **kwargs: Any) -> threading.Thread:
+    """Runs a fake worker in a thread"""
+    thread = threading.Thread(target=fake_worker, args=args, kwargs=kwargs, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_run_fails_without_workers() -> None:
+    """A run fails if no worker connects"""
+    with TournamentCoordinator(
+        ("127.0.0.1", 0), CONFIG, connection_timeout=0.5
+    ) as coordinator:
+        start = time.monotonic()
+        with pytest.raises(ValueError, match="No worker"):
+            coordinator.run(PAIRS)
+        assert time.monotonic() - start < 5
+
+
+def test_run_fails_with_rejected_workers() -> None:
+    """The workers of another tournament are rejected and do not count"""
+    with TournamentCoordinator(
+        ("127.0.0.1", 0), CONFIG, connection_timeout=0.5
+    ).start() as coordinator:
+        messages = fake_worker(coordinator, dict(CONFIG, num_agents=5))
+        assert messages == [{"type": "error", "message": "Configuration mismatch"}]
+        with pytest.raises(ValueError, match="No worker"):
+            coordinator.run(PAIRS)
+
+
+def test_batches_of_hung_workers_are_handed_out_again() -> None:
+    """The batch of a worker which does not answer is run by another one,
+    and the workers wait for the next runs until the coordinator is closed"""
+    with TournamentCoordinator(
+        ("127.0.0.1", 0), CONFIG, batch_size=2, worker_timeout=0.5
+    ).start() as coordinator:
+        hung_worker = start_worker(coordinator, CONFIG, hang=True)
+        # The other worker connects once the hung worker timed out
+        time.sleep(0.8)
+        worker = start_worker(coordinator, CONFIG)
+        assert coordinator.run(PAIRS) == [None] * len(PAIRS)
+        assert coordinator.run(PAIRS[:3]) == [None] * 3
+        assert worker.is_alive()
+    worker.join(5)
+    hung_worker.join(5)
+    assert not worker.is_alive()
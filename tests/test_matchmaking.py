@@ -0,0 +1,92 @@
+"""Tests of the matchmaking index"""
+import numpy as np
+import pytest
+
+from communication.argumentation.argument_model import ArgumentModel
+from communication.argumentation.matchmaking import (
+    EXACT_SEARCH_MAX_AGENTS,
+    MatchmakingIndex,
+)
+from communication.commands.sampled_tournament import get_matchmaking_pairs
+
+DIMENSION = 12
+
+
+def build_population(num_agents: int, seed: int = 0) -> np.ndarray:
+    """Embeddings of a synthetic population, whose agents are grouped around
+    a few profiles like agents sharing a favourite item"""
+    rng = np.random.default_rng(seed)
+    profiles = rng.standard_normal((40, DIMENSION))
+    return np.asarray(
+        profiles[rng.integers(0, len(profiles), num_agents)]
+        + 0.3 * rng.standard_normal((num_agents, DIMENSION))
+    )
+
+
+def test_lsh_search_recalls_exact_search() -> None:
+    """The approximate top partners of a large population are mostly the
+    exact ones"""
+    num_agents = 2 * EXACT_SEARCH_MAX_AGENTS
+    index = MatchmakingIndex(DIMENSION, seed=1)
+    index.add_all(list(range(num_agents)), build_population(num_agents))
+    recalls = []
+    for agent_id in range(0, num_agents, 40):
+        exact = {partner for partner, _ in index.top_partners(agent_id, exact=True)}
+        approximate = {partner for partner, _ in index.top_partners(agent_id)}
+        recalls.append(len(exact & approximate) / len(exact))
+    assert np.mean(recalls) >= 0.9
+
+
+def test_exact_search_ranks_by_correlation() -> None:
+    """The exact search returns the agents whose embeddings are the most
+    correlated with the profile"""
+    vectors = build_population(100)
+    index = MatchmakingIndex(DIMENSION, seed=1)
+    index.add_all(list(range(1, 101)), vectors)
+    correlations = np.corrcoef(vectors)[0]
+    expected = [int(row) + 1 for row in np.argsort(-correlations)[1:6]]
+    assert [partner for partner, _ in index.top_partners(1, 5)] == expected
+
+
+@pytest.mark.parametrize("exact", [True, False])
+def test_add_after_add_all(exact: bool) -> None:
+    """Agents inserted one at a time after a batch are found like those of
+    the batch"""
+    num_agents = 300
+    vectors = build_population(num_agents)
+    batch_index = MatchmakingIndex(DIMENSION, seed=1)
+    batch_index.add_all(list(range(num_agents)), vectors)
+    index = MatchmakingIndex(DIMENSION, seed=1)
+    index.add_all(list(range(10)), vectors[:10])
+    for agent_id in range(10, num_agents):
+        index.add(agent_id, vectors[agent_id])
+    assert len(index) == num_agents and num_agents - 1 in index
+    np.testing.assert_allclose(index.vectors, batch_index.vectors)
+    for agent_id in range(0, num_agents, 7):
+        assert index.top_partners(agent_id, exact=exact) == batch_index.top_partners(
+            agent_id, exact=exact
+        )
+    with pytest.raises(ValueError):
+        index.add(0, vectors[0])
+
+
+@pytest.mark.parametrize("exact", [True, False])
+def test_exclude(exact: bool) -> None:
+    """The excluded agent is never returned, even when it is the most similar"""
+    vectors = build_population(200)
+    index = MatchmakingIndex(DIMENSION, seed=1)
+    index.add_all(list(range(200)), vectors)
+    assert index.query(vectors[3], 5, exact=exact)[0][0] == 3
+    partners = index.query(vectors[3], 5, exclude=3, exact=exact)
+    assert len(partners) == 5 and 3 not in [partner for partner, _ in partners]
+    assert 3 not in [partner for partner, _ in index.top_partners(3, exact=exact)]
+
+
+def test_matchmaking_pairs(argument_model: ArgumentModel) -> None:
+    """Each agent of the matchmaking tournament meets at least its most similar
+    agents, each pair once"""
+    pairs = get_matchmaking_pairs(argument_model, 10, 2)
+    assert len(pairs) == len(set(pairs))
+    assert all(agent_1 < agent_2 for agent_1, agent_2 in pairs)
+    for agent_id in range(1, 11):
+        assert sum(agent_id in pair for pair in pairs) >= 2
@@ -0,0 +1,106 @@
+"""Tests of the message codec"""
+# pylint: disable=redefined-outer-name
+import pickle
+from typing import List
+
+import pytest
+
+from communication import config
+from communication.arguments.argument import Argument
+from communication.arguments.comparison import Comparison
+from communication.arguments.couple_value import CoupleValue
+from communication.message.message import Message
+from communication.message.message_codec import MessageCodec
+from communication.message.message_performative import MessagePerformative
+from communication.preferences.bundle import Bundle
+from communication.preferences.criterion_name import CriterionName
+from communication.preferences.value import Value
+
+ITEMS = config.PRESIDENTIAL_ITEMS
+CRITERIA = CriterionName.list_presidential()
+
+
+@pytest.fixture
+def codec() -> MessageCodec:
+    """Codec of two agents negociating the presidential items"""
+    return MessageCodec(["Agent0", "Agent1"], ITEMS, CRITERIA)
+
+
+@pytest.fixture
+def argument() -> Argument:
+    """Argument against an item"""
+    argument = Argument(False, ITEMS[1])
+    argument.add_premiss_couple_values(CoupleValue(CRITERIA[2], Value.VERY_BAD))
+    argument.add_premiss_comparison(Comparison(CRITERIA[2], CRITERIA[0]))
+    return argument
+
+
+@pytest.fixture
+def messages(argument: Argument) -> List[Message]:
+    """Messages of each kind of content"""
+    return [
+        Message("Agent0", "Agent1", MessagePerformative.PROPOSE, ITEMS[0]),
+        Message("Agent1", "Agent0", MessagePerformative.ASK_WHY, ITEMS[0], 7),
+        Message("Agent1", "Agent0", MessagePerformative.ARGUE, argument, 300),
+        Message("Agent0", "Agent1", MessagePerformative.COMMIT, "Comment ça va ?"),
+        Message("Agent0", "Agent1", MessagePerformative.PROPOSE, Bundle(ITEMS[:3])),
+    ]
+
+
+def test_round_trip(codec: MessageCodec, messages: List[Message]) -> None:
+    """A decoded message is the encoded one, with the same items"""
+    for message in messages:
+        decoded = codec.decode(codec.encode(message))
+        assert str(decoded) == str(message)
+        assert decoded.sender == message.sender
+        assert decoded.recipient == message.recipient
+        assert decoded.performative is message.performative
+        assert decoded.conversation_id == message.conversation_id
+    assert codec.decode(codec.encode(messages[0])).content is ITEMS[0]
+    assert codec.decode(codec.encode(messages[4])).content is messages[4].content
+
+
+def test_argument_round_trip(
+    codec: MessageCodec, messages: List[Message], argument: Argument
+) -> None:
+    """A decoded argument has the decision, item and premises of the encoded one"""
+    decoded_argument = codec.decode(codec.encode(messages[2])).content
+    assert isinstance(decoded_argument, Argument)
+    assert decoded_argument.decision is False
+    assert decoded_argument.item is ITEMS[1]
+    assert decoded_argument.premises_couple_values == argument.premises_couple_values
+    assert decoded_argument.premises_comparison == argument.premises_comparison
+
+
+def test_messages_round_trip(codec: MessageCodec, messages: List[Message]) -> None:
+    """A list of messages is decoded from a single buffer"""
+    decoded_messages = codec.decode_messages(codec.encode_messages(messages))
+    assert [str(message) for message in decoded_messages] == [
+        str(message) for message in messages
+    ]
+    assert not codec.decode_messages(codec.encode_messages([]))
+
+
+def test_compact_encoding(codec: MessageCodec, messages: List[Message]) -> None:
+    """An argument takes a tenth of its pickle"""
+    assert len(codec.encode(messages[2])) < len(pickle.dumps(messages[2])) / 10
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        Message("Agent2", "Agent1", MessagePerformative.PROPOSE, ITEMS[0]),
+        # An item of the catalog which is not one of the items of the codec
+        Message("Agent0", "Agent1", MessagePerformative.PROPOSE, config.CAR_ITEMS[0]),
+    ],
+)
+def test_unknown_content(codec: MessageCodec, message: Message) -> None:
+    """The agents and items which are not those of the codec are not encoded"""
+    with pytest.raises(ValueError):
+        codec.encode(message)
+
+
+def test_truncated_data(codec: MessageCodec, messages: List[Message]) -> None:
+    """A truncated message is not decoded"""
+    with pytest.raises(ValueError):
+        codec.decode(codec.encode(messages[2])[:-1])
@@ -0,0 +1,24 @@
+"""Tests of the tournaments between all the pairs"""
+from pathlib import Path
+
+from communication.argumentation.argument_model import ArgumentModel
+from communication.commands.pairs_visualizer import visualize_pairs_negociations
+from communication.commands.results_store import ResultsStore
+
+
+def test_results_store_is_replaced(
+    argument_model: ArgumentModel, tmp_path: Path
+) -> None:
+    """A tournament run again into the same database replaces its results
+    instead of adding to them"""
+    path = str(tmp_path / "results.db")
+    win_counts = []
+    for _ in range(2):
+        with ResultsStore(path) as results_store:
+            visualize_pairs_negociations(
+                argument_model, 4, results_store, results_plot="none"
+            )
+            win_counts.append(results_store.item_win_counts())
+            num_results = len(results_store)
+    assert win_counts[0] == win_counts[1]
+    assert sum(win_counts[1].values()) == num_results <= 6
@@ -0,0 +1,46 @@
+"""Tests of the shared preferences"""
+import pickle
+import random
+
+from communication import config
+from communication.preferences.criterion_name import CRITERION_REGISTRY
+from communication.preferences.criterion_value import CriterionValue
+from communication.preferences.preferences import Preferences
+from communication.preferences.shared_preferences import SharedPopulation
+from communication.preferences.value import Value
+
+
+def test_population_of_many_criteria() -> None:
+    """The preferences of a population over more criteria than an int8 can
+    index are read back from an unpickled population"""
+    rng = random.Random(0)
+    items = config.PRESIDENTIAL_ITEMS[:3]
+    criteria = CRITERION_REGISTRY.register_all(
+        [f"shared_criterion_{index}" for index in range(300)]
+    )
+    preferences_list = []
+    for _ in range(3):
+        preferences = Preferences()
+        preferences.set_criterion_name_list(rng.sample(criteria, len(criteria)))
+        for item in items:
+            for criterion in criteria:
+                preferences.add_criterion_value(
+                    CriterionValue(item, criterion, rng.choice(list(Value)))
+                )
+        preferences_list.append(preferences)
+
+    with SharedPopulation.from_preferences(
+        [1, 2, 3], preferences_list, items, criteria
+    ) as population:
+        with pickle.loads(pickle.dumps(population)) as copy:
+            for agent_id, preferences in zip([1, 2, 3], preferences_list):
+                shared = copy.preferences(agent_id)
+                assert (
+                    shared.get_criterion_name_list()
+                    == preferences.get_criterion_name_list()
+                )
+                for item in items:
+                    for criterion in criteria:
+                        assert shared.get_value(item, criterion) == (
+                            preferences.get_value(item, criterion)
+                        )
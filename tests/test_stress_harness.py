@@ -0,0 +1,40 @@
+"""Tests of the stress harness"""
+from typing import Any, Dict
+
+from communication.commands.stress_harness import check_stress_report
+
+
+def build_case(name: str, steps: int, regression: bool, slow: bool) -> Dict[str, Any]:
+    """Checked case whose negociation took a number of steps"""
+    measure = {
+        "agreement": True,
+        "error": None,
+        "steps": steps,
+        "messages": 2 * steps,
+        "wall_time": 0.5 if slow else 0.001,
+    }
+    return {
+        "case": name,
+        "saved": dict(measure, steps=10, messages=20),
+        "measure": measure,
+        "regression": regression,
+        "slow": slow,
+    }
+
+
+def test_regressed_and_slow_cases_are_reported() -> None:
+    """Only the cases which got longer or slow are regressions"""
+    regressions = check_stress_report(
+        [
+            build_case("case0", 10, False, False),
+            build_case("case1", 12, True, False),
+            build_case("case2", 10, False, True),
+        ]
+    )
+    assert regressions == [
+        "case1: agreement in 12 steps, 24 messages "
+        "(saved: agreement in 10 steps, 20 messages) REGRESSION",
+        "case2: agreement in 10 steps, 20 messages "
+        "(saved: agreement in 10 steps, 20 messages) SLOW (500.0 ms)",
+    ]
+    assert not check_stress_report([build_case("case0", 10, False, False)])